@@ -69,7 +69,8 @@ setup(
     package_data={
         'aria_extension_tosca': [
             'profiles/tosca-simple-profile-1.0/*',
-            'profiles/tosca-simple-nfv-1.0/*']},
+            'profiles/tosca-simple-nfv-1.0/*',
+            'profiles/*.snapshot']},
     
     scripts=[
         'src/aria/scripts/aria',
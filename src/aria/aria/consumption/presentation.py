@@ -15,9 +15,12 @@
 #
 
 from .consumer import Consumer
+from .context import ConsumptionContext
 from ..utils import FixedThreadPoolExecutor, json_dumps, yaml_dumps
 from ..loading import UriLocation
-from ..reading import AlreadyReadError
+from ..reading import SNAPSHOTS, ReaderProcessPool, AlreadyReadError, ContentMismatchError
+from ..presentation import ImportGraph
+import time
 
 class Read(Consumer):
     """
@@ -29,7 +32,32 @@ class Read(Consumer):
     It supports agnostic raw data composition for presenters that have
     :code:`_get_import_locations` and :code:`_merge_import`.
     
-    To improve performance, loaders are called asynchronously on separate threads.
+    To improve performance, loaders are called asynchronously on separate threads, and
+    documents found in a :class:`aria.reading.Snapshot` are not loaded at all. If
+    :code:`context.presentation.processes` is not 0, large documents are constructed in parallel
+    in a :class:`aria.reading.ReaderProcessPool`.
+    
+    Imports are resolved and claimed before they are submitted, so that each document is read
+    exactly once even in diamond-shaped import graphs. The deduplicated graph is available in
+    :code:`context.presentation.import_graph`.
+    
+    If :code:`context.reading.lockfile` is set, locked imports are loaded directly from their
+    recorded locations, and their content is verified against the recorded hash (with a read cache,
+    remote imports are not fetched at all). Imports that fail verification are resolved normally. If the
+    lockfile is being refreshed, it is saved after reading.
+    
+    A Merkle fingerprint of the blueprint and its imports is stored in
+    :code:`context.presentation.fingerprint`. If :code:`context.presentation.fingerprint_only` is
+    True, only the fingerprint is computed: documents are loaded and prescanned for imports, but
+    not fully read, and no presenter is created.
+    
+    Imports are submitted as soon as the reader's prescan finds them (see
+    :code:`context.reading.prescan_keys`), so that the next level of imports is loaded while the
+    current document is still being constructed.
+    
+    Profiles (see :class:`aria.presentation.PresentationRegistry`) are not merged document by
+    document, but from the shared presenter in :code:`context.presentation.registry`, so that their
+    type presentations are shared with other parses.
     
     Note that parsing may internally trigger more than one loading/reading/presentation
     cycle, for example if the agnostic raw data has dependencies that must also be parsed.
@@ -42,6 +70,15 @@ class Read(Consumer):
 
         presenter = None
         imported_presentations = None
+        self.context.presentation.import_graph = ImportGraph()
+        self._presentations = {}
+        
+        # Note: The process pool must be created before the threads are started
+        processes = self.context.presentation.processes
+        process_pool = None
+        if (processes != 0) and (self.context.reading.process_pool is None) and not self.context.presentation.fingerprint_only:
+            process_pool = ReaderProcessPool(processes)
+            self.context.reading.process_pool = process_pool
         
         executor = FixedThreadPoolExecutor(size=self.context.presentation.threads, timeout=self.context.presentation.timeout)
         executor.print_exceptions = self.context.presentation.print_exceptions
@@ -56,20 +93,47 @@ class Read(Consumer):
             imported_presentations = executor.returns
         finally:
             executor.close()
+            if process_pool is not None:
+                self.context.reading.process_pool = None
+                process_pool.close()
+        
+        self.context.presentation.fingerprint = self.context.presentation.import_graph.get_fingerprint()
+        
+        lockfile = self.context.reading.lockfile
+        if (lockfile is not None) and lockfile.refresh:
+            lockfile.save()
 
         # Merge imports
         if (imported_presentations is not None) and hasattr(presenter, '_merge_import'):
+            shared = self._share(presenter)
+            if shared is not None:
+                # The profiles are merged from the shared presenter instead
+                shared_presenter, shared_nodes = shared
+                shared_presentations = set(id(self._presentations[node]) for node in shared_nodes)
+                imported_presentations = [p for p in imported_presentations if id(p) not in shared_presentations]
+            
             for imported_presentation in imported_presentations:
                 ok = True
                 if hasattr(presenter, '_validate_import'):
                     ok = presenter._validate_import(self.context, imported_presentation)
                 if ok:
                     presenter._merge_import(imported_presentation)
+            
+            if shared is not None:
+                ok = True
+                if hasattr(presenter, '_validate_import'):
+                    ok = presenter._validate_import(self.context, shared_presenter)
+                if ok:
+                    self.context.presentation.registry.merge(presenter, shared_presenter)
                     
         self.context.presentation.presenter = presenter
 
     def dump(self):
-        if self.context.has_arg_switch('yaml'):
+        if self.context.presentation.fingerprint_only or self.context.has_arg_switch('fingerprint'):
+            self.context.out.write(self.context.presentation.fingerprint + '\n')
+        elif self.context.has_arg_switch('imports'):
+            self.context.presentation.import_graph.dump(self.context)
+        elif self.context.has_arg_switch('yaml'):
             indent = self.context.get_arg_value_int('indent', 2)
             raw = self.context.presentation.presenter._raw
             self.context.out.write(yaml_dumps(raw, indent=indent))
@@ -80,36 +144,152 @@ class Read(Consumer):
         else:
             self.context.presentation.presenter._dump(self.context)
 
+    def _share(self, presenter):
+        # The shared presenter for our profiles and their documents (see PresentationRegistry)
+        registry = self.context.presentation.registry
+        if (registry is None) or (presenter is None) or self.context.presentation.fingerprint_only:
+            return None
+        try:
+            shared = registry.share(ConsumptionContext(), presenter.__class__, self.context.presentation.import_graph, self._presentations)
+        except Exception:
+            # The profiles will be merged (and any problem will be reported) as usual
+            return None
+        if (shared is not None) and not all(node in self._presentations for node in shared[1]):
+            # The registered presenter is for documents we didn't read
+            return None
+        return shared
+
     def _handle_exception(self, e):
         if isinstance(e, AlreadyReadError):
             return
         super(Read, self)._handle_exception(e)
     
-    def _present(self, location, origin_location, presenter_class, executor):
-        raw = self._read(location, origin_location)
+    def _present(self, location, origin_location, presenter_class, executor, reader=None, import_name=None):
+        if reader is None:
+            reader = self._get_reader(location, origin_location)
+        
+        # Imports found by the reader's prescan are submitted before the document is fully read
+        prefetched = []
+        def on_prescan(raw):
+            prefetched.append(self._prefetch(raw, reader, location, presenter_class, executor))
+        lockfile = self.context.reading.lockfile
+        try:
+            raw = self._read(reader, on_prescan)
+        except ContentMismatchError:
+            # Stale lockfile entry: resolve normally
+            lockfile.mark_stale(reader.canonical_location)
+            reader.release()
+            location = UriLocation(import_name)
+            reader = self._get_reader(location, origin_location)
+            raw = self._read(reader, on_prescan)
+        
+        if (lockfile is not None) and (origin_location is not None) and (reader.canonical_location is not None):
+            lockfile.add_document(reader.canonical_location, reader.content_hash, reader.content_size)
         
         if presenter_class is None:
             presenter_class = self.context.presentation.presenter_source.get_presenter(raw)
         
         presentation = presenter_class(raw=raw)
+        fingerprint_only = self.context.presentation.fingerprint_only
 
-        if presentation is not None and hasattr(presentation, '_link'):
+        if presentation is not None and hasattr(presentation, '_link') and not fingerprint_only:
             presentation._link()
+        
+        node = self._get_node(reader, location)
+        self.context.presentation.import_graph.add_node(node, reader.content_hash, origin_location is None)
+        if presentation is not None:
+            self._presentations[node] = presentation
             
-        # Submit imports to executor
+        if not (prefetched and prefetched[0]):
+            self._submit_imports(presentation, node, location, presenter_class, executor)
+
+        return presentation if not fingerprint_only else None
+    
+    def _read(self, reader, on_prescan):
+        if self.context.presentation.fingerprint_only:
+            # We only need the content hash and the imports
+            raw = reader.prescan(reader.load())
+            return raw if raw is not None else reader.read()
+        reader.on_prescan = on_prescan
+        return reader.read()
+    
+    def _prefetch(self, raw, reader, location, presenter_class, executor):
+        # Returns True if the imports were submitted
+        try:
+            if presenter_class is None:
+                presenter_class = self.context.presentation.presenter_source.get_presenter(raw)
+            presentation = presenter_class(raw=raw)
+            node = self._get_node(reader, location)
+            self._submit_imports(presentation, node, location, presenter_class, executor)
+            return True
+        except Exception:
+            # Imports will be submitted after the document is fully read
+            return False
+    
+    def _submit_imports(self, presentation, node, location, presenter_class, executor):
+        if hasattr(presentation, '_get_uri_mirrors'):
+            # Repository mirrors must be known before the imports are loaded
+            uri_mirrors = presentation._get_uri_mirrors()
+            if uri_mirrors:
+                for url, mirrors in uri_mirrors.iteritems():
+                    self.context.loading.uri_repositories.add(url, mirrors)
+        
         if hasattr(presentation, '_get_import_locations'):
             import_locations = presentation._get_import_locations()
             if import_locations:
-                for import_location in import_locations:
+                import_graph = self.context.presentation.import_graph
+                lockfile = self.context.reading.lockfile
+                for import_name in import_locations:
                     # The imports inherit the parent presenter class and use the current location as their origin location
-                    import_location = UriLocation(import_location)
-                    executor.submit(self._present, import_location, location, presenter_class, executor)
-
-        return presentation
+                    import_location = UriLocation(import_name)
+                    
+                    # Resolve and claim the import here, so that duplicates are never submitted
+                    start = time.time()
+                    try:
+                        import_reader = self._get_locked_reader(node, import_name)
+                        if import_reader is not None:
+                            import_location = import_reader.location
+                        else:
+                            import_reader = self._get_reader(import_location, location)
+                        if import_reader is self.context.reading.reader:
+                            # The reader override is used for all locations, and it has already
+                            # been read (as the root), so this is a duplicate
+                            claimed = False
+                        else:
+                            claimed = import_reader.claim()
+                    except Exception:
+                        # Let the executor handle the error
+                        import_reader = None
+                        claimed = True
+                    import_node = self._get_node(import_reader, import_location)
+                    import_graph.add_import(node, import_node, not claimed, time.time() - start)
+                    if (lockfile is not None) and (import_reader is not None) and (import_reader.canonical_location is not None):
+                        lockfile.add_import(node, import_name, import_reader.canonical_location)
+                    
+                    if claimed:
+                        executor.submit(self._present, import_location, location, presenter_class, executor, import_reader, import_name)
+    
+    def _get_locked_reader(self, node, import_name):
+        lockfile = self.context.reading.lockfile
+        locked = lockfile.get(node, import_name) if lockfile is not None else None
+        if locked is None:
+            return None
+        location, content_hash = locked
+        reader = self._get_reader(UriLocation(location), None)
+        reader.expected_content_hash = content_hash
+        return reader
     
-    def _read(self, location, origin_location):
+    def _get_node(self, reader, location):
+        canonical_location = reader.canonical_location if reader is not None else None
+        return canonical_location or unicode(location)
+    
+    def _get_reader(self, location, origin_location):
         if self.context.reading.reader is not None:
-            return self.context.reading.reader.read()
+            return self.context.reading.reader
+        for snapshots in (self.context.reading.snapshots, SNAPSHOTS):
+            for snapshot in snapshots:
+                reader = snapshot.get_reader(self.context.reading, location, origin_location)
+                if reader is not None:
+                    return reader
         loader = self.context.loading.loader_source.get_loader(self.context.loading, location, origin_location)
-        reader = self.context.reading.reader_source.get_reader(self.context.reading, location, loader)
-        return reader.read()
+        return self.context.reading.reader_source.get_reader(self.context.reading, location, loader)
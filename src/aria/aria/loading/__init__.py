@@ -20,8 +20,12 @@ from .loader import Loader
 from .source import LoaderSource, DefaultLoaderSource
 from .location import Location, UriLocation, LiteralLocation
 from .literal import LiteralLoader
-from .uri import SESSION, SESSION_CACHE_PATH, UriLoader, UriTextLoader
+from .uri import SESSION, SESSION_CACHE_PATH, get_canonical_uri, UriCache, UriSessionStats, UriSession, UriLoader, UriTextLoader
 from .file import FILE_LOADER_SEARCH_PATHS, FileTextLoader
+from .index import DIRECTORY_INDEX, DirectoryIndex
+from .repositories import FAILURE_LATENCY, URI_LATENCY_STATS, UriLatencyStats, UriRepositories
+from .mirror import MIRROR_MAPPINGS_FILE, URI_MIRRORS, UriMirror, MirrorTextLoader
+from .csar import CSAR_EXTENSIONS, CSAR_SEPARATOR, CSAR_ARCHIVES, CsarArchive, CsarArchives, CsarTextLoader, parse_csar_uri
 
 __all__ = (
     'LoaderError',
@@ -37,7 +41,28 @@ __all__ = (
     'LiteralLoader',
     'SESSION',
     'SESSION_CACHE_PATH',
+    'get_canonical_uri',
+    'UriCache',
+    'UriSessionStats',
+    'UriSession',
     'UriLoader',
     'UriTextLoader',
     'FILE_LOADER_SEARCH_PATHS',
-    'FileTextLoader')
+    'FileTextLoader',
+    'DIRECTORY_INDEX',
+    'DirectoryIndex',
+    'FAILURE_LATENCY',
+    'URI_LATENCY_STATS',
+    'UriLatencyStats',
+    'UriRepositories',
+    'MIRROR_MAPPINGS_FILE',
+    'URI_MIRRORS',
+    'UriMirror',
+    'MirrorTextLoader',
+    'CSAR_EXTENSIONS',
+    'CSAR_SEPARATOR',
+    'CSAR_ARCHIVES',
+    'CsarArchive',
+    'CsarArchives',
+    'CsarTextLoader',
+    'parse_csar_uri')
@@ -15,6 +15,8 @@
 #
 
 from .source import DefaultLoaderSource 
+from .mirror import UriMirror
+from .repositories import UriRepositories
 from ..utils import StrictList
 
 class LoadingContext(object):
@@ -23,8 +25,15 @@ class LoadingContext(object):
     
     * :code:`loader_source`: For finding loader instances
     * :code:`search_paths`: List of additional search paths :class:`FileTextLoader`
+    * :code:`mirrors`: List of :class:`UriMirror` instances to try before loading non-file URIs
+    * :code:`uri_repositories`: :class:`UriRepositories` with mirrors for hedged requests by
+      :class:`UriTextLoader`
+    * :code:`uri_session`: :class:`UriSession` for :class:`UriTextLoader` (defaults to None, meaning the process-wide session)
     """
     
     def __init__(self):
         self.loader_source = DefaultLoaderSource()
         self.search_paths = StrictList(value_class=basestring)
+        self.mirrors = StrictList(value_class=UriMirror)
+        self.uri_repositories = UriRepositories()
+        self.uri_session = None
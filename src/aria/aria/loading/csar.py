@@ -0,0 +1,219 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .loader import Loader
+from .exceptions import LoaderError, DocumentNotFoundError
+from threading import Lock
+import zipfile, posixpath, os
+
+CSAR_EXTENSIONS = ('.csar', '.zip')
+CSAR_SEPARATOR = '!/'
+CSAR_META_PATH = 'TOSCA-Metadata/TOSCA.meta'
+
+class CsarArchive(object):
+    """
+    An open CSAR (TOSCA Cloud Service Archive).
+    
+    Members are read directly from the zip file's central directory, without extracting
+    anything to disk. The archive handle is shared by all threads: reads are serialized.
+    Reading from a closed archive returns None.
+    
+    The entry definitions are taken from :code:`Entry-Definitions` in
+    :code:`TOSCA-Metadata/TOSCA.meta`. If there is no metadata file, the single YAML file at the
+    root of the archive is used instead.
+    """
+    
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.mtime = os.stat(self.path).st_mtime
+        self._zip = zipfile.ZipFile(self.path)
+        self._members = frozenset(self._zip.namelist())
+        self._lock = Lock()
+        self.meta = self._parse_meta()
+    
+    @property
+    def entry_definitions(self):
+        entry_definitions = self.meta.get('Entry-Definitions')
+        if entry_definitions is not None:
+            return entry_definitions
+        candidates = [m for m in self._members if ('/' not in m) and m.endswith('.yaml')]
+        return candidates[0] if len(candidates) == 1 else None
+    
+    def get_uri(self, member):
+        return self.path + CSAR_SEPARATOR + member
+    
+    def has(self, member):
+        return member in self._members
+    
+    @property
+    def closed(self):
+        return self._zip is None
+    
+    def read(self, member):
+        with self._lock:
+            if self._zip is None:
+                return None
+            return self._zip.read(member)
+    
+    def resolve(self, name, origin_member=None):
+        """
+        Returns the archive member for a relative import name, or None if not found.
+        
+        The name is tried relative to the importing member first, and then relative to the root of
+        the archive.
+        """
+        
+        candidates = []
+        if origin_member is not None:
+            candidates.append(posixpath.join(posixpath.dirname(origin_member), name))
+        candidates.append(name)
+        for candidate in candidates:
+            candidate = posixpath.normpath(candidate)
+            if self.has(candidate):
+                return candidate
+        return None
+    
+    def close(self):
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+    
+    def _parse_meta(self):
+        # The first block (before an empty line) is the metadata for the archive
+        meta = {}
+        if self.has(CSAR_META_PATH):
+            for line in self.read(CSAR_META_PATH).decode('utf-8').splitlines():
+                line = line.strip()
+                if not line:
+                    break
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    meta[key.strip()] = value.strip()
+        return meta
+
+class CsarArchives(object):
+    """
+    Cache of open :class:`CsarArchive` instances, keyed by absolute path.
+    
+    An archive is re-opened whenever the file's modification time changes, and the previous one is
+    closed (loaders that still refer to it will get the new one).
+    
+    The cache is thread-safe. Usually you would use the process-wide :code:`CSAR_ARCHIVES`.
+    """
+    
+    def __init__(self):
+        self._archives = {}
+        self._lock = Lock()
+    
+    def get(self, path):
+        path = os.path.abspath(path)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError as e:
+            raise DocumentNotFoundError('CSAR not found: "%s"' % path, cause=e)
+        with self._lock:
+            archive = self._archives.get(path)
+            if (archive is None) or (archive.mtime != mtime):
+                try:
+                    new_archive = CsarArchive(path)
+                except (zipfile.BadZipfile, EnvironmentError) as e:
+                    raise LoaderError('CSAR error: "%s"' % path, cause=e)
+                self._archives[path] = new_archive
+                if archive is not None:
+                    archive.close()
+                archive = new_archive
+            return archive
+    
+    def clear(self):
+        with self._lock:
+            for archive in self._archives.itervalues():
+                archive.close()
+            self._archives.clear()
+
+CSAR_ARCHIVES = CsarArchives()
+
+def parse_csar_uri(uri):
+    """
+    Splits a URI into the CSAR path and member (which can be None).
+    
+    Returns None if the URI does not refer to a CSAR. Members are specified after a "!/"
+    separator, for example "blueprint.csar!/Definitions/main.yaml".
+    """
+    
+    if CSAR_SEPARATOR in uri:
+        path, member = uri.split(CSAR_SEPARATOR, 1)
+        if path.endswith(CSAR_EXTENSIONS):
+            return path, member
+    elif uri.endswith(CSAR_EXTENSIONS):
+        return uri, None
+    return None
+
+class CsarTextLoader(Loader):
+    """
+    ARIA CSAR text loader.
+    
+    Extracts a text document from a member of a CSAR, via the process-wide :code:`CSAR_ARCHIVES`.
+    If no member is specified, the archive's entry definitions are used, in which case the
+    location's URI is changed to refer to that member, so that the right reader is selected and
+    so that imports will be resolved relative to it.
+    """
+    
+    LOCAL = True
+    
+    def __init__(self, location, path, member=None, encoding='utf-8'):
+        self.location = location
+        self.encoding = encoding
+        self.archive = CSAR_ARCHIVES.get(path)
+        if member is None:
+            member = self.archive.entry_definitions
+            if member is None:
+                raise DocumentNotFoundError('CSAR has no entry definitions: "%s"' % location)
+            location.uri = self.archive.get_uri(member)
+        self.member = member
+        self.data = None
+    
+    def get_canonical_location(self):
+        return self.archive.get_uri(self.member)
+    
+    def open(self):
+        if self.archive.closed:
+            # The file has changed since we got the archive
+            self.archive = CSAR_ARCHIVES.get(self.archive.path)
+        if not self.archive.has(self.member):
+            raise DocumentNotFoundError('CSAR member not found: "%s"' % self.location)
+        try:
+            self.data = self.archive.read(self.member)
+            if self.data is None:
+                # Closed while we were checking
+                self.archive = CSAR_ARCHIVES.get(self.archive.path)
+                self.data = self.archive.read(self.member)
+        except Exception as e:
+            raise LoaderError('CSAR error: "%s"' % self.location, cause=e)
+    
+    def close(self):
+        self.data = None
+    
+    def load(self):
+        if self.data is not None:
+            try:
+                return self.data.decode(self.encoding)
+            except Exception as e:
+                raise LoaderError('CSAR error: "%s"' % self.location, cause=e)
+        return None
+    
+    def load_bytes(self):
+        return self.data
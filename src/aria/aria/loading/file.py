@@ -16,8 +16,9 @@
 
 from .loader import Loader
 from .exceptions import LoaderError, DocumentNotFoundError
+from .index import DIRECTORY_INDEX
 from ..utils import StrictList
-import codecs, os.path
+import mmap, os.path
 
 FILE_LOADER_SEARCH_PATHS = StrictList(value_class=basestring)
 
@@ -28,12 +29,18 @@ class FileTextLoader(Loader):
     Extracts a text document from a file. The default encoding is UTF-8, but other supported
     encoding can be specified instead.
     
+    The file is memory-mapped and decoded exactly once, directly from the mapped pages. Readers
+    that accept bytes can use :code:`load_bytes` instead, in which case there is no decoding at all.
+    
     Supports a list of search paths that are tried in order if the file cannot be found.
-    They can be specified in the context, as well as globally in :code:`FILE_LOADER_SEARCH_PATHS`. 
+    They can be specified in the context, as well as globally in :code:`FILE_LOADER_SEARCH_PATHS`.
+    They are resolved via the process-wide :code:`DIRECTORY_INDEX`.
     
     If :code:`origin_location` is provided, a base path will be extracted from it and prepended
     to the search paths.
     """
+    
+    LOCAL = True
 
     def __init__(self, context, location, origin_location, encoding='utf-8'):
         self.context = context
@@ -42,6 +49,7 @@ class FileTextLoader(Loader):
         self.path = location.as_file
         self.search_paths = StrictList(value_class=basestring) 
         self.file = None
+        self.resolved_path = None
         
         def add_search_path(search_path):
             if search_path not in self.search_paths:
@@ -59,23 +67,25 @@ class FileTextLoader(Loader):
         add_search_paths(context.search_paths)
         add_search_paths(FILE_LOADER_SEARCH_PATHS)
     
+    def get_canonical_location(self):
+        if self.resolved_path is None:
+            self.resolved_path = DIRECTORY_INDEX.find(self.path, self.search_paths)
+        return os.path.abspath(self.resolved_path) if self.resolved_path is not None else None
+    
     def open(self):
+        path = self.resolved_path
+        if path is None:
+            path = DIRECTORY_INDEX.find(self.path, self.search_paths)
+        if path is None:
+            raise DocumentNotFoundError('file not found: "%s"' % self.location)
         try:
-            self._open(os.path.abspath(self.path))
+            self._open(path)
         except IOError as e:
             if e.errno == 2:
-                # Not found, so try in paths
-                for p in self.search_paths:
-                    path = os.path.join(p, self.path)
-                    try:
-                        self._open(path)
-                        return
-                    except IOError as e:
-                        if e.errno != 2:
-                            raise LoaderError('file I/O error: "%s"' % path, cause=e)
+                # Removed since it was indexed
                 raise DocumentNotFoundError('file not found: "%s"' % self.location, cause=e)
             else:
-                raise LoaderError('file I/O error: "%s"' % self.location, cause=e)
+                raise LoaderError('file I/O error: "%s"' % path, cause=e)
         except Exception as e:
             raise LoaderError('file error: "%s"' % self.location, cause=e)
 
@@ -89,6 +99,22 @@ class FileTextLoader(Loader):
                 raise LoaderError('file error: "%s"' % self.location, cause=e)
 
     def load(self):
+        if self.file is not None:
+            try:
+                mapped = self._map()
+                if mapped is not None:
+                    try:
+                        return unicode(mapped, self.encoding)
+                    finally:
+                        mapped.close()
+                return unicode(self.file.read(), self.encoding)
+            except IOError as e:
+                raise LoaderError('file I/O error: "%s"' % self.location, cause=e)
+            except Exception as e:
+                raise LoaderError('file error %s' % self.location, cause=e)
+        return None
+
+    def load_bytes(self):
         if self.file is not None:
             try:
                 return self.file.read()
@@ -99,5 +125,12 @@ class FileTextLoader(Loader):
         return None
 
     def _open(self, path):
-        self.file = codecs.open(path, mode='r', encoding=self.encoding, buffering=1)
+        self.file = open(path, 'rb')
         self.location.uri = path
+
+    def _map(self):
+        try:
+            return mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # Empty files (and some special files) cannot be mapped
+            return None
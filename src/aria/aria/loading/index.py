@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from threading import Lock
+import os, time
+
+RACY_INTERVAL = 2.0
+
+class DirectoryIndex(object):
+    """
+    Cache of directory listings, for resolving file names against search paths.
+    
+    A listing is kept per directory and is refreshed whenever the directory's modification
+    time changes, so resolving a name costs one :code:`stat` per directory consulted instead of
+    a failed :code:`open` (and an exception) per directory.
+    
+    Modification times have a limited granularity (up to 2 seconds, depending on the file system),
+    so a file added right after a directory was listed might not change its modification time. A
+    listing is thus not trusted if it was taken within :code:`RACY_INTERVAL` seconds of the
+    directory's modification time, and such directories are listed again every time. Lookups are
+    case-sensitive, even on case-insensitive file systems.
+    
+    The index is thread-safe. Usually you would use the process-wide :code:`DIRECTORY_INDEX`.
+    """
+    
+    def __init__(self):
+        self._listings = {}
+        self._lock = Lock()
+    
+    def find(self, name, search_paths=()):
+        """
+        Returns the absolute path of the first file that matches the name, or None if not found.
+        
+        If the name is relative, it is first tried against the current directory and then
+        against each of the search paths in order.
+        """
+        
+        path = os.path.abspath(name)
+        if self.exists(path):
+            return path
+        if not os.path.isabs(name):
+            for search_path in search_paths:
+                path = os.path.abspath(os.path.join(search_path, name))
+                if self.exists(path):
+                    return path
+        return None
+    
+    def exists(self, path):
+        """
+        True if the absolute path is listed in its directory.
+        """
+        
+        directory, name = os.path.split(path)
+        listing = self._get_listing(directory)
+        return (listing is not None) and (name in listing)
+    
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+    
+    def _get_listing(self, directory):
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError:
+            return None
+
+        entry = self._listings.get(directory)
+        if (entry is not None) and (entry[0] == mtime):
+            return entry[1]
+
+        now = time.time()
+        try:
+            listing = frozenset(os.listdir(directory))
+        except OSError:
+            return None
+        if now - mtime >= RACY_INTERVAL:
+            with self._lock:
+                self._listings[directory] = (mtime, listing)
+        return listing
+
+DIRECTORY_INDEX = DirectoryIndex()
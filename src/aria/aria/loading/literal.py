@@ -22,6 +22,8 @@ class LiteralLoader(Loader):
     
     This loader is a trivial holder for the provided value.
     """
+    
+    LOCAL = True
 
     def __init__(self, location):
         self.location = location
@@ -25,8 +25,25 @@ class Loader(object):
     
     Though the extracted document is often textual (a string or string-like
     data), loaders may provide any format.
+    
+    Text loaders may also provide a :code:`load_bytes` method, which returns the
+    undecoded document for readers that accept bytes.
+    
+    :code:`LOCAL` is True for loaders of local documents, which are cheap to load, and may change
+    at any time. Readers always load (and verify) them, even if their content is expected to be
+    known.
     """
     
+    LOCAL = False
+    
+    def get_canonical_location(self):
+        """
+        Returns a string uniquely identifying the document source (e.g. a normalized absolute
+        path or URI), or None if there is none. Must be cheap: it is called before :code:`open`.
+        """
+        
+        return None
+    
     def load(self):
         raise UnimplementedFunctionalityError(classname(self) + '.load')
     
@@ -0,0 +1,125 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .file import FileTextLoader
+from .uri import get_canonical_uri
+from .index import DIRECTORY_INDEX
+from ..utils import StrictList
+import urlparse, tempfile, json, os
+
+MIRROR_MAPPINGS_FILE = 'mirror.json'
+
+class UriMirror(object):
+    """
+    A local directory mirroring remote documents.
+    
+    URIs are mapped to local paths by prefix. Explicit mappings (URI prefix to a path, which may
+    be relative to the mirror's root) can be provided, and are also read from a
+    :code:`mirror.json` file in the root if it exists. Longer prefixes take precedence.
+    
+    URIs that do not match any mapping are mapped to "<root>/<scheme>/<host>/<path>", which is
+    also the layout used by :code:`put` and by :code:`aria-prefetch`. URIs with query strings are
+    not mirrored.
+    """
+    
+    def __init__(self, root, mappings=None):
+        self.root = os.path.abspath(root)
+        self.mappings = {}
+        mappings_path = os.path.join(self.root, MIRROR_MAPPINGS_FILE)
+        if os.path.isfile(mappings_path):
+            with open(mappings_path) as f:
+                self.mappings.update(json.load(f))
+        if mappings:
+            self.mappings.update(mappings)
+        self._prefixes = sorted(self.mappings, key=len, reverse=True)
+
+    def get_path(self, uri):
+        """
+        The local path for the URI, whether or not it exists.
+        
+        Returns None if the URI cannot be mirrored.
+        """
+        
+        uri = get_canonical_uri(uri)
+        url = urlparse.urlsplit(uri)
+        if url.query or (not url.scheme) or url.path.endswith('/'):
+            return None
+        for prefix in self._prefixes:
+            if uri.startswith(prefix):
+                path = os.path.join(self.root, self.mappings[prefix], *uri[len(prefix):].split('/'))
+                break
+        else:
+            path = os.path.join(self.root, url.scheme, url.netloc.replace(':', '_'), *url.path.split('/'))
+        path = os.path.normpath(path)
+        
+        # Make sure we do not escape the mirror
+        return path if path.startswith(self.root + os.sep) else None
+    
+    def find(self, uri):
+        """
+        The local path for the URI, or None if it's not in the mirror.
+        """
+        
+        path = self.get_path(uri)
+        return path if (path is not None) and DIRECTORY_INDEX.exists(path) else None
+    
+    def put(self, uri, data):
+        """
+        Atomically stores the document for the URI, returning the local path, or None if the URI
+        cannot be mirrored.
+        """
+        
+        path = self.get_path(uri)
+        if path is None:
+            return None
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                if not os.path.isdir(directory):
+                    raise
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.rename(temp_path, path)
+        except:
+            os.remove(temp_path)
+            raise
+        return path
+
+URI_MIRRORS = StrictList(value_class=UriMirror)
+
+class MirrorTextLoader(FileTextLoader):
+    """
+    ARIA mirror text loader.
+    
+    Extracts a text document for a URI from the local path of a :class:`UriMirror`. Unlike
+    :class:`FileTextLoader`, the location is left as is, so that the document is still identified
+    by (and reported at) its URI.
+    """
+    
+    def __init__(self, context, location, path, encoding='utf-8'):
+        super(MirrorTextLoader, self).__init__(context, location, None, encoding)
+        self.path = path
+        self.resolved_path = path
+    
+    def get_canonical_location(self):
+        return get_canonical_uri(self.location.uri)
+
+    def _open(self, path):
+        self.file = open(path, 'rb')
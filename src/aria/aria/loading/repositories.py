@@ -0,0 +1,158 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from threading import Lock
+
+FAILURE_LATENCY = 10.0 # in seconds
+
+class UriLatencyStats(object):
+    """
+    Thread-safe latency statistics per base URL (a repository or one of its mirrors).
+    
+    Latency is tracked as an exponentially weighted moving average. Failures count as
+    :code:`FAILURE_LATENCY`, so that failing mirrors quickly move to the end of the line.
+    
+    Usually you would use the process-wide :code:`URI_LATENCY_STATS`.
+    """
+    
+    def __init__(self, weight=0.3):
+        """
+        :param weight: Weight of new samples in the moving average
+        """
+        
+        self.weight = weight
+        self._stats = {}
+        self._lock = Lock()
+    
+    def add(self, base, latency):
+        with self._lock:
+            count, failures, average = self._stats.get(base, (0, 0, None))
+            average = latency if average is None else (average + self.weight * (latency - average))
+            self._stats[base] = (count + 1, failures, average)
+    
+    def add_failure(self, base):
+        with self._lock:
+            count, failures, average = self._stats.get(base, (0, 0, None))
+            average = FAILURE_LATENCY if average is None else (average + self.weight * (FAILURE_LATENCY - average))
+            self._stats[base] = (count + 1, failures + 1, average)
+    
+    def get_latency(self, base):
+        """
+        The average latency in seconds, or None if there are no samples.
+        """
+        
+        with self._lock:
+            stats = self._stats.get(base)
+        return stats[2] if stats is not None else None
+    
+    def get_info(self):
+        """
+        Dict of base URLs to (requests, failures, average latency) tuples.
+        """
+        
+        with self._lock:
+            return dict(self._stats)
+    
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+URI_LATENCY_STATS = UriLatencyStats()
+
+class UriRepositories(object):
+    """
+    Repositories of remote documents that have mirrors.
+    
+    Each repository is identified by its base URL, and has a list of mirror base URLs under which
+    the same documents can be found. :class:`aria.loading.UriLoader` uses these as candidates for
+    hedged requests: if a candidate has not answered within the hedge delay, a request is also sent
+    to the next candidate, and the first successful answer wins. Failed candidates are skipped
+    immediately.
+    
+    Candidates are ordered by their average latency (see :class:`UriLatencyStats`). Candidates
+    without samples are tried in the order in which they were declared, before slower ones.
+    
+    If :code:`hedge_delay` is None, it is derived from the candidate's average latency.
+    """
+    
+    def __init__(self, stats=None, hedge_delay=None, min_hedge_delay=0.05, max_hedge_delay=2.0, default_hedge_delay=0.5):
+        """
+        :param stats: Defaults to the process-wide :code:`URI_LATENCY_STATS`
+        :param hedge_delay: Fixed hedge delay in seconds
+        :param min_hedge_delay: Minimum derived hedge delay in seconds
+        :param max_hedge_delay: Maximum derived hedge delay in seconds
+        :param default_hedge_delay: Hedge delay in seconds for candidates without samples 
+        """
+        
+        self.stats = stats if stats is not None else URI_LATENCY_STATS
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedge_delay = max_hedge_delay
+        self.default_hedge_delay = default_hedge_delay
+        self._mirrors = {}
+        self._lock = Lock()
+    
+    def add(self, url, mirrors):
+        """
+        Declares mirrors for a repository. Mirrors declared again for the same repository are
+        ignored.
+        """
+        
+        url = _as_base(url)
+        with self._lock:
+            declared = self._mirrors.setdefault(url, [])
+            for mirror in mirrors:
+                mirror = _as_base(mirror)
+                if (mirror != url) and (mirror not in declared):
+                    declared.append(mirror)
+    
+    def get_candidates(self, uri):
+        """
+        Returns a list of (URI, base URL) tuples to try for the URI, in order, or None if the URI
+        is not in a repository with mirrors.
+        """
+        
+        with self._lock:
+            bases = [(url, mirrors) for url, mirrors in self._mirrors.iteritems() if mirrors and uri.startswith(url)]
+        if not bases:
+            return None
+        
+        # Longest matching repository
+        url, mirrors = max(bases, key=lambda b: len(b[0]))
+        path = uri[len(url):]
+        candidates = [(base + path, base) for base in [url] + mirrors]
+        
+        def get_key(candidate):
+            latency = self.stats.get_latency(candidate[1])
+            return latency if latency is not None else 0.0
+        
+        # Python's sort is stable, so declared order is kept for equal keys
+        return sorted(candidates, key=get_key)
+    
+    def get_hedge_delay(self, base):
+        """
+        How long to wait for the candidate before sending a request to the next one.
+        """
+        
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        latency = self.stats.get_latency(base)
+        if latency is None:
+            return self.default_hedge_delay
+        return min(max(latency * 2, self.min_hedge_delay), self.max_hedge_delay)
+
+def _as_base(url):
+    return url if url.endswith('/') else url + '/'
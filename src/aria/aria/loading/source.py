@@ -19,6 +19,9 @@ from .location import LiteralLocation, UriLocation
 from .literal import LiteralLoader
 from .file import FileTextLoader
 from .uri import UriTextLoader
+from .mirror import URI_MIRRORS, MirrorTextLoader
+from .csar import CSAR_ARCHIVES, CsarTextLoader, parse_csar_uri
+import urlparse
 
 class LoaderSource(object):
     """
@@ -41,13 +44,46 @@ class DefaultLoaderSource(LoaderSource):
     The default ARIA loader source will generate a :class:`UriTextLoader` for
     locations that are non-file URIs, and a :class:`FileTextLoader` for file
     URIs.
+    
+    Files ending in ".csar" or ".zip" (and members of them) are handled by a
+    :class:`CsarTextLoader`, as are relative imports from within a CSAR that can be
+    resolved to members of the same archive.
+    
+    Non-file URIs that are found in a :class:`UriMirror` (in the context's :code:`mirrors` or in
+    :code:`URI_MIRRORS`) are loaded from the mirror by a :class:`MirrorTextLoader` instead.
     """
     
     def get_loader(self, context, location, origin_location):
         if isinstance(location, UriLocation):
             if location.as_file is not None:
+                csar = parse_csar_uri(location.uri)
+                if csar is not None:
+                    return CsarTextLoader(location, *csar)
+                loader = self._get_csar_import_loader(location, origin_location)
+                if loader is not None:
+                    return loader
                 return FileTextLoader(context, location, origin_location)
             else:
-                return UriTextLoader(location)
+                for mirrors in (context.mirrors, URI_MIRRORS):
+                    for mirror in mirrors:
+                        path = mirror.find(location.uri)
+                        if path is not None:
+                            return MirrorTextLoader(context, location, path)
+                return UriTextLoader(location, session=context.uri_session, repositories=context.uri_repositories)
             
         return super(DefaultLoaderSource, self).get_loader(context, location, origin_location)
+
+    def _get_csar_import_loader(self, location, origin_location):
+        if (not isinstance(origin_location, UriLocation)) or urlparse.urlparse(location.uri).scheme:
+            return None
+        origin_csar = parse_csar_uri(origin_location.uri)
+        if (origin_csar is None) or (origin_csar[1] is None):
+            return None
+        path, origin_member = origin_csar
+        archive = CSAR_ARCHIVES.get(path)
+        member = archive.resolve(location.uri, origin_member)
+        if member is None:
+            return None
+        # Imports of the imported member will be relative to it
+        location.uri = archive.get_uri(member)
+        return CsarTextLoader(location, path, member)
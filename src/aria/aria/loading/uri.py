@@ -16,13 +16,158 @@
 
 from .loader import Loader
 from .exceptions import LoaderError, DocumentNotFoundError
+from ..utils import LRUFileCache, DaemonThread
 from requests import Session
-from requests.exceptions import ConnectionError
-from cachecontrol import CacheControl
-from cachecontrol.caches import FileCache
+from requests.exceptions import ConnectionError, Timeout
+from requests.packages.urllib3.util.retry import Retry
+from cachecontrol import CacheControlAdapter
+from cachecontrol.cache import BaseCache
+from threading import Lock
+from Queue import Queue, Empty
+from hashlib import sha224
+import urlparse, posixpath, os.path, tempfile, time
 
 SESSION = None
-SESSION_CACHE_PATH = '/tmp'
+SESSION_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'aria-uri-cache')
+
+_SESSION_LOCK = Lock()
+
+def get_canonical_uri(uri):
+    """
+    Normalizes a URI: the scheme and host are lowercased, the path is normalized, and the
+    fragment is removed.
+    """
+    
+    url = urlparse.urlsplit(uri)
+    path = posixpath.normpath(url.path) if url.path else '/'
+    if url.path.endswith('/') and not path.endswith('/'):
+        path += '/'
+    return urlparse.urlunsplit((url.scheme.lower(), url.netloc.lower(), path, url.query, ''))
+
+class UriCache(BaseCache):
+    """
+    A CacheControl cache stored in an :class:`aria.utils.LRUFileCache`, which bounds its size.
+    """
+    
+    def __init__(self, path, max_size):
+        self.files = LRUFileCache(path, max_size=max_size, suffix='.http')
+
+    def get(self, key):
+        return self.files.get(self._hash(key))
+
+    def set(self, key, value):
+        self.files.set(self._hash(key), value)
+
+    def delete(self, key):
+        self.files.delete(self._hash(key))
+
+    @staticmethod
+    def _hash(key):
+        return sha224(key.encode('utf-8') if isinstance(key, unicode) else key).hexdigest()
+
+class UriSessionStats(object):
+    """
+    Thread-safe statistics for a :class:`UriSession`.
+    
+    * :code:`hits`: Responses served from the cache without contacting the server
+    * :code:`revalidations`: Responses served from the cache after a conditional request
+    * :code:`misses`: Responses fetched from the server
+    * :code:`bytes_fetched`: Total size of the response bodies fetched from the server
+    """
+    
+    def __init__(self):
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.bytes_fetched = 0
+        self._lock = Lock()
+    
+    def add(self, response):
+        with self._lock:
+            if getattr(response, 'revalidated', False):
+                self.revalidations += 1
+            elif getattr(response, 'from_cache', False):
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.bytes_fetched += len(response.content)
+    
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.revalidations = 0
+            self.misses = 0
+            self.bytes_fetched = 0
+
+class UriSessionAdapter(CacheControlAdapter):
+    """
+    A CacheControl adapter that marks responses that were revalidated by a conditional request.
+    """
+    
+    def build_response(self, request, response, from_cache=False):
+        revalidated = (not from_cache) and (request.method == 'GET') and (response.status == 304)
+        r = super(UriSessionAdapter, self).build_response(request, response, from_cache)
+        r.revalidated = revalidated
+        return r
+
+class UriSession(object):
+    """
+    HTTP session for :class:`UriLoader`.
+    
+    It is safe to use the session from several threads at once: there is a connection pool per
+    host, and threads will wait for a connection if all of a host's connections are in use.
+    
+    Failed connections and server errors are retried with exponential backoff.
+    
+    Responses are cached according to their HTTP caching headers, in a cache directory that is
+    bounded in size. Set :code:`cache_path` to None to disable caching.
+    """
+    
+    def __init__(self, cache_path=SESSION_CACHE_PATH, cache_size=100 * 1024 * 1024, pool_size=10, connect_timeout=10, read_timeout=30, retries=3, backoff=0.5):
+        """
+        :param cache_path: Cache directory (will be created if it does not exist)
+        :param cache_size: Maximum total size of the cache in bytes
+        :param pool_size: Maximum number of connections per host
+        :param connect_timeout: Timeout in seconds for connecting
+        :param read_timeout: Timeout in seconds between bytes received from the server
+        :param retries: Number of retries for failed connections, reads and server errors
+        :param backoff: Backoff factor in seconds for retries (doubles on each retry)
+        """
+
+        self.timeout = (connect_timeout, read_timeout)
+        self.stats = UriSessionStats()
+        
+        self.cache = UriCache(cache_path, cache_size) if cache_path is not None else None
+        adapter = UriSessionAdapter(
+            cache=self.cache,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            max_retries=Retry(total=retries, backoff_factor=backoff, status_forcelist=(500, 502, 503, 504), raise_on_status=False))
+
+        self.session = Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, uri, headers=None):
+        response = self.session.get(uri, headers=headers, timeout=self.timeout)
+        if response.status_code == 200:
+            self.stats.add(response)
+        return response
+
+    def close(self):
+        self.session.close()
+
+def get_session():
+    """
+    Returns the process-wide :class:`UriSession`, creating it if necessary.
+    """
+    
+    global SESSION
+    if SESSION is None:
+        with _SESSION_LOCK:
+            if SESSION is None:
+                SESSION = UriSession()
+    return SESSION
 
 class UriLoader(Loader):
     """
@@ -32,31 +177,85 @@ class UriLoader(Loader):
     
     Note that the "file:" schema is not supported: :class:`FileTextLoader` should
     be used instead.
+    
+    If a :class:`UriSession` is not provided, the process-wide one will be used.
+    
+    If the URI is in one of the :class:`UriRepositories` that has mirrors, hedged requests are
+    sent to the repository and its mirrors, and the first successful answer is used.
     """
 
-    def __init__(self, location, headers={}):
+    def __init__(self, location, headers={}, session=None, repositories=None):
         self.location = location
         self.headers = headers
+        self.session = session
+        self.repositories = repositories
         self.response = None
     
+    def get_canonical_location(self):
+        return get_canonical_uri(self.location.uri)
+    
     def open(self):
-        global SESSION
-        if SESSION is None:
-            SESSION = CacheControl(Session(), cache=FileCache(SESSION_CACHE_PATH))
-            
+        session = self.session if self.session is not None else get_session()
+        candidates = self.repositories.get_candidates(self.location.uri) if self.repositories is not None else None
+        if candidates:
+            self.response = self._get_hedged(session, candidates)
+        else:
+            self.response = self._get(session, self.location.uri)
+    
+    def _get(self, session, uri):
         try:
-            self.response = SESSION.get(self.location.uri, headers=self.headers)
-            status = self.response.status_code
+            response = session.get(uri, headers=self.headers)
+            status = response.status_code
             if status == 404:
-                self.response = None
-                raise DocumentNotFoundError('URI not found: "%s"' % self.location)
+                raise DocumentNotFoundError('URI not found: "%s"' % uri)
             elif status != 200:
-                self.response = None
-                raise LoaderError('URI request error %d: "%s"' % (status, self.location))
+                raise LoaderError('URI request error %d: "%s"' % (status, uri))
+            return response
+        except (DocumentNotFoundError, LoaderError):
+            raise
+        except Timeout as e:
+            raise LoaderError('URI timeout: "%s"' % uri, cause=e)
         except ConnectionError as e:
-            raise LoaderError('URI connection error: "%s"' % self.location, cause=e)
+            raise LoaderError('URI connection error: "%s"' % uri, cause=e)
         except Exception as e:
-            raise LoaderError('URI error: "%s"' % self.location, cause=e)
+            raise LoaderError('URI error: "%s"' % uri, cause=e)
+
+    def _get_hedged(self, session, candidates):
+        stats = self.repositories.stats
+        results = Queue()
+        
+        def get(uri, base):
+            start = time.time()
+            try:
+                response = self._get(session, uri)
+            except LoaderError as e:
+                stats.add_failure(base)
+                results.put((None, e))
+            else:
+                stats.add(base, time.time() - start)
+                results.put((response, None))
+        
+        candidates = list(candidates)
+        pending = 0
+        first_error = None
+        while candidates or pending:
+            if candidates:
+                uri, base = candidates.pop(0)
+                DaemonThread(target=get, args=(uri, base)).start()
+                pending += 1
+            try:
+                # If there are more candidates, we will only wait for the hedge delay
+                timeout = self.repositories.get_hedge_delay(base) if candidates else None
+                response, error = results.get(True, timeout) if timeout is not None else results.get()
+            except Empty:
+                continue
+            pending -= 1
+            if response is not None:
+                # Slower requests will be discarded when they finish
+                return response
+            if first_error is None:
+                first_error = error
+        raise first_error
 
 class UriTextLoader(UriLoader):
     """
@@ -70,3 +269,11 @@ class UriTextLoader(UriLoader):
             except Exception as e:
                 raise LoaderError('URI: %s' % self.location, cause=e)
         return None
+
+    def load_bytes(self):
+        if self.response is not None:
+            try:
+                return self.response.content
+            except Exception as e:
+                raise LoaderError('URI: %s' % self.location, cause=e)
+        return None
@@ -15,8 +15,9 @@
 #
 
 from .exceptions import PresenterError, PresenterNotFoundError
-from .context import PresentationContext
+from .context import PresentationContext, ImportGraph
 from .presenter import Presenter
+from .registry import PresentationRegistry, PRESENTATION_REGISTRY, get_shared_presentation
 from .presentation import Value, PresentationBase, Presentation, AsIsPresentation, FakePresentation
 from .source import PRESENTER_CLASSES, PresenterSource, DefaultPresenterSource
 from .fields import Field, has_fields, short_form_field, allow_unknown_fields, primitive_field, primitive_list_field, primitive_dict_field, primitive_dict_unknown_fields, object_field, object_list_field, object_dict_field, object_sequenced_list_field, object_dict_unknown_fields, field_getter, field_setter, field_validator
@@ -27,7 +28,11 @@ __all__ = (
     'PresenterError',
     'PresenterNotFoundError',
     'PresentationContext',
+    'ImportGraph',
     'Presenter',
+    'PresentationRegistry',
+    'PRESENTATION_REGISTRY',
+    'get_shared_presentation',
     'Value',
     'PresentationBase',
     'Presentation',
@@ -15,6 +15,10 @@
 #
 
 from .source import DefaultPresenterSource
+from .registry import PRESENTATION_REGISTRY
+from ..utils import puts
+from threading import Lock
+from hashlib import sha1
 
 class PresentationContext(object):
     """
@@ -25,8 +29,16 @@ class PresentationContext(object):
     * :code:`presenter_source`: For finding presenter classes
     * :code:`presenter_class`: Overrides :code:`presenter_source` with a specific class
     * :code:`threads`: Number of threads to use when reading data
+    * :code:`processes`: Number of worker processes to use for constructing agnostic raw data (0
+      to construct it on the reading threads, None for the number of CPUs)
     * :code:`timeout`: Timeout in seconds for loading data
     * :code:`print_exceptions`: Whether to print exceptions while reading data
+    * :code:`import_graph`: The :class:`ImportGraph` of the last read
+    * :code:`fingerprint`: Merkle fingerprint of the last read (see :class:`ImportGraph`)
+    * :code:`fingerprint_only`: Whether to only read what is needed for the fingerprint, without
+      building presenters
+    * :code:`registry`: The :class:`PresentationRegistry` of shared profile presenters (None to
+      not share them)
     """
     
     def __init__(self):
@@ -35,5 +47,109 @@ class PresentationContext(object):
         self.presenter_source = DefaultPresenterSource()
         self.presenter_class = None # overrides
         self.threads = 8
+        self.processes = 0
         self.timeout = 10 # in seconds
         self.print_exceptions = False
+        self.import_graph = ImportGraph()
+        self.fingerprint = None
+        self.fingerprint_only = False
+        self.registry = PRESENTATION_REGISTRY
+
+class ImportGraph(object):
+    """
+    The deduplicated graph of documents read by the :class:`aria.consumption.Read` consumer.
+    
+    Properties:
+    
+    * :code:`root`: Canonical location of the root document
+    * :code:`nodes`: Set of canonical locations
+    * :code:`edges`: Set of (importing, imported) canonical location tuples
+    * :code:`imports`: Dict of canonical locations to lists of imported canonical locations, in
+      order of import
+    * :code:`hashes`: Dict of canonical locations to content hashes
+    * :code:`duplicates`: Number of imports that were not submitted, because their canonical
+      location was already claimed
+    * :code:`resolution_time`: Total time in seconds spent resolving import locations
+    """
+    
+    def __init__(self):
+        self.root = None
+        self.nodes = set()
+        self.edges = set()
+        self.imports = {}
+        self.hashes = {}
+        self.duplicates = 0
+        self.resolution_time = 0.0
+        self._lock = Lock()
+
+    def add_node(self, node, content_hash=None, root=False):
+        with self._lock:
+            self.nodes.add(node)
+            if content_hash is not None:
+                self.hashes[node] = content_hash
+            if root:
+                self.root = node
+
+    def add_import(self, origin, node, duplicate, resolution_time):
+        with self._lock:
+            self.nodes.add(node)
+            self.edges.add((origin, node))
+            self.imports.setdefault(origin, []).append(node)
+            if duplicate:
+                self.duplicates += 1
+            self.resolution_time += resolution_time
+
+    def get_fingerprint(self, node=None):
+        """
+        Returns the Merkle fingerprint (SHA-1 hex digest) of a document (defaults to the root),
+        combining its content hash with the fingerprints of its imports, in order of import.
+        
+        The fingerprint changes if the content of the document, or of any document it
+        transitively imports, changes. It does not depend on where the documents are located.
+        Circular imports contribute only their content hash.
+        """
+        
+        with self._lock:
+            imports = dict(self.imports)
+            hashes = dict(self.hashes)
+        fingerprints = {}
+        
+        def get_content_hash(node):
+            content_hash = hashes.get(node)
+            if content_hash is None:
+                # Not read (probably failed)
+                content_hash = sha1(node.encode('utf-8') if isinstance(node, unicode) else node).hexdigest()
+            return content_hash
+        
+        def get_fingerprint(node, ancestors):
+            fingerprint = fingerprints.get(node)
+            if fingerprint is None:
+                ancestors = ancestors | set([node])
+                fingerprint = sha1(get_content_hash(node))
+                for imported in imports.get(node, ()):
+                    if imported in ancestors:
+                        fingerprint.update(get_content_hash(imported))
+                    else:
+                        fingerprint.update(get_fingerprint(imported, ancestors))
+                fingerprint = fingerprints[node] = fingerprint.hexdigest()
+            return fingerprint
+        
+        if node is None:
+            node = self.root
+        return get_fingerprint(node, frozenset()) if node is not None else None
+
+    def dump(self, context):
+        with self._lock:
+            nodes = sorted(self.nodes)
+            edges = sorted(self.edges)
+            duplicates = self.duplicates
+            resolution_time = self.resolution_time
+        puts(context.style.section('Imports:'))
+        with context.style.indent:
+            for node in nodes:
+                puts(context.style.node(node))
+                with context.style.indent:
+                    for origin, imported in edges:
+                        if origin == node:
+                            puts('-> %s' % context.style.node(imported))
+            puts(context.style.meta('%d documents, %d imports, %d duplicates, resolved in %f seconds' % (len(nodes), len(edges), duplicates, resolution_time)))
@@ -16,7 +16,8 @@
 
 from ..exceptions import InvalidValueError, AriaError
 from ..validation import Issue
-from ..utils import ReadOnlyList, ReadOnlyDict, print_exception, deepcopy_with_locators, merge, cachedmethod, puts
+from ..utils import ReadOnlyList, ReadOnlyDict, print_exception, copy_with_locators, merge, cachedmethod, puts
+from .registry import get_shared_presentation
 from functools import wraps
 from types import MethodType
 from collections import OrderedDict
@@ -40,12 +41,43 @@ class Field(object):
         return self._get(presentation)
     
     def _get(self, presentation):
+        """
+        The default getter.
+        
+        Once the field is in a class decorated with :func:`has_fields`, this is replaced by a
+        getter specialized for the field (see :code:`specialize`).
+        """
+        
+        return self._get_generic(presentation)
+    
+    def specialize(self):
+        """
+        Replaces the default getter (:code:`_get`) with one that is specialized for this field's
+        variant, with the field's :code:`cls`, :code:`default`, :code:`allowed` and
+        :code:`required` and whether it is the short form field all resolved up front.
+        
+        This is called by :func:`has_fields` and :func:`short_form_field`, and must be called
+        again if any of these are changed later.
+        """
+        
+        getter_factory = _GETTER_FACTORIES.get(self.field_variant)
+        if getter_factory is not None:
+            self._get = getter_factory(self, self.cls, _value_getter(self))
+        else:
+            # Will raise an AttributeError
+            self._get = self._get_generic
+    
+    def _get_generic(self, presentation):
+        """
+        Not specialized (slower) version of :code:`_get`.
+        """
+        
         default_raw = presentation._get_default_raw() if hasattr(presentation, '_get_default_raw') else None
 
         if default_raw is None:
             raw = presentation._raw
         else:
-            raw = deepcopy_with_locators(default_raw)
+            raw = copy_with_locators(default_raw)
             merge(raw, presentation._raw)
 
         if self.field_variant == 'primitive_dict_unknown_fields':
@@ -59,13 +91,13 @@ class Field(object):
                                 try:
                                     r[k] = self.cls(v)
                                 except ValueError:
-                                    raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (self.fullname, self.fullclass, k, repr(v)), locator=self.get_locator(raw))
+                                    raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (self.fullname, self.fullclass, k, repr(v)), locator=self.get_locator(raw, presentation))
                 return ReadOnlyDict(r)
             return None
         
         elif self.field_variant == 'object_dict_unknown_fields':
             if isinstance(raw, dict):
-                return ReadOnlyDict(((k, self.cls(name=k, raw=v, container=presentation)) for k, v in raw.iteritems() if k not in presentation.FIELDS))
+                return ReadOnlyDict(((k, _present(self.cls, k, v, presentation, (k,))) for k, v in raw.iteritems() if k not in presentation.FIELDS))
             return None
 
         is_short_form_field = (self.container_cls.SHORT_FORM_FIELD == self.name) if hasattr(self.container_cls, 'SHORT_FORM_FIELD') else False
@@ -79,25 +111,25 @@ class Field(object):
 
         if value is None:
             if self.required:
-                raise InvalidValueError('required %s does not have a value' % self.fullname, locator=self.get_locator(raw))
+                raise InvalidValueError('required %s does not have a value' % self.fullname, locator=self.get_locator(raw, presentation))
             else:
                 return None
         
         if self.allowed is not None:
             if value not in self.allowed:
-                raise InvalidValueError('%s is not %s' % (self.fullname, ' or '.join([repr(v) for v in self.allowed])), locator=self.get_locator(raw))
+                raise InvalidValueError('%s is not %s' % (self.fullname, ' or '.join([repr(v) for v in self.allowed])), locator=self.get_locator(raw, presentation))
 
         if self.field_variant == 'primitive':
             if (self.cls is not None) and not isinstance(value, self.cls):
                 try:
                     return self.cls(value)
                 except ValueError:
-                    raise InvalidValueError('%s is not a valid "%s": %s' % (self.fullname, self.fullclass, repr(value)), locator=self.get_locator(raw))
+                    raise InvalidValueError('%s is not a valid "%s": %s' % (self.fullname, self.fullclass, repr(value)), locator=self.get_locator(raw, presentation))
             return value
 
         elif self.field_variant == 'primitive_list':
             if not isinstance(value, list):
-                raise InvalidValueError('%s is not a list: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
+                raise InvalidValueError('%s is not a list: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw, presentation))
             r = value
             if self.cls is not None:
                 r = []
@@ -109,12 +141,12 @@ class Field(object):
                         try:
                             r.append(self.cls(v))
                         except ValueError:
-                            raise InvalidValueError('%s is not a list of "%s": element %d is %s' % (self.fullname, self.fullclass, i, repr(v)), locator=self.get_locator(raw))
+                            raise InvalidValueError('%s is not a list of "%s": element %d is %s' % (self.fullname, self.fullclass, i, repr(v)), locator=self.get_locator(raw, presentation))
             return ReadOnlyList(r)
 
         elif self.field_variant == 'primitive_dict':
             if not isinstance(value, dict):
-                raise InvalidValueError('%s is not a dict: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
+                raise InvalidValueError('%s is not a dict: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw, presentation))
             r = value
             if self.cls is not None:
                 r = OrderedDict()
@@ -125,40 +157,43 @@ class Field(object):
                         try:
                             r[k] = self.cls(v)
                         except ValueError:
-                            raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (self.fullname, self.fullclass, k, repr(v)), locator=self.get_locator(raw))
+                            raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (self.fullname, self.fullclass, k, repr(v)), locator=self.get_locator(raw, presentation))
             return ReadOnlyDict(r)
 
         elif self.field_variant == 'object':
             try:
-                return self.cls(raw=value, container=presentation)
+                return _present(self.cls, None, value, presentation, (self.name,) if value is not raw else ())
             except TypeError as e:
-                raise InvalidValueError('%s cannot not be initialized to an instance of "%s": %s' % (self.fullname, self.fullclass, repr(value)), cause=e, locator=self.get_locator(raw))
+                raise InvalidValueError('%s cannot not be initialized to an instance of "%s": %s' % (self.fullname, self.fullclass, repr(value)), cause=e, locator=self.get_locator(raw, presentation))
 
         elif self.field_variant == 'object_list':
             if not isinstance(value, list):
-                raise InvalidValueError('%s is not a list: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-            return ReadOnlyList((self.cls(raw=v, container=presentation) for v in value))
+                raise InvalidValueError('%s is not a list: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw, presentation))
+            path = (self.name,) if value is not raw else ()
+            return ReadOnlyList((_present(self.cls, None, v, presentation, path + (i,)) for i, v in enumerate(value)))
 
         elif self.field_variant == 'object_dict':
             if not isinstance(value, dict):
-                raise InvalidValueError('%s is not a dict: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
-            return ReadOnlyDict(((k, self.cls(name=k, raw=v, container=presentation)) for k, v in value.iteritems()))
+                raise InvalidValueError('%s is not a dict: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw, presentation))
+            path = (self.name,) if value is not raw else ()
+            return ReadOnlyDict(((k, _present_shared(self.cls, k, v, presentation, path + (k,))) for k, v in value.iteritems()))
 
         elif self.field_variant == 'sequenced_object_list':
             if not isinstance(value, list):
-                raise InvalidValueError('%s is not a sequenced list (a list of dicts, each with exactly one key): %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
+                raise InvalidValueError('%s is not a sequenced list (a list of dicts, each with exactly one key): %s' % (self.fullname, repr(value)), locator=self.get_locator(raw, presentation))
+            path = (self.name,) if value is not raw else ()
             sequence = []
-            for v in value:
+            for i, v in enumerate(value):
                 if not isinstance(v, dict):
-                    raise InvalidValueError('%s list elements are not all dicts with exactly one key: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
+                    raise InvalidValueError('%s list elements are not all dicts with exactly one key: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw, presentation))
                 if len(v) != 1:
-                    raise InvalidValueError('%s list elements do not all have exactly one key: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw))
+                    raise InvalidValueError('%s list elements do not all have exactly one key: %s' % (self.fullname, repr(value)), locator=self.get_locator(raw, presentation))
                 k, vv = v.items()[0]
-                sequence.append((k, self.cls(name=k, raw=vv, container=presentation)))
+                sequence.append((k, _present(self.cls, k, vv, presentation, path + (i, k))))
             return ReadOnlyList(sequence)
 
         else:
-            locator = self.get_locator(raw)
+            locator = self.get_locator(raw, presentation)
             location = (', at %s' % locator) if locator is not None else ''
             raise AttributeError('%s has unsupported field variant: "%s"%s' % (self.fullname, self.field_variant, location))
 
@@ -219,11 +254,12 @@ class Field(object):
     def fullclass(self):
         return '%s.%s' % (self.cls.__module__, self.cls.__name__)
 
-    def get_locator(self, raw):
-        if hasattr(raw, '_locator'):
-            if isinstance(raw._locator.children, dict):
-                return raw._locator.children.get(self.name, raw._locator)
-            return raw._locator
+    def get_locator(self, raw, presentation=None):
+        locator = getattr(raw, '_locator', None)
+        if locator is not None:
+            return locator.get_child(self.name)
+        elif presentation is not None:
+            return presentation._get_child_locator(self.name)
         return None
     
     def dump(self, presentation, context):
@@ -272,6 +308,218 @@ class Field(object):
                     if hasattr(v, '_dump'):
                         v._dump(context)
     
+# Specialized getters (see Field.specialize)
+
+_HAS_DEFAULT_RAW = {}
+
+def _get_raw(presentation):
+    presentation_cls = presentation.__class__
+    has_default_raw = _HAS_DEFAULT_RAW.get(presentation_cls)
+    if has_default_raw is None:
+        has_default_raw = _HAS_DEFAULT_RAW[presentation_cls] = hasattr(presentation_cls, '_get_default_raw')
+    if has_default_raw:
+        default_raw = presentation._get_default_raw()
+        if default_raw is not None:
+            raw = copy_with_locators(default_raw)
+            merge(raw, presentation._raw)
+            return raw
+    return presentation._raw
+
+def _value_getter(field):
+    # Returns a function that returns (raw, value), where value is None if there's no value
+    name = field.name
+    default = field.default
+    allowed = field.allowed
+    required = field.required
+    is_short_form_field = getattr(field.container_cls, 'SHORT_FORM_FIELD', None) == name
+    
+    def get_value(presentation):
+        raw = _get_raw(presentation)
+        if isinstance(raw, dict):
+            value = raw.get(name, default)
+        elif is_short_form_field:
+            value = raw
+        else:
+            value = None
+        
+        if value is None:
+            if required:
+                raise InvalidValueError('required %s does not have a value' % field.fullname, locator=field.get_locator(raw, presentation))
+            return raw, None
+        
+        if (allowed is not None) and (value not in allowed):
+            raise InvalidValueError('%s is not %s' % (field.fullname, ' or '.join([repr(v) for v in allowed])), locator=field.get_locator(raw, presentation))
+        
+        return raw, value
+    
+    return get_value
+
+def _primitive_getter(field, cls, get_value):
+    if cls is None:
+        def get(presentation):
+            return get_value(presentation)[1]
+    else:
+        def get(presentation):
+            raw, value = get_value(presentation)
+            if (value is None) or isinstance(value, cls):
+                return value
+            try:
+                return cls(value)
+            except ValueError:
+                raise InvalidValueError('%s is not a valid "%s": %s' % (field.fullname, field.fullclass, repr(value)), locator=field.get_locator(raw, presentation))
+    return get
+
+def _primitive_list_getter(field, cls, get_value):
+    def get(presentation):
+        raw, value = get_value(presentation)
+        if value is None:
+            return None
+        if not isinstance(value, list):
+            raise InvalidValueError('%s is not a list: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw, presentation))
+        if cls is None:
+            return ReadOnlyList(value)
+        r = []
+        for i, v in enumerate(value):
+            if isinstance(v, cls):
+                r.append(v)
+            else:
+                try:
+                    r.append(cls(v))
+                except ValueError:
+                    raise InvalidValueError('%s is not a list of "%s": element %d is %s' % (field.fullname, field.fullclass, i, repr(v)), locator=field.get_locator(raw, presentation))
+        return ReadOnlyList(r)
+    return get
+
+def _primitive_dict_getter(field, cls, get_value):
+    def get(presentation):
+        raw, value = get_value(presentation)
+        if value is None:
+            return None
+        if not isinstance(value, dict):
+            raise InvalidValueError('%s is not a dict: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw, presentation))
+        if cls is None:
+            return ReadOnlyDict(value)
+        r = OrderedDict()
+        for k, v in value.iteritems():
+            if isinstance(v, cls):
+                r[k] = v
+            else:
+                try:
+                    r[k] = cls(v)
+                except ValueError:
+                    raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (field.fullname, field.fullclass, k, repr(v)), locator=field.get_locator(raw, presentation))
+        return ReadOnlyDict(r)
+    return get
+
+def _primitive_dict_unknown_fields_getter(field, cls, get_value):
+    def get(presentation):
+        raw = _get_raw(presentation)
+        if not isinstance(raw, dict):
+            return None
+        if cls is None:
+            return ReadOnlyDict(raw)
+        fields = presentation.FIELDS
+        r = OrderedDict()
+        for k, v in raw.iteritems():
+            if k not in fields:
+                if not isinstance(v, cls):
+                    try:
+                        r[k] = cls(v)
+                    except ValueError:
+                        raise InvalidValueError('%s is not a dict of "%s" values: entry "%d" is %s' % (field.fullname, field.fullclass, k, repr(v)), locator=field.get_locator(raw, presentation))
+        return ReadOnlyDict(r)
+    return get
+
+def _object_getter(field, cls, get_value):
+    path = (field.name,)
+    def get(presentation):
+        raw, value = get_value(presentation)
+        if value is None:
+            return None
+        try:
+            return _present(cls, None, value, presentation, path if value is not raw else ())
+        except TypeError as e:
+            raise InvalidValueError('%s cannot not be initialized to an instance of "%s": %s' % (field.fullname, field.fullclass, repr(value)), cause=e, locator=field.get_locator(raw, presentation))
+    return get
+
+def _object_list_getter(field, cls, get_value):
+    name = field.name
+    def get(presentation):
+        raw, value = get_value(presentation)
+        if value is None:
+            return None
+        if not isinstance(value, list):
+            raise InvalidValueError('%s is not a list: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw, presentation))
+        path = (name,) if value is not raw else ()
+        return ReadOnlyList([_present(cls, None, v, presentation, path + (i,)) for i, v in enumerate(value)])
+    return get
+
+def _object_dict_getter(field, cls, get_value):
+    name = field.name
+    def get(presentation):
+        raw, value = get_value(presentation)
+        if value is None:
+            return None
+        if not isinstance(value, dict):
+            raise InvalidValueError('%s is not a dict: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw, presentation))
+        path = (name,) if value is not raw else ()
+        return ReadOnlyDict([(k, _present_shared(cls, k, v, presentation, path + (k,))) for k, v in value.iteritems()])
+    return get
+
+def _present(cls, name, raw, container, path):
+    # The path (keys and indexes) of the raw data in the container's raw data is used to find its
+    # locator (see PresentationBase._get_raw_locator)
+    presentation = cls(name=name, raw=raw, container=container)
+    presentation._raw_path = path
+    return presentation
+
+def _present_shared(cls, name, raw, container, path):
+    # Uses the registered presentation if the raw data came from a shared presenter
+    presentation = get_shared_presentation(cls, raw)
+    if presentation is None:
+        presentation = _present(cls, name, raw, container, path)
+    return presentation
+
+def _sequenced_object_list_getter(field, cls, get_value):
+    name = field.name
+    def get(presentation):
+        raw, value = get_value(presentation)
+        if value is None:
+            return None
+        if not isinstance(value, list):
+            raise InvalidValueError('%s is not a sequenced list (a list of dicts, each with exactly one key): %s' % (field.fullname, repr(value)), locator=field.get_locator(raw, presentation))
+        path = (name,) if value is not raw else ()
+        sequence = []
+        for i, v in enumerate(value):
+            if not isinstance(v, dict):
+                raise InvalidValueError('%s list elements are not all dicts with exactly one key: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw, presentation))
+            if len(v) != 1:
+                raise InvalidValueError('%s list elements do not all have exactly one key: %s' % (field.fullname, repr(value)), locator=field.get_locator(raw, presentation))
+            k, vv = v.items()[0]
+            sequence.append((k, _present(cls, k, vv, presentation, path + (i, k))))
+        return ReadOnlyList(sequence)
+    return get
+
+def _object_dict_unknown_fields_getter(field, cls, get_value):
+    def get(presentation):
+        raw = _get_raw(presentation)
+        if not isinstance(raw, dict):
+            return None
+        fields = presentation.FIELDS
+        return ReadOnlyDict([(k, _present(cls, k, v, presentation, (k,))) for k, v in raw.iteritems() if k not in fields])
+    return get
+
+_GETTER_FACTORIES = {
+    'primitive': _primitive_getter,
+    'primitive_list': _primitive_list_getter,
+    'primitive_dict': _primitive_dict_getter,
+    'primitive_dict_unknown_fields': _primitive_dict_unknown_fields_getter,
+    'object': _object_getter,
+    'object_list': _object_list_getter,
+    'object_dict': _object_dict_getter,
+    'sequenced_object_list': _sequenced_object_list_getter,
+    'object_dict_unknown_fields': _object_dict_unknown_fields_getter}
+
 def has_fields_iter_field_names(self):
     for name in self.__class__.FIELDS:
         yield name
@@ -320,7 +568,8 @@ def has_fields(cls):
        they have them.
     
     2. Generates automatic :code:`@property` implementations for the fields
-       with the help of a set of special function decorators.
+       with the help of a set of special function decorators. Each field gets
+       a getter that is specialized for it (see :code:`Field.specialize`).
 
     The class also works with the Python dict protocol, so that
     fields can be accessed via dict semantics. The functionality is
@@ -352,6 +601,7 @@ def has_fields(cls):
             
             field.name = name
             field.container_cls = cls
+            field.specialize()
             
             # This function is here just to create an enclosed scope for "field"
             def closure(field):
@@ -359,10 +609,17 @@ def has_fields(cls):
                 # By convention, we have the getter wrap the original function.
                 # (It is, for example, where the Python help() function will look for
                 # docstrings when encountering a property.)
-                @cachedmethod
-                @wraps(field.fn)
-                def getter(self):
-                    return field.get(self)
+                if 'get' in field.__dict__:
+                    # Overridden with @field_getter
+                    @cachedmethod
+                    @wraps(field.fn)
+                    def getter(self):
+                        return field.get(self)
+                else:
+                    @cachedmethod
+                    @wraps(field.fn)
+                    def getter(self):
+                        return field._get(self)
                     
                 def setter(self, value):
                     field.set(self, value)
@@ -395,6 +652,10 @@ def short_form_field(name):
     def decorator(cls):
         if hasattr(cls, name) and hasattr(cls, 'FIELDS') and (name in cls.FIELDS):
             setattr(cls, 'SHORT_FORM_FIELD', name)
+            # The specialized getters of our fields depend on this
+            for field in cls.FIELDS.itervalues():
+                if field.container_cls is cls:
+                    field.specialize()
             return cls
         else:
             raise AttributeError('@short_form_field must be used with a Field name in @has_fields class')
@@ -14,13 +14,13 @@
 # under the License.
 #
 
-from ..utils import HasCachedMethods, classname, deepcopy_with_locators, puts
+from ..utils import HasCachedMethods, classname, copy_with_locators, puts
 from .utils import validate_no_short_form, validate_no_unknown_fields, validate_known_fields
 
 class Value(object):
     def __init__(self, the_type, value):
-        self.type = deepcopy_with_locators(the_type)
-        self.value = deepcopy_with_locators(value)
+        self.type = copy_with_locators(the_type)
+        self.value = copy_with_locators(value)
 
 class PresentationBase(HasCachedMethods):
     """
@@ -63,8 +63,9 @@ class PresentationBase(HasCachedMethods):
         :rtype: :class:`aria.reading.Locator`
         """
         
-        if hasattr(self._raw, '_locator'):
-            return self._raw._locator
+        locator = self._get_raw_locator()
+        if locator is not None:
+            return locator
         elif self._container is not None:
             return self._container._locator
         return None
@@ -77,10 +78,9 @@ class PresentationBase(HasCachedMethods):
         :rtype: :class:`aria.reading.Locator`
         """
         
-        if hasattr(self._raw, '_locator'):
-            locator = self._raw._locator
-            if locator is not None:
-                return locator.get_child(name)
+        locator = self._get_raw_locator()
+        if locator is not None:
+            return locator.get_child(name)
         return self._locator
 
     def _get_grandchild_locator(self, name1, name2):
@@ -91,12 +91,63 @@ class PresentationBase(HasCachedMethods):
         :rtype: :class:`aria.reading.Locator`
         """
 
-        if hasattr(self._raw, '_locator'):
-            locator = self._raw._locator
-            if locator is not None:
-                return locator.get_grandchild(name1, name2)
+        locator = self._get_raw_locator()
+        if locator is not None:
+            return locator.get_grandchild(name1, name2)
         return self._locator
 
+    def _get_value_locator(self, value):
+        """
+        Attempts to return the locator of a value in our raw data (which can be our raw data
+        itself). Will default to our locator if not found.
+
+        Values that are not dicts or lists cannot be linked to their locators, and can be the same
+        object in several entries, so prefer :code:`_get_child_locator` when the name is known.
+
+        :rtype: :class:`aria.reading.Locator`
+        """
+
+        locator = getattr(value, '_locator', None)
+        if locator is None:
+            raw_locator = self._get_raw_locator()
+            if raw_locator is not None:
+                if value is self._raw:
+                    locator = raw_locator
+                else:
+                    locator = raw_locator.find(self._raw, value)
+        if locator is not None:
+            return locator
+        return self._locator
+
+    def _get_raw_locator(self):
+        """
+        Returns the locator of our raw data, or None if it cannot be found.
+        
+        Nested raw data is not linked to its locator in advance, so if needed we look for it in
+        our container's locator: by the path of our raw data in our container's raw data, if we
+        know it (the field getters set :code:`_raw_path`), or otherwise by identity (see
+        :meth:`aria.reading.Locator.find`). Clones look for it in their original's raw data.
+        
+        :rtype: :class:`aria.reading.Locator`
+        """
+        
+        locator = getattr(self._raw, '_locator', None)
+        if locator is None:
+            origin = getattr(self, '_locator_origin', None)
+            if origin is not None:
+                locator = origin._get_raw_locator()
+            elif self._container is not None:
+                container_locator = self._container._get_raw_locator()
+                if container_locator is not None:
+                    path = getattr(self, '_raw_path', None)
+                    if path is not None:
+                        locator = container_locator.find_path(path)
+                        if locator is not None:
+                            locator.link(self._raw)
+                    if locator is None:
+                        locator = container_locator.find(self._container._raw, self._raw)
+        return locator
+
     def _dump(self, context):
         """
         Emits a colorized representation.
@@ -146,10 +197,14 @@ class PresentationBase(HasCachedMethods):
         Creates a clone of this presentation, optionally allowing for a new container.
         """
         
-        raw = deepcopy_with_locators(self._raw)
+        raw = copy_with_locators(self._raw)
         if container is None:
             container = self._container
-        return self.__class__(name=self._name, raw=raw, container=container)
+        clone = self.__class__(name=self._name, raw=raw, container=container)
+        if not hasattr(raw, '_locator'):
+            # Our locator will be found when needed
+            clone._locator_origin = self
+        return clone
 
 class Presentation(PresentationBase):
     """
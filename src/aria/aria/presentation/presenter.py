@@ -35,6 +35,9 @@ class Presenter(Presentation):
 
     def _get_import_locations(self):
         return None
+
+    def _get_uri_mirrors(self):
+        return None
     
     def _get_deployment_template(self, context):
         return None
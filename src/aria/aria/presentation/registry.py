@@ -0,0 +1,236 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from ..utils import classname
+from threading import Lock
+from hashlib import sha1
+from copy import copy
+import os
+
+# Type sections of presenters (see :class:`aria.presentation.Presenter`)
+TYPE_SECTIONS = (
+    'data_types',
+    'node_types',
+    'relationship_types',
+    'group_types',
+    'capability_types',
+    'interface_types',
+    'artifact_types',
+    'policy_types')
+
+# Shared presentations by the ID of their raw data (which is kept alive by the registry)
+_shared_presentations = {}
+
+class PresentationRegistry(object):
+    """
+    Process-wide, read-only registry of presenters for profiles (such as the normative TOSCA
+    types), with their type presentations resolved, so that parses can share them instead of
+    re-presenting and re-resolving identical types every time.
+    
+    Documents are profiles if they are in one of the :code:`profile_paths` directories. All the
+    profile documents in a parse (the profiles imported by non-profile documents, and everything
+    they import) are merged into a single presenter, which is keyed by the presenter class and the
+    Merkle fingerprints of the profiles, so a profile that changes on disk gets a new entry.
+    
+    The first time a combination is seen the presenter is validated in a context of its own. If
+    there are no validation issues it is registered, and its type presentations are given that
+    context as their :code:`_method_context`: their cached methods with only a :code:`context`
+    argument (:code:`_get_parent`, :code:`_get_properties`, etc.) always use it, and so never
+    depend on the context of the parse that calls them. Cached values are only ever added, and the
+    raw data is never modified after it is registered, so shared presentations can be used by many
+    threads at once.
+    
+    The :class:`aria.consumption.Read` consumer merges the registered presenter into the parsed
+    presenter (see :meth:`merge`). The field getters then use the shared type presentations for
+    the raw data that came from it (see :func:`get_shared_presentation`).
+    """
+    
+    def __init__(self):
+        self.profile_paths = []
+        self._presenters = {}
+        self._lock = Lock()
+    
+    def is_profile(self, node):
+        """
+        True if the document at the canonical location is in one of the :code:`profile_paths`.
+        """
+        
+        for path in self.profile_paths:
+            path = os.path.join(os.path.abspath(path), '')
+            if node.startswith(path):
+                return True
+        return False
+    
+    def get_profiles(self, import_graph):
+        """
+        The profile documents of a read: those imported by non-profile documents, and all the
+        documents they import (which must also be profiles).
+        
+        Returns the roots (the profile documents imported by non-profile documents) and all the
+        documents, or None if there are no profiles, or if profiles import non-profile documents.
+        
+        :rtype: (list of str, set of str)
+        """
+        
+        roots = set()
+        for origin, node in import_graph.edges:
+            if self.is_profile(node) and not self.is_profile(origin):
+                roots.add(node)
+        if not roots:
+            return None
+        
+        nodes = set()
+        pending = list(roots)
+        while pending:
+            node = pending.pop()
+            if node in nodes:
+                continue
+            if not self.is_profile(node):
+                return None
+            nodes.add(node)
+            pending.extend(import_graph.imports.get(node, ()))
+        return sorted(roots), nodes
+    
+    def get(self, presenter_class, fingerprint):
+        """
+        The registered presenter, or None.
+        """
+        
+        presenter = self._presenters.get((classname(presenter_class), fingerprint))
+        return presenter if presenter is not False else None
+    
+    def share(self, context, presenter_class, import_graph, presentations):
+        """
+        Returns the registered presenter for the profiles of a read and their documents, building
+        and registering the presenter if needed. Returns None if the read has no profiles, or if
+        they can't be shared (if they were not all read, or have validation issues).
+        
+        :param context: A new :class:`aria.consumption.ConsumptionContext`, used for validating
+                        and resolving the presenter if it is built
+        :param presentations: Dict of canonical locations to the presentations read from them
+        :rtype: (:class:`aria.presentation.Presenter`, set of str)
+        """
+        
+        profiles = self.get_profiles(import_graph)
+        if profiles is None:
+            return None
+        roots, nodes = profiles
+        fingerprint = sha1()
+        for root in roots:
+            fingerprint.update(import_graph.get_fingerprint(root))
+        fingerprint = fingerprint.hexdigest()
+        
+        key = (classname(presenter_class), fingerprint)
+        presenter = self._presenters.get(key)
+        if presenter is False:
+            # Known to have validation issues
+            return None
+        elif presenter is None:
+            if not all(node in presentations for node in nodes):
+                return None
+            presenter = self._build(context, [presentations[node] for node in sorted(nodes)])
+            if presenter is None:
+                self._presenters[key] = False
+                return None
+            with self._lock:
+                registered = self._presenters.setdefault(key, presenter)
+                if registered is presenter:
+                    for section in TYPE_SECTIONS:
+                        types = getattr(presenter, section, None)
+                        if types:
+                            for the_type in types.itervalues():
+                                _shared_presentations[id(the_type._raw)] = the_type
+            presenter = registered
+        return presenter, nodes
+    
+    def merge(self, presenter, shared_presenter):
+        """
+        Merges the raw data of a registered presenter into a presenter, without modifying the
+        registered raw data.
+        
+        Only the top-level sections are copied: what is in them (such as the raw data of the types)
+        is merged by reference, so that the shared presentations can be found for it. Must be done
+        after all other merges into the presenter.
+        """
+        
+        _merge_shared(presenter._raw, shared_presenter._raw, True)
+        if hasattr(presenter._raw, '_locator') and hasattr(shared_presenter._raw, '_locator'):
+            presenter._raw._locator.merge(shared_presenter._raw._locator)
+    
+    def clear(self):
+        with self._lock:
+            for presenter in self._presenters.itervalues():
+                if presenter is False:
+                    continue
+                for section in TYPE_SECTIONS:
+                    types = getattr(presenter, section, None)
+                    if types:
+                        for the_type in types.itervalues():
+                            _shared_presentations.pop(id(the_type._raw), None)
+            self._presenters.clear()
+    
+    def _build(self, context, presentations):
+        presenter = presentations[0]
+        for presentation in presentations[1:]:
+            presenter._merge_import(presentation)
+        context.presentation.presenter = presenter
+        presenter._validate(context)
+        if context.validation.has_issues:
+            return None
+        for section in TYPE_SECTIONS:
+            types = getattr(presenter, section, None)
+            if types:
+                for the_type in types.itervalues():
+                    the_type._method_context = context
+        return presenter
+
+def get_shared_presentation(cls, raw):
+    """
+    The registered presentation of the class for the raw data, or None.
+    """
+    
+    presentation = _shared_presentations.get(id(raw))
+    if (presentation is not None) and (presentation._raw is raw) and isinstance(presentation, cls):
+        return presentation
+    return None
+
+def _merge_shared(a, b, top):
+    # Like aria.utils.merge, but never modifies the dicts of b, nor the dicts of a below the top
+    # (which may have come from b): those are copied when they need to be modified
+    for key, value_b in b.iteritems():
+        if key in a:
+            value_a = a[key]
+            if value_a is value_b:
+                continue
+            if isinstance(value_a, dict) and isinstance(value_b, dict):
+                a[key] = value_a = _copy_dict(value_a)
+                _merge_shared(value_a, value_b, False)
+            elif value_a != value_b:
+                a[key] = value_b
+        else:
+            a[key] = _copy_dict(value_b) if top and isinstance(value_b, dict) else value_b
+
+def _copy_dict(value):
+    r = copy(value)
+    locator = getattr(value, '_locator', None)
+    if locator is not None:
+        try:
+            setattr(r, '_locator', locator)
+        except AttributeError:
+            pass
+    return r
+
+PRESENTATION_REGISTRY = PresentationRegistry()
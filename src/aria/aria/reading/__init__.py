@@ -14,27 +14,49 @@
 # under the License.
 #
 
-from .exceptions import ReaderError, ReaderNotFoundError, ReaderSyntaxError, AlreadyReadError
+from .exceptions import ReaderError, ReaderNotFoundError, ReaderSyntaxError, AlreadyReadError, ContentMismatchError
 from .reader import Reader
-from .source import ReaderSource, DefaultReaderSource
+from .source import ReaderSource, DefaultReaderSource, FastReaderSource
 from .context import ReadingContext
+from .cache import ReadCache, get_content_hash
+from .process import ReaderProcessPool
+from .interning import InternTable, INTERN_TABLE
+from .lockfile import Lockfile
+from .snapshot import SNAPSHOTS, Snapshot, SnapshotLoader
 from .raw import RawReader
-from .locator import Locator
-from .yaml import YamlReader
-from .json import JsonReader
-from .jinja import JinjaReader
+from .locator import LocatorTable, Locator
+from .yaml import YamlReader, FastYamlReader, FastYamlLoader
+from .json import JsonReader, JsonLocatorTable
+from .jinja import JinjaTemplates, JINJA_TEMPLATES, JinjaReader
 
 __all__ = (
     'ReaderError',
     'ReaderNotFoundError',
     'ReaderSyntaxError',
     'AlreadyReadError',
+    'ContentMismatchError',
     'Reader',
     'ReaderSource',
     'DefaultReaderSource',
+    'FastReaderSource',
     'ReadingContext',
+    'ReadCache',
+    'get_content_hash',
+    'ReaderProcessPool',
+    'InternTable',
+    'INTERN_TABLE',
+    'Lockfile',
+    'SNAPSHOTS',
+    'Snapshot',
+    'SnapshotLoader',
     'RawReader',
+    'LocatorTable',
     'Locator',
     'YamlReader',
+    'FastYamlReader',
+    'FastYamlLoader',
     'JsonReader',
+    'JsonLocatorTable',
+    'JinjaTemplates',
+    'JINJA_TEMPLATES',
     'JinjaReader')
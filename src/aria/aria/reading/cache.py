@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .. import VERSION
+from ..utils import LRUFileCache, classname
+from hashlib import sha1
+from cStringIO import StringIO
+import cPickle
+
+LOCATION_PERSISTENT_ID = 'location'
+
+def get_content_hash(data):
+    """
+    The content hash (SHA-1 hex digest) of a document's bytes (text is hashed as UTF-8).
+    """
+    
+    return sha1(data.encode('utf-8') if isinstance(data, unicode) else data).hexdigest()
+
+class ReadCache(object):
+    """
+    Persistent, content-addressed cache for agnostic raw data.
+
+    Entries are keyed by the content hash of the document and the reader class, and store the
+    constructed agnostic raw data together with its locators. Entries are stored in a
+    :class:`aria.utils.LRUFileCache`, so the cache can be shared between processes and runs,
+    and is bounded in size.
+
+    The location is not stored in the entry: the locators are re-attached to the location of the
+    document that is being read, so that identical documents in different locations can share an
+    entry.
+    """
+
+    def __init__(self, path, max_size=100 * 1024 * 1024):
+        """
+        :param path: Cache directory (will be created if it does not exist)
+        :param max_size: Maximum total size of entries in bytes
+        """
+
+        self.files = LRUFileCache(path, max_size=max_size, suffix='.raw')
+
+    def get_key(self, reader, data=None, content_hash=None):
+        """
+        The cache key for the text as read by the reader. If the content hash of the text is
+        already known (for example, from a lockfile) the text itself is not needed.
+        """
+
+        if content_hash is None:
+            content_hash = get_content_hash(data)
+        return sha1('%s\0%s\0%s' % (VERSION, classname(reader), content_hash)).hexdigest()
+
+    def get(self, key, location):
+        """
+        Returns the cached agnostic raw data for the key, or None if it's not in the cache.
+
+        The returned locators will refer to :code:`location`.
+        """
+
+        value = self.files.get(key)
+        if value is None:
+            return None
+        try:
+            unpickler = cPickle.Unpickler(StringIO(value))
+            unpickler.persistent_load = lambda persistent_id: location
+            raw, locator = unpickler.load()
+        except Exception:
+            # Corrupt entry
+            self.files.delete(key)
+            return None
+
+        if locator is not None:
+            setattr(raw, '_locator', locator)
+        return raw
+
+    def put(self, key, location, raw):
+        """
+        Stores the agnostic raw data (and its locators) for the key.
+
+        Failure to write to the cache is silently ignored.
+        """
+
+        def persistent_id(o):
+            return LOCATION_PERSISTENT_ID if o is location else None
+
+        value = StringIO()
+        pickler = cPickle.Pickler(value, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = persistent_id
+        try:
+            # The raw data's own attributes are not necessarily pickled, so we pickle the locator separately
+            pickler.dump((raw, getattr(raw, '_locator', None)))
+        except Exception:
+            # Raw data that can't be pickled
+            return
+        self.files.set(key, value.getvalue())
+
+    def clear(self):
+        self.files.clear()
+
+    def cache_info(self):
+        return self.files.cache_info()
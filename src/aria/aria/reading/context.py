@@ -15,18 +15,68 @@
 #
 
 from .source import DefaultReaderSource
-from ..utils import LockedList
+from .snapshot import Snapshot
+from ..utils import StrictList
+from threading import Lock
 
 class ReadingContext(object):
     """
     Properties:
     
     * :code:`reader_source`: For finding reader instances
-    * :code:`reader`: Overrides :code:`reader_source` with a specific class
+    * :code:`reader`: Overrides :code:`reader_source` with a specific reader, which is read once
+      as the root document (imports that resolve to it are duplicates)
+    * :code:`cache`: Optional :class:`ReadCache` for agnostic raw data (defaults to None)
+    * :code:`snapshots`: List of additional :class:`Snapshot` instances to read from before loading
+    * :code:`lockfile`: Optional :class:`Lockfile` for resolving imports (defaults to None)
+    * :code:`prescan_keys`: Top-level keys that readers should extract ahead of full construction
+      (see :class:`Reader`)
+    * :code:`process_pool`: Optional :class:`ReaderProcessPool` for constructing agnostic raw data
+      in worker processes (defaults to None)
+    * :code:`intern_strings`: Whether readers should intern strings in the process-wide
+      :code:`INTERN_TABLE` (defaults to True)
+    * :code:`jinja_context`: Variables for rendering Jinja templates (defaults to None, in which
+      case :code:`aria.reading.jinja.CONTEXT` is used)
     """
     
     def __init__(self):
         self.reader_source = DefaultReaderSource()
         self.reader = None
+        self.cache = None
+        self.lockfile = None
+        self.snapshots = StrictList(value_class=Snapshot)
+        self.prescan_keys = ('tosca_definitions_version', 'repositories', 'imports') # TOSCA and Cloudify
+        self.process_pool = None
+        self.intern_strings = True
+        self.jinja_context = None
         
-        self._locations = LockedList() # for keeping track of locations already read
+        self._locations = set() # canonical locations already read
+        self._locations_lock = Lock()
+    
+    def claim_location(self, location):
+        """
+        Atomically marks a canonical location as read. Returns False if it was already marked.
+        """
+        
+        with self._locations_lock:
+            if location in self._locations:
+                return False
+            self._locations.add(location)
+            return True
+    
+    def release_location(self, location):
+        """
+        Unmarks a canonical location, so that it can be claimed again.
+        """
+        
+        with self._locations_lock:
+            self._locations.discard(location)
+    
+    @property
+    def locations(self):
+        """
+        A copy of the canonical locations already read.
+        """
+        
+        with self._locations_lock:
+            return set(self._locations)
@@ -40,3 +40,8 @@ class AlreadyReadError(ReaderError):
     """
     ARIA reader error: already read.
     """
+
+class ContentMismatchError(ReaderError):
+    """
+    ARIA reader error: content does not match the expected content hash.
+    """
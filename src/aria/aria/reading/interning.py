@@ -0,0 +1,68 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from threading import Lock
+
+class InternTable(object):
+    """
+    Table of interned strings, so that equal strings read from different documents (type names,
+    field names, property names, etc.) are the same object. This saves memory, and dict lookups
+    and equality checks on interned strings only have to compare identities.
+    
+    Strings longer than :code:`max_length` are not interned. :code:`str` is interned with the
+    builtin :code:`intern`, so these strings are shared with the ones in our code (and are released
+    when no longer used). :code:`unicode` (used only for strings that are not pure ASCII) can't be
+    interned that way, so we keep our own table, which is cleared when it has more than
+    :code:`max_size` strings.
+    
+    The table is thread-safe. Usually you would use the process-wide :code:`INTERN_TABLE`.
+    """
+    
+    def __init__(self, max_length=100, max_size=100000):
+        """
+        :param max_length: Maximum length of strings to intern
+        :param max_size: Maximum number of :code:`unicode` strings to keep
+        """
+        
+        self.max_length = max_length
+        self.max_size = max_size
+        self._unicode = {}
+        self._lock = Lock()
+    
+    def intern(self, value):
+        """
+        Returns the interned string equal to the value, or the value itself if it is not a string
+        we intern (subclasses of :code:`str` and :code:`unicode` are not interned).
+        """
+        
+        t = type(value)
+        if (t is str) and (len(value) <= self.max_length):
+            return intern(value)
+        elif (t is unicode) and (len(value) <= self.max_length):
+            interned = self._unicode.get(value)
+            if interned is None:
+                with self._lock:
+                    if len(self._unicode) >= self.max_size:
+                        self._unicode = {}
+                    interned = self._unicode.setdefault(value, value)
+            return interned
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._unicode = {}
+
+INTERN_TABLE = InternTable()
@@ -15,10 +15,12 @@
 #
 
 from .. import VERSION
-from ..loading import LiteralLocation, LiteralLoader
+from ..loading import UriLocation, LiteralLocation, LiteralLoader
 from .reader import Reader
 from .exceptions import ReaderSyntaxError
-from jinja2 import Template
+from .cache import get_content_hash
+from jinja2 import Environment, FileSystemBytecodeCache, TemplateSyntaxError
+from jinja2.utils import LRUCache
 import os
 
 # TODO: we could put a lot of other useful stuff here.
@@ -26,28 +28,96 @@ CONTEXT = {
     'ARIA_VERSION': VERSION,
     'ENV': os.environ}
 
+class JinjaTemplates(object):
+    """
+    Cache of compiled Jinja templates, keyed by the content hash of their source.
+    
+    All templates are compiled in a single shared :code:`jinja2.Environment`, and the compiled
+    code is also stored in the environment's bytecode cache (by default a
+    :code:`jinja2.FileSystemBytecodeCache` in a private temporary directory), so that even a new
+    process does not have to recompile them. The least recently used templates are evicted from
+    memory when there are more than :code:`max_templates`.
+    
+    Templates do not hold render variables, so a cached template can be rendered with different
+    variables at the same time.
+    
+    The cache is thread-safe. Usually you would use the process-wide :code:`JINJA_TEMPLATES`.
+    """
+    
+    def __init__(self, bytecode_cache=None, max_templates=100):
+        """
+        :param bytecode_cache: A :code:`jinja2.BytecodeCache`, False for none, or None for the default
+        :param max_templates: Maximum number of compiled templates kept in memory
+        """
+        
+        if bytecode_cache is None:
+            bytecode_cache = FileSystemBytecodeCache()
+        self.environment = Environment(bytecode_cache=bytecode_cache or None, cache_size=0, auto_reload=False)
+        self._templates = LRUCache(max_templates)
+    
+    def get(self, source):
+        """
+        Returns the compiled template for the source.
+        """
+        
+        key = get_content_hash(source)
+        template = self._templates.get(key)
+        if template is None:
+            # Same as jinja2.BaseLoader.load, but without a loader
+            environment = self.environment
+            bytecode_cache = environment.bytecode_cache
+            code = None
+            if bytecode_cache is not None:
+                bucket = bytecode_cache.get_bucket(environment, key, None, source)
+                code = bucket.code
+            if code is None:
+                code = environment.compile(source, key)
+                if bytecode_cache is not None:
+                    bucket.code = code
+                    bytecode_cache.set_bucket(bucket)
+            template = environment.template_class.from_code(environment, code, environment.globals)
+            # Note: Another thread may have compiled it too, but they are equivalent
+            # (we avoid LRUCache.setdefault, which deadlocks in Jinja 2.8)
+            self._templates[key] = template
+        return template
+    
+    def clear(self):
+        self._templates.clear()
+        if self.environment.bytecode_cache is not None:
+            self.environment.bytecode_cache.clear()
+
+JINJA_TEMPLATES = JinjaTemplates()
+
 class JinjaReader(Reader):
     """
     ARIA Jinja reader.
     
-    Forwards the rendered result to a new reader in the reader source.
+    Renders the template with the context's :code:`jinja_context` (or :code:`CONTEXT` if it is
+    None), and forwards the rendered result to a new reader in the reader source. Templates are
+    compiled only once, via the process-wide :code:`JINJA_TEMPLATES`.
     """
 
     def read(self):
         data = self.load()
+        if not isinstance(data, basestring):
+            data = unicode(data)
+        variables = self.context.jinja_context
+        if variables is None:
+            variables = CONTEXT
         try:
-            data = str(data)
-            template = Template(data)
-            literal = template.render(CONTEXT)
-            # TODO: might be useful to write the literal result to a file for debugging
-            location = self.location
-            if isinstance(location, basestring) and location.endswith('.jinja'):
-                # Use reader based on the location with the ".jinja" prefix stripped off
-                location = '<literal> ' + location[:-6]
-                next_reader = self.context.reading.reader_source.get_reader(self.context, location, LiteralLoader(literal, location=location))
-            else:
-                # Use reader for literal loader
-                next_reader = self.context.reading.reader_source.get_reader(self.context, LiteralLocation(literal), LiteralLoader(literal))
-            return next_reader.read()
+            literal = JINJA_TEMPLATES.get(data).render(variables)
+        except TemplateSyntaxError as e:
+            raise ReaderSyntaxError('Jinja: %s' % e.message, location=self.loader.location, line=e.lineno, cause=e)
         except Exception as e:
-            raise ReaderSyntaxError('Jinja: %s' % e, cause=e)
+            raise ReaderSyntaxError('Jinja: %s' % e, location=self.loader.location, cause=e)
+
+        # TODO: might be useful to write the literal result to a file for debugging
+        location = self.location
+        if isinstance(location, UriLocation) and location.uri.endswith('.jinja'):
+            # Use reader based on the location with the ".jinja" suffix stripped off
+            location = UriLocation(location.uri[:-6])
+        else:
+            # Use reader for literal loader
+            location = LiteralLocation(literal)
+        next_reader = self.context.reader_source.get_reader(self.context, location, LiteralLoader(LiteralLocation(literal)))
+        return next_reader.read()
@@ -18,18 +18,218 @@ from __future__ import absolute_import # so we can import standard 'json'
 
 from .reader import Reader
 from .exceptions import ReaderSyntaxError
-from collections import OrderedDict
-import json
+from .locator import LocatorTable, Locator, MAPPING, SEQUENCE
+from .interning import INTERN_TABLE
+from ruamel.yaml.comments import CommentedMap, CommentedSeq # @UnresolvedImport
+from json.decoder import scanstring
+from threading import Lock
+from bisect import bisect
+from itertools import izip
+import json, re
+
+# A token of a valid JSON document, preceded by whitespace and separators (which we skip). A key is
+# matched together with its value if the value is a scalar, or together with the start of the
+# value if it is a mapping or a sequence, so most tokens are keys.
+TOKEN = re.compile(r"""[ \t\n\r,:]*(?:
+    "([^"\\]*(?:\\.[^"\\]*)*)"[ \t\n\r]*:[ \t\n\r]*(?:         # 1: key
+        (\{)|                                                  # 2: key and mapping start
+        (\[)|                                                  # 3: key and sequence start
+        "[^"\\]*(?:\\.[^"\\]*)*"|[^ \t\n\r,:\[\]{}"]+)|        # (key and scalar)
+    (\{)|                                                      # 4: mapping start
+    (\[)|                                                      # 5: sequence start
+    (\})|                                                      # 6: mapping end
+    (\])|                                                      # 7: sequence end
+    ("[^"\\]*(?:\\.[^"\\]*)*"|[^ \t\n\r,:\[\]{}"]+))           # 8: scalar
+    """, re.VERBOSE)
+KEY = 1
+KEY_MAPPING_START = 2
+KEY_SEQUENCE_START = 3
+MAPPING_START = 4
+SEQUENCE_START = 5
+MAPPING_END = 6
+SEQUENCE_END = 7
+SCALAR = 8
+
+NEWLINE = re.compile(r'\n')
+NON_ASCII = re.compile(r'[^\x00-\x7f]')
+ERROR_POSITION = re.compile(r'^(.*?)(?: starting)?(?: at)?: line (\d+) column (\d+)')
+
+def parse_json(text, intern_strings=True):
+    """
+    Parses a JSON document into agnostic raw data, using the standard (C) decoder.
+
+    Builds the same types as the YAML readers: :code:`CommentedMap` and :code:`CommentedSeq` for
+    objects and arrays, and :code:`str` for strings that are pure ASCII. Duplicate keys are
+    allowed, and the last value wins. Strings are interned in :code:`INTERN_TABLE` if
+    :code:`intern_strings` is True.
+    """
+
+    intern_string = INTERN_TABLE.intern if intern_strings else None
+    def to_raw_mapping(pairs):
+        return CommentedMap([(_to_raw(k, intern_string), _to_raw(v, intern_string)) for k, v in pairs])
+    return _to_raw(json.loads(text, object_pairs_hook=to_raw_mapping), intern_string)
+
+def locate_json(table, text, location):
+    """
+    Fills a :class:`LocatorTable` with the line and column of every key and element of a valid
+    JSON document, with the root as the first entry (at line 0, column 0).
+
+    The text is tokenized in a single streaming pass (with :code:`TOKEN`), without making copies
+    of it beyond the keys, and only offsets are recorded as the tokens go by. The entries of a
+    container are moved to the table as soon as the container is closed, and offsets are converted
+    to line and column numbers at the end.
+    """
+
+    # Bytes must be UTF-8; we only need to decode keys and fix columns if they are not pure ASCII
+    decode = isinstance(text, str) and (NON_ASCII.search(text) is not None)
+
+    # Entries in table order
+    all_offsets = [0]
+    all_keys = [None]
+    all_children = []
+
+    # Frames are (is_mapping, offsets, keys, nested) where nested is a list of the (position, kind,
+    # first child, child count) of child containers (or None if there are none)
+    stack = []
+    is_mapping = False
+    offsets = keys = nested = None
+    root_children = None
+
+    for m in TOKEN.finditer(text):
+        token = m.lastindex
+        if token <= KEY_SEQUENCE_START:
+            key = m.group(KEY)
+            if '\\' in key:
+                key = scanstring(text, m.start(KEY))[0]
+                try:
+                    key = key.encode('ascii')
+                except UnicodeEncodeError:
+                    pass
+            elif decode and (NON_ASCII.search(key) is not None):
+                key = key.decode('utf-8')
+            offsets.append(m.start(KEY) - 1)
+            keys.append(key)
+            if token != KEY:
+                stack.append((is_mapping, offsets, keys, nested))
+                is_mapping = token == KEY_MAPPING_START
+                offsets = []
+                keys = [] if is_mapping else None
+                nested = None
+        elif token <= SEQUENCE_START:
+            if offsets is not None:
+                offsets.append(m.start(token))
+                stack.append((is_mapping, offsets, keys, nested))
+            is_mapping = token == MAPPING_START
+            offsets = []
+            keys = [] if is_mapping else None
+            nested = None
+        elif token <= SEQUENCE_END:
+            # Closing the container: its entries are added contiguously
+            first_child = len(all_offsets)
+            all_offsets.extend(offsets)
+            all_keys.extend(keys if is_mapping else [None] * len(offsets))
+            if nested is not None:
+                for position, kind, first, count in nested:
+                    all_children.append((first_child + position, kind, first, count))
+            children = (MAPPING if is_mapping else SEQUENCE, first_child, len(offsets))
+            if stack:
+                is_mapping, offsets, keys, nested = stack.pop()
+                if nested is None:
+                    nested = []
+                nested.append((len(offsets) - 1,) + children)
+            else:
+                root_children = children
+        elif offsets is not None:
+            # Scalar in a sequence
+            offsets.append(m.start(SCALAR))
+
+    # Offsets to line and column numbers
+    line_starts = [0]
+    line_starts.extend([m.end() for m in NEWLINE.finditer(text)])
+    lines = [bisect(line_starts, offset) for offset in all_offsets]
+    columns = [offset - line_starts[line - 1] + 1 for offset, line in izip(all_offsets, lines)]
+    if decode:
+        # Columns are in characters, not bytes
+        non_ascii_lines = set(bisect(line_starts, m.start()) for m in NON_ASCII.finditer(text))
+        for i, line in enumerate(lines):
+            if line in non_ascii_lines:
+                line_start = line_starts[line - 1]
+                columns[i] = len(text[line_start:all_offsets[i]].decode('utf-8', 'replace')) + 1
+    lines[0] = columns[0] = 0
+
+    table.extend(table.intern_location(location), lines, columns, all_keys)
+    for children in all_children:
+        table.set_children(*children)
+    if root_children is not None:
+        table.set_children(0, *root_children)
+
+class JsonLocatorTable(LocatorTable):
+    """
+    :class:`LocatorTable` for a JSON document that is only filled in (with :func:`locate_json`)
+    when it is first accessed.
+    
+    Until then it keeps a reference to the document's text (but no copy of it). Parsing with the C
+    decoder and locating on demand is much faster than locating while parsing, and locators are
+    only needed when issues are reported.
+    """
+    
+    _lock = Lock()
+    
+    def __init__(self, text, location):
+        self.text = text
+        self.location = location
+    
+    def __getattr__(self, name):
+        # Called only for attributes that we don't have, so we fill ourselves in
+        with JsonLocatorTable._lock:
+            text = self.__dict__.pop('text', None)
+            if text is not None:
+                location = self.__dict__.pop('location')
+                LocatorTable.__init__(self)
+                locate_json(self, text, location)
+        if name not in self.__dict__:
+            raise AttributeError(name)
+        return self.__dict__[name]
+    
+    def __getstate__(self):
+        len(self) # make sure we are filled in
+        return LocatorTable.__getstate__(self)
 
 class JsonReader(Reader):
     """
     ARIA JSON reader.
+    
+    Parses with :func:`parse_json` (interning strings unless the context's :code:`intern_strings`
+    is False), and supports locators via :class:`JsonLocatorTable`, so that issues in JSON
+    documents have line and column numbers, just like in YAML documents.
     """
     
+    ACCEPTS_BYTES = True
+    
     def read(self):
         data = self.load()
-        try:
+        if not isinstance(data, basestring):
             data = unicode(data)
-            return json.loads(data, object_pairs_hook=OrderedDict)
-        except Exception as e:
-            raise ReaderSyntaxError('JSON: %s' % e, cause=e)
+        try:
+            raw = parse_json(data, (self.context is None) or self.context.intern_strings)
+        except ValueError as e:
+            m = ERROR_POSITION.match(str(e))
+            if m is not None:
+                line = int(m.group(2))
+                lines = data.splitlines()
+                snippet = lines[line - 1] if line <= len(lines) else None
+                raise ReaderSyntaxError('JSON: %s' % m.group(1), location=self.loader.location, line=line, column=int(m.group(3)), snippet=snippet, cause=e)
+            raise ReaderSyntaxError('JSON: %s' % e, location=self.loader.location, cause=e)
+        Locator(JsonLocatorTable(data, self.loader.location), 0).link(raw)
+        return raw
+
+def _to_raw(value, intern_string):
+    if isinstance(value, unicode):
+        try:
+            value = value.encode('ascii')
+        except UnicodeEncodeError:
+            pass
+        return intern_string(value) if intern_string is not None else value
+    elif isinstance(value, list):
+        return CommentedSeq([_to_raw(v, intern_string) for v in value])
+    return value
@@ -15,88 +15,289 @@
 #
 
 from ..utils import puts, colored, indent
-from ruamel import yaml # @UnresolvedImport
+from array import array
 
-# We are inheriting the primitive types in order to add the ability to set an attribute (_locator) on them.
+MAPPING = 1
+SEQUENCE = 2
 
-class LocatableString(unicode):
-    pass
-
-class LocatableInt(int):
-    pass
-
-class LocatableFloat(float):
-    pass
-
-def wrap(value):
-    if isinstance(value, basestring):
-        return True, LocatableString(value)
-    elif isinstance(value, int) and not isinstance(value, bool): # Note: bool counts as int in Python! 
-        return True, LocatableInt(value)
-    elif isinstance(value, float):
-        return True, LocatableFloat(value)
-    return False, value
-
-# Add our types to ruamel.yaml (for round trips)
-yaml.representer.RoundTripRepresenter.add_representer(LocatableString, yaml.representer.RoundTripRepresenter.represent_unicode)
-yaml.representer.RoundTripRepresenter.add_representer(LocatableInt, yaml.representer.RoundTripRepresenter.represent_int)
-yaml.representer.RoundTripRepresenter.add_representer(LocatableFloat, yaml.representer.RoundTripRepresenter.represent_float)
+class LocatorTable(object):
+    """
+    Compact storage for the location information (line and column numbers) of agnostic raw data.
+    
+    Entries are stored in parallel integer arrays rather than as objects, and the location of each
+    entry is an index into a table of interned locations. The entries for the children of a
+    container are contiguous, and are indexed by the container's entry and their key (for
+    mappings) or index (for sequences). Keys are interned per table.
+    
+    Use :class:`Locator` to access an entry.
+    """
+    
+    def __init__(self):
+        self.locations = []
+        self.location_indexes = array('H')
+        self.lines = array('l')
+        self.columns = array('l')
+        self.kinds = array('b')
+        self.first_children = array('l')
+        self.child_counts = array('l')
+        self.keys = []
+        self._location_indexes = {}
+        self._keys = {}
+        self._children = {}
+    
+    def __len__(self):
+        return len(self.lines)
+    
+    def intern_location(self, location):
+        """
+        Returns the index of the location in our locations table, adding it if necessary.
+        """
+        
+        index = self._location_indexes.get(id(location))
+        if index is None:
+            index = len(self.locations)
+            self.locations.append(location)
+            self._location_indexes[id(location)] = index
+        return index
+    
+    def add(self, location_index, line, column, key=None):
+        """
+        Adds an entry without children, returning its index.
+        """
+        
+        index = len(self.lines)
+        self.location_indexes.append(location_index)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.kinds.append(0)
+        self.first_children.append(-1)
+        self.child_counts.append(0)
+        if key is not None:
+            key = self._keys.setdefault(key, key)
+        self.keys.append(key)
+        return index
+    
+    def extend(self, location_index, lines, columns, keys=None):
+        """
+        Adds contiguous entries without children from lists of line numbers, column numbers and
+        (optionally) keys (which may include None), returning the index of the first.
+        """
+        
+        index = len(self.lines)
+        count = len(lines)
+        self.location_indexes.fromlist([location_index] * count)
+        self.lines.fromlist(lines)
+        self.columns.fromlist(columns)
+        self.kinds.fromlist([0] * count)
+        self.first_children.fromlist([-1] * count)
+        self.child_counts.fromlist([0] * count)
+        if keys is not None:
+            intern_key = self._keys.setdefault
+            self.keys.extend([intern_key(key, key) if key is not None else None for key in keys])
+        else:
+            self.keys.extend([None] * count)
+        return index
+    
+    def set_children(self, index, kind, first_child, child_count):
+        """
+        Sets the entry's children, which must be the contiguous entries starting at
+        :code:`first_child`. :code:`kind` is :code:`MAPPING` or :code:`SEQUENCE`.
+        """
+        
+        self.kinds[index] = kind
+        self.first_children[index] = first_child
+        self.child_counts[index] = child_count
+    
+    def get_children(self, index):
+        """
+        Dict (for mappings) or list (for sequences) of child :class:`Locator` instances for the
+        entry, or None if it has no children.
+        
+        The children are only materialized when first requested.
+        """
+        
+        children = self._children.get(index)
+        if children is None:
+            kind = self.kinds[index]
+            if kind == 0:
+                return None
+            first_child = self.first_children[index]
+            indexes = xrange(first_child, first_child + self.child_counts[index])
+            if kind == MAPPING:
+                keys = self.keys
+                children = dict((keys[i], Locator(self, i)) for i in indexes)
+            else:
+                children = [Locator(self, i) for i in indexes]
+            self._children[index] = children
+        return children
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Locations are indexed by identity, so this has to be rebuilt
+        del state['_location_indexes']
+        del state['_keys']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._location_indexes = dict((id(location), i) for i, location in enumerate(self.locations))
+        self._keys = {}
 
 class Locator(object):
     """
-    Stores location information (line and column numbers) for agnostic raw data.
+    Location information (line and column numbers) for agnostic raw data.
+    
+    A locator is a lightweight view of an entry in a :class:`LocatorTable`. Locators are lazy:
+    child locators are only materialized when they are first accessed. Likewise, only the root of
+    the agnostic raw data is linked to its locator, and the locators of nested values are found on
+    demand via :code:`find`. On the happy path, where no issues are reported, locators cost almost
+    nothing.
+    
+    Locators are immutable (except for :code:`merge`), so copying them returns the same instance.
     """
-    def __init__(self, location, line, column):
-        self.location = location
-        self.line = line
-        self.column = column
-        self.children = None
+    
+    __slots__ = ('table', 'index')
+    
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+    
+    @property
+    def location(self):
+        table = self.table
+        return table.locations[table.location_indexes[self.index]]
+    
+    @property
+    def line(self):
+        return self.table.lines[self.index]
+    
+    @property
+    def column(self):
+        return self.table.columns[self.index]
+    
+    @property
+    def children(self):
+        """
+        Dict or list of child locators (or None if there are no children).
+        """
+        
+        return self.table.get_children(self.index)
     
     def get_child(self, name):
-        if isinstance(self.children, dict):
-            return self.children.get(name, self)
+        children = self.children
+        if isinstance(children, dict):
+            return children.get(name, self)
         return self
 
     def get_grandchild(self, name1, name2):
-        if isinstance(self.children, dict):
-            locator1 = self.children.get(name1)
-            if (locator1 is not None) and (locator1.children is not None):
-                return locator1.children.get(name2, locator1)
+        children = self.children
+        if isinstance(children, dict):
+            locator1 = children.get(name1)
+            if locator1 is not None:
+                children1 = locator1.children
+                if children1 is not None:
+                    return children1.get(name2, locator1)
         return self
     
     def link(self, raw):
+        """
+        Links the agnostic raw data to this locator.
+        
+        Only the root is linked. See :code:`find`.
+        """
+        
         try:
             setattr(raw, '_locator', self)
         except AttributeError:
             pass
+    
+    def find_path(self, path):
+        """
+        Returns the locator for a path of keys and indexes (a tuple) in the agnostic raw data
+        described by this locator, or None if there is no such entry.
+        """
         
-        if isinstance(raw, list):
-            for i in range(len(raw)):
-                r = raw[i]
-                wrapped, r = wrap(r)
-                if wrapped:
-                    raw[i] = r
-                try:
-                    self.children[i].link(r)
-                except KeyError:
-                    raise ValueError('location map does not match agnostic raw data: %d' % i)
-        elif isinstance(raw, dict):
-            for k, r in raw.iteritems():
-                wrapped, r = wrap(r)
-                if wrapped:
-                    raw[k] = r
+        locator = self
+        for k in path:
+            children = locator.children
+            if isinstance(children, dict):
+                locator = children.get(k)
+            elif isinstance(children, list) and isinstance(k, int) and (k < len(children)):
+                locator = children[k]
+            else:
+                return None
+            if locator is None:
+                return None
+        return locator
+    
+    def find(self, raw, value, max_depth=3):
+        """
+        Finds the locator for a value nested in the agnostic raw data (which must be described by
+        this locator) by identity, searching up to :code:`max_depth` levels deep. Shallower matches
+        are preferred.
+        
+        Prefer :code:`find_path` when the path of the value is known: values that are not dicts or
+        lists can be the same object in several entries (strings are interned and small ints are
+        cached), so they are only found if they are in a single entry at the shallowest depth.
+        
+        The locators of found containers are linked to them, so they will be found immediately next
+        time.
+        
+        Returns None if not found.
+        """
+        
+        limit = 1 if isinstance(value, (dict, list)) else 2
+        for depth in range(1, max_depth + 1):
+            found = []
+            self._find(raw, value, depth, found, limit)
+            if len(found) > 1:
+                # Ambiguous
+                return None
+            if found:
+                locator = found[0]
                 try:
-                    self.children[k].link(r)
-                except KeyError:
-                    raise ValueError('location map does not match agnostic raw data: %s' % k)
+                    setattr(value, '_locator', locator)
+                except AttributeError:
+                    pass
+                return locator
+        return None
+    
+    def _find(self, raw, value, depth, found, limit):
+        if isinstance(raw, dict):
+            items = raw.iteritems()
+        elif isinstance(raw, list):
+            items = enumerate(raw)
+        else:
+            return
+        
+        children = self.children
+        if children is None:
+            return
+        
+        for k, v in items:
+            if isinstance(children, dict):
+                locator = children.get(k)
+            else:
+                locator = children[k] if k < len(children) else None
+            if locator is None:
+                continue
+            if depth == 1:
+                if v is value:
+                    found.append(locator)
+            else:
+                locator._find(v, value, depth - 1, found, limit)
+            if len(found) >= limit:
+                return
     
     def merge(self, locator):
-        if isinstance(self.children, dict) and isinstance(locator.children, dict):
-            for k, m in locator.children.iteritems():
-                if k in self.children:
-                    self.children[k].merge(m)
+        children = self.children
+        other_children = locator.children
+        if isinstance(children, dict) and isinstance(other_children, dict):
+            for k, m in other_children.iteritems():
+                if k in children:
+                    children[k].merge(m)
                 else:
-                    self.children[k] = m
+                    children[k] = m
 
     def dump(self, key=None):
         if key:
@@ -112,6 +313,18 @@ class Locator(object):
                 for k, m in self.children.iteritems():
                     m.dump(k)
 
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __getstate__(self):
+        return (self.table, self.index)
+    
+    def __setstate__(self, state):
+        self.table, self.index = state
+
     def __str__(self):
         # Should be in same format as Issue.locator_as_str
         return '"%s":%d:%d' % (self.location, self.line, self.column)
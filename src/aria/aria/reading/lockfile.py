@@ -0,0 +1,132 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from __future__ import absolute_import # so we can import standard 'json'
+
+from .. import VERSION
+from ..loading import UriLocation, CSAR_SEPARATOR
+from .exceptions import ReaderError
+from threading import Lock
+import json, os.path
+
+class Lockfile(object):
+    """
+    Records how the imports of a blueprint were resolved, and what they contained.
+    
+    For each importing document, the lockfile maps import names to the canonical location they
+    were resolved to. For each of those locations, it stores the content hash and size of the
+    document. Locations are absolute, so they can be loaded without resolution.
+    
+    When :code:`refresh` is False, the entries are trusted (see :code:`get`) and nothing is
+    recorded. When it is True, the entries are ignored and new ones are recorded while reading, so
+    that the lockfile can be saved afterwards.
+    """
+    
+    def __init__(self, path, refresh=False):
+        self.path = os.path.abspath(path)
+        self.refresh = refresh
+        self.imports = {}
+        self.documents = {}
+        self.stale = set()
+        self._lock = Lock()
+    
+    @staticmethod
+    def get_path(location):
+        """
+        The default lockfile path for a blueprint location (next to it), or None if the blueprint
+        is not a local file.
+        """
+        
+        path = location.as_file if isinstance(location, UriLocation) else None
+        return (path + '.lock') if path else None
+    
+    def load(self):
+        """
+        Loads the entries, if the lockfile exists.
+        
+        Raises :class:`ReaderError` if the lockfile is invalid or was created for a different
+        version of ARIA.
+        """
+        
+        if not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                lockfile = json.load(f)
+        except (IOError, ValueError) as e:
+            raise ReaderError('invalid lockfile: %s' % self.path, cause=e)
+        if not isinstance(lockfile, dict):
+            raise ReaderError('invalid lockfile: %s' % self.path)
+        if lockfile.get('version') != VERSION:
+            raise ReaderError('lockfile was created for a different version of ARIA: %s' % self.path)
+        with self._lock:
+            self.imports = lockfile.get('imports', {})
+            self.documents = lockfile.get('documents', {})
+    
+    def save(self):
+        with self._lock:
+            lockfile = {
+                'version': VERSION,
+                'imports': self.imports,
+                'documents': self.documents}
+        with open(self.path, 'w') as f:
+            json.dump(lockfile, f, indent=2, sort_keys=True, separators=(',', ': '))
+            f.write('\n')
+    
+    def get(self, origin, name):
+        """
+        Returns the resolved location and content hash (which may be None) for an import,
+        or None if it is not locked.
+        
+        Local files are cheaply checked by size, so that edited files are not trusted. (Readers
+        also verify the content hash of local files whenever they read them.)
+        """
+        
+        if self.refresh:
+            return None
+        with self._lock:
+            location = self.imports.get(origin, {}).get(name)
+            document = self.documents.get(location) if location is not None else None
+        if (document is None) or (location in self.stale):
+            return None
+        size = document.get('size')
+        if (size is not None) and os.path.isabs(location) and (CSAR_SEPARATOR not in location):
+            try:
+                if os.path.getsize(location) != size:
+                    self.mark_stale(location)
+                    return None
+            except OSError:
+                self.mark_stale(location)
+                return None
+        return location, document.get('hash')
+    
+    def mark_stale(self, location):
+        """
+        Marks a location as not to be trusted anymore.
+        """
+        
+        with self._lock:
+            self.stale.add(location)
+    
+    def add_import(self, origin, name, location):
+        if self.refresh:
+            with self._lock:
+                self.imports.setdefault(origin, {})[name] = location
+    
+    def add_document(self, location, content_hash, size):
+        if self.refresh:
+            with self._lock:
+                self.documents[location] = {'hash': content_hash, 'size': size}
@@ -0,0 +1,208 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .context import ReadingContext
+from .locator import LocatorTable, Locator
+from ruamel.yaml.comments import CommentedMap, CommentedSeq # @UnresolvedImport
+from ruamel.yaml.scalarstring import PreservedScalarString # @UnresolvedImport
+from collections import OrderedDict
+from multiprocessing import Pool
+from threading import Lock
+from array import array
+from datetime import datetime, date
+import marshal
+
+# Containers and non-primitive values are encoded as tuples starting with one of these
+COMMENTED_MAP = 0
+ORDERED_DICT = 1
+DICT = 2
+COMMENTED_SEQ = 3
+LIST = 4
+TUPLE = 5
+PRESERVED_SCALAR_STRING = 6
+DATETIME = 7
+DATE = 8
+
+PRIMITIVES = frozenset((str, unicode, int, long, float, bool, type(None)))
+
+def encode_raw(raw):
+    """
+    Encodes agnostic raw data as values that :code:`marshal` can serialize.
+    
+    Raises :code:`TypeError` for values that we can't encode, such as values with time zones or
+    YAML sets.
+    """
+    
+    t = type(raw)
+    if t in PRIMITIVES:
+        return raw
+    elif t in _MAPPINGS:
+        items = []
+        for k, v in raw.iteritems():
+            items.append(encode_raw(k))
+            items.append(encode_raw(v))
+        return (_MAPPINGS[t], items)
+    elif t in _SEQUENCES:
+        return (_SEQUENCES[t], [encode_raw(v) for v in raw])
+    elif t is PreservedScalarString:
+        return (PRESERVED_SCALAR_STRING, unicode(raw))
+    elif (t is datetime) and (raw.tzinfo is None):
+        return (DATETIME, raw.year, raw.month, raw.day, raw.hour, raw.minute, raw.second, raw.microsecond)
+    elif t is date:
+        return (DATE, raw.year, raw.month, raw.day)
+    raise TypeError('cannot encode %s' % t.__name__)
+
+def decode_raw(encoded):
+    """
+    Decodes agnostic raw data encoded by :func:`encode_raw`.
+    """
+    
+    if type(encoded) is not tuple:
+        return encoded
+    kind = encoded[0]
+    if kind <= DICT:
+        items = iter([decode_raw(v) for v in encoded[1]])
+        return _MAPPING_CLASSES[kind](zip(items, items))
+    elif kind <= TUPLE:
+        return _SEQUENCE_CLASSES[kind - COMMENTED_SEQ]([decode_raw(v) for v in encoded[1]])
+    elif kind == PRESERVED_SCALAR_STRING:
+        return PreservedScalarString(encoded[1])
+    elif kind == DATETIME:
+        return datetime(*encoded[1:])
+    return date(*encoded[1:])
+
+def encode_locator_table(table):
+    """
+    Encodes a :class:`LocatorTable` with a single location as values that :code:`marshal` can
+    serialize. The location itself is not encoded.
+    """
+    
+    if len(table.locations) != 1:
+        raise TypeError('cannot encode a locator table with more than one location')
+    return (table.lines.tostring(), table.columns.tostring(), table.kinds.tostring(), table.first_children.tostring(), table.child_counts.tostring(), encode_raw(table.keys))
+
+def decode_locator_table(encoded, location):
+    """
+    Decodes a :class:`LocatorTable` encoded by :func:`encode_locator_table`, for the location.
+    """
+    
+    table = LocatorTable()
+    location_index = table.intern_location(location)
+    lines, columns, kinds, first_children, child_counts, keys = encoded
+    table.lines.fromstring(lines)
+    table.columns.fromstring(columns)
+    table.kinds.fromstring(kinds)
+    table.first_children.fromstring(first_children)
+    table.child_counts.fromstring(child_counts)
+    table.location_indexes = array('H', (location_index,)) * len(table.lines)
+    table.keys = decode_raw(keys)
+    return table
+
+class ReaderProcessPool(object):
+    """
+    A pool of worker processes for constructing agnostic raw data.
+    
+    Constructing agnostic raw data from YAML is pure Python and holds the GIL, so reading on many
+    threads does not construct documents in parallel. With a pool, readers send the loaded text to
+    a worker process (via :code:`parse`), which constructs the agnostic raw data and its locators
+    and sends them back encoded with :code:`marshal`, which is much faster to load than
+    :code:`pickle`. Only decoding them is left to the reading thread.
+    
+    Documents smaller than :code:`min_size` characters are not worth the round trip, so they are
+    constructed on the reading thread, as are documents that the workers can't encode (see
+    :func:`encode_raw`) or that they fail to read: the reader will then report the error with full
+    details. YAML comments are not preserved.
+    
+    Note that the pool should be created before any threads are started, because the workers are
+    forked.
+    
+    Supports :code:`cache_info` to be compatible with Python 3's :code:`functools.lru_cache`, where
+    "hits" are documents constructed by the workers and "misses" are documents they did not
+    construct.
+    """
+    
+    def __init__(self, processes=None, min_size=16 * 1024, timeout=60):
+        """
+        :param processes: Number of worker processes (defaults to the number of CPUs)
+        :param min_size: Documents smaller than this (in characters) are not sent to the workers
+        :param timeout: Timeout in seconds for a worker to construct a document (after which the
+                        document is constructed on the reading thread)
+        """
+        
+        self.min_size = min_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._pool = Pool(processes)
+        self._lock = Lock()
+    
+    def parse(self, reader, data, location):
+        """
+        Constructs the agnostic raw data (with its locator) for text via the reader's
+        :code:`parse` method in a worker process. The locator will refer to :code:`location`.
+        
+        Returns None if the document was not constructed by a worker.
+        """
+        
+        encoded = None
+        if len(data) >= self.min_size:
+            try:
+                intern_strings = reader.context.intern_strings if reader.context is not None else True
+                encoded = self._pool.apply_async(_parse, (reader.__class__, data, intern_strings)).get(self.timeout)
+            except Exception:
+                pass
+        with self._lock:
+            if encoded is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        
+        encoded_raw, encoded_table = marshal.loads(encoded)
+        raw = decode_raw(encoded_raw)
+        Locator(decode_locator_table(encoded_table, location), 0).link(raw)
+        return raw
+    
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+    
+    def cache_info(self):
+        with self._lock:
+            return (self.hits, self.misses, None, None)
+
+def _parse(reader_class, data, intern_strings):
+    # Runs in the worker process (note that marshal keeps strings interned)
+    try:
+        context = ReadingContext()
+        context.intern_strings = intern_strings
+        raw = reader_class(context, None, None).parse(data, None)
+        return marshal.dumps((encode_raw(raw), encode_locator_table(raw._locator.table)), 2)
+    except Exception:
+        return None
+
+_MAPPINGS = {
+    CommentedMap: COMMENTED_MAP,
+    OrderedDict: ORDERED_DICT,
+    dict: DICT}
+
+_SEQUENCES = {
+    CommentedSeq: COMMENTED_SEQ,
+    list: LIST,
+    tuple: TUPLE}
+
+_MAPPING_CLASSES = (CommentedMap, OrderedDict, dict)
+
+_SEQUENCE_CLASSES = (CommentedSeq, list, tuple)
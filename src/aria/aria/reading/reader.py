@@ -16,33 +16,99 @@
 
 from .. import UnimplementedFunctionalityError
 from ..utils import OpenClose, classname
-from .exceptions import ReaderError, AlreadyReadError
+from .exceptions import ReaderError, AlreadyReadError, ContentMismatchError
+from .cache import get_content_hash
+from collections import OrderedDict
 
 class Reader(object):
     """
     Base class for ARIA readers.
     
     Readers provide agnostic raw data by consuming :class:`aria.loading.Loader` instances.
+    
+    Readers that can parse undecoded bytes should set :code:`ACCEPTS_BYTES` to True, in which
+    case :code:`load` will prefer the loader's :code:`load_bytes` method if it has one. 
+    
+    Readers that can cheaply extract top-level values before fully constructing the agnostic raw
+    data should implement :code:`prescan`, and call :code:`on_prescan`, if set, with its result.
+    This allows imports to be loaded while the document is still being constructed.
     """
     
+    ACCEPTS_BYTES = False
+    
     def __init__(self, context, location, loader):
         self.context = context
         self.location = location
         self.loader = loader
+        self.canonical_location = None
+        self.claimed = False
+        self.on_prescan = None
+        self.content_hash = None
+        self.content_size = None
+        self.expected_content_hash = None
+
+    def claim(self):
+        """
+        Claims the loader's canonical location in the context, so that no other reader will load
+        it. Returns False if it was already claimed by another reader. This is cheap (the document is
+        not opened), and is called by :code:`load` if it wasn't called before. The claim is released
+        if loading fails.
+        """
+        
+        if not self.claimed:
+            self.canonical_location = self.loader.get_canonical_location()
+            if (self.context is not None) and (self.canonical_location is not None):
+                if not self.context.claim_location(self.canonical_location):
+                    return False
+            self.claimed = True
+        return True
+    
+    def release(self):
+        """
+        Releases our claim (see :code:`claim`), so that another reader may load the location.
+        """
+        
+        if self.claimed:
+            if (self.context is not None) and (self.canonical_location is not None):
+                self.context.release_location(self.canonical_location)
+            self.claimed = False
 
     def load(self):
-        with OpenClose(self.loader) as loader:
-            if self.context is not None:
-                with self.context._locations:
-                    for location in self.context._locations:
-                        if location.is_equivalent(loader.location):
-                            raise AlreadyReadError('already read: %s' % loader.location)
-                    self.context._locations.append(loader.location)
+        if not self.claim():
+            raise AlreadyReadError('already read: %s' % self.canonical_location)
+        
+        try:
+            with OpenClose(self.loader) as loader:
+                if self.ACCEPTS_BYTES and hasattr(loader, 'load_bytes'):
+                    data = loader.load_bytes()
+                else:
+                    data = loader.load()
+                if data is None:
+                    raise ReaderError('loader did not provide data: %s' % loader)
             
-            data = loader.load()
-            if data is None:
-                raise ReaderError('loader did not provide data: %s' % loader)
-            return data
+            if isinstance(data, basestring):
+                encoded = data.encode('utf-8') if isinstance(data, unicode) else data
+                self.content_hash = get_content_hash(encoded)
+                self.content_size = len(encoded)
+            if (self.expected_content_hash is not None) and (self.content_hash != self.expected_content_hash):
+                raise ContentMismatchError('content does not match expected hash: %s' % self.location)
+        except Exception:
+            # Another reader may load the location
+            self.release()
+            raise
+        return data
+    
+    def prescan(self, data):
+        """
+        Returns partial agnostic raw data containing only the context's :code:`prescan_keys`,
+        extracted from loaded data without fully reading it, or None if not supported.
+        
+        The default implementation supports data that is already agnostic raw data.
+        """
+        
+        if (self.context is not None) and isinstance(data, dict):
+            return OrderedDict((k, data[k]) for k in self.context.prescan_keys if k in data)
+        return None
     
     def read(self):
         raise UnimplementedFunctionalityError(classname(self) + '.read')
@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .. import VERSION
+from ..loading import Loader, UriLocation
+from ..utils import StrictList
+from .raw import RawReader
+from .cache import LOCATION_PERSISTENT_ID
+from .exceptions import ReaderError
+from hashlib import sha1
+from cStringIO import StringIO
+import cPickle, os.path
+
+class Snapshot(object):
+    """
+    A precompiled snapshot of agnostic raw data (with locators) for a tree of documents.
+    
+    Entries are named by their path relative to the root directory of the tree, and also store a
+    digest of the source document. An entry is only used if the source document still matches
+    the digest, so a stale snapshot quietly falls back to normal reading.
+    
+    Snapshots are created with :code:`aria-snapshot` (see :mod:`aria.tools.snapshot`).
+    """
+    
+    def __init__(self, root, entries=None):
+        self.root = os.path.abspath(root)
+        self.entries = entries or {}
+    
+    @staticmethod
+    def load(path, root):
+        """
+        Loads a snapshot file for documents in the root directory.
+        """
+        
+        with open(path, 'rb') as f:
+            snapshot = cPickle.load(f)
+        if snapshot.get('version') != VERSION:
+            raise ReaderError('snapshot was created for a different version of ARIA: %s' % path)
+        return Snapshot(root, snapshot['entries'])
+    
+    def save(self, path):
+        with open(path, 'wb') as f:
+            cPickle.dump({'version': VERSION, 'entries': self.entries}, f, cPickle.HIGHEST_PROTOCOL)
+    
+    def add(self, name, raw):
+        """
+        Adds an entry for the document (which must be in the root directory) as read into the
+        agnostic raw data.
+        
+        The raw data must not have been linked to its locator yet.
+        """
+        
+        locator = getattr(raw, '_locator', None)
+        location = locator.location if locator is not None else None
+        
+        def persistent_id(o):
+            return LOCATION_PERSISTENT_ID if o is location else None
+        
+        with open(os.path.join(self.root, name), 'rb') as f:
+            digest = sha1(f.read()).hexdigest()
+
+        data = StringIO()
+        pickler = cPickle.Pickler(data, cPickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = persistent_id
+        pickler.dump((raw, locator))
+        self.entries[name] = (digest, data.getvalue())
+    
+    def get_name(self, location, origin_location):
+        """
+        Returns the name of the entry that would be loaded for the location, or None if the
+        location is not in the snapshot.
+
+        The same resolution rules as those of :class:`aria.loading.FileTextLoader` are applied,
+        with the root treated as a search path. 
+        """
+        
+        if not isinstance(location, UriLocation):
+            return None
+        path = location.as_file
+        if not path:
+            return None
+        
+        if os.path.isabs(path):
+            return self._get_name_for_path(path)
+
+        # Relative to the current directory
+        name = self._get_name_for_path(os.path.abspath(path))
+        if name is not None:
+            return name
+        if os.path.exists(path):
+            return None
+
+        # Relative to the origin
+        origin_search_path = origin_location.search_path if origin_location is not None else None
+        if origin_search_path:
+            origin_path = os.path.join(origin_search_path, path)
+            name = self._get_name_for_path(origin_path)
+            if name is not None:
+                return name
+            if os.path.exists(origin_path):
+                return None
+
+        # Relative to the root
+        return self._get_name_for_path(os.path.join(self.root, path))
+    
+    def get_reader(self, context, location, origin_location):
+        """
+        Returns a :class:`aria.reading.RawReader` for the snapshot entry, or None if the location
+        is not in the snapshot or if the entry is stale.
+        
+        The location's URI will be set to the absolute path of the source document. 
+        """
+        
+        name = self.get_name(location, origin_location)
+        if name is None:
+            return None
+
+        path = os.path.join(self.root, name)
+        digest, data = self.entries[name]
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except IOError:
+            return None
+        if sha1(content).hexdigest() != digest:
+            return None
+
+        location.uri = path
+        reader = RawReader(context, location, SnapshotLoader(location, data))
+        reader.content_hash = digest
+        reader.content_size = len(content)
+        return reader
+    
+    def _get_name_for_path(self, path):
+        path = os.path.normpath(path)
+        if path.startswith(self.root + os.sep):
+            name = path[len(self.root) + 1:]
+            if name in self.entries:
+                return name
+        return None
+
+class SnapshotLoader(Loader):
+    """
+    ARIA snapshot loader.
+    
+    Provides the agnostic raw data (with locators) of a :class:`Snapshot` entry. The locators
+    will refer to our location.
+    """
+    
+    def __init__(self, location, data):
+        self.location = location
+        self.data = data
+    
+    def get_canonical_location(self):
+        # Same as FileTextLoader, so that snapshot entries and files are not both read
+        return os.path.abspath(self.location.uri)
+    
+    def load(self):
+        unpickler = cPickle.Unpickler(StringIO(self.data))
+        unpickler.persistent_load = lambda persistent_id: self.location
+        raw, locator = unpickler.load()
+        if locator is not None:
+            setattr(raw, '_locator', locator)
+        return raw
+
+SNAPSHOTS = StrictList(value_class=Snapshot)
@@ -16,7 +16,7 @@
 
 from ..loading import LiteralLocation, UriLocation
 from .exceptions import ReaderNotFoundError
-from .yaml import YamlReader
+from .yaml import YamlReader, FastYamlReader
 from .json import JsonReader
 from .jinja import JinjaReader
 
@@ -41,11 +41,15 @@ class DefaultReaderSource(ReaderSource):
     locations that end in ".yaml", a :class:`JsonReader` for locations that
     end in ".json",  and a :class:`JinjaReader` for locations that end in
     ".jinja". 
+    
+    The YAML reader class can be changed via :code:`yaml_reader_class`, for example to
+    :class:`FastYamlReader`.
     """
     
-    def __init__(self, literal_reader_class=YamlReader):
+    def __init__(self, literal_reader_class=YamlReader, yaml_reader_class=YamlReader):
         super(DefaultReaderSource, self).__init__()
         self.literal_reader_class = literal_reader_class
+        self.yaml_reader_class = yaml_reader_class
 
     def get_reader(self, context, location, loader):
         if isinstance(location, LiteralLocation):
@@ -54,6 +58,16 @@ class DefaultReaderSource(ReaderSource):
         elif isinstance(location, UriLocation):
             for extension, reader_class in EXTENSIONS.iteritems():
                 if location.uri.endswith(extension):
+                    if reader_class is YamlReader:
+                        reader_class = self.yaml_reader_class
                     return reader_class(context, location, loader)
                 
         return super(DefaultReaderSource, self).get_reader(context, location, loader)
+
+class FastReaderSource(DefaultReaderSource):
+    """
+    Like :class:`DefaultReaderSource`, but uses :class:`FastYamlReader` for YAML.
+    """
+    
+    def __init__(self):
+        super(FastReaderSource, self).__init__(literal_reader_class=FastYamlReader, yaml_reader_class=FastYamlReader)
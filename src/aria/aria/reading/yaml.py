@@ -15,50 +15,284 @@
 #
 
 from .reader import Reader
-from .exceptions import ReaderSyntaxError
-from .locator import Locator
-from collections import OrderedDict
+from .exceptions import ReaderSyntaxError, AlreadyReadError
+from .locator import LocatorTable, Locator, MAPPING, SEQUENCE
+from .interning import INTERN_TABLE
+from collections import OrderedDict, deque
 from ruamel import yaml # @UnresolvedImport
 
-class YamlLocator(Locator):
+try:
+    from ruamel.yaml.cyaml import CParser # @UnresolvedImport
+except ImportError:
+    # libyaml bindings are not available
+    CParser = None
+
+if CParser is not None:
+    class FastYamlLoader(CParser, yaml.constructor.SafeConstructor, yaml.resolver.VersionedResolver):
+        """
+        YAML loader that uses the libyaml C parser.
+        
+        Nodes still have marks, so they can be used for :func:`get_yaml_locator`, but comments are not
+        preserved. Constructs the same types as :code:`ruamel.yaml.RoundTripLoader` for maps and
+        sequences, and resolves scalars according to the same YAML version.
+        
+        Merge keys ("<<") are applied with the merged keys first.
+        
+        Strings are interned with :code:`intern_string`, if it is set.
+        """
+        
+        yaml_version = None
+        intern_string = None
+        
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            yaml.constructor.SafeConstructor.__init__(self)
+            yaml.resolver.VersionedResolver.__init__(self)
+        
+        def construct_yaml_str(self, node):
+            value = yaml.constructor.SafeConstructor.construct_yaml_str(self, node)
+            return self.intern_string(value) if self.intern_string is not None else value
+        
+        def construct_yaml_map(self, node):
+            data = yaml.comments.CommentedMap()
+            yield data
+            self.flatten_mapping(node)
+            for key_node, value_node in node.value:
+                key = self.construct_object(key_node, deep=True)
+                if isinstance(key, list):
+                    key = tuple(key)
+                try:
+                    hash(key)
+                except TypeError as e:
+                    raise yaml.constructor.ConstructorError('while constructing a mapping', node.start_mark, 'found unacceptable key (%s)' % e, key_node.start_mark)
+                data[key] = self.construct_object(value_node)
+        
+        def construct_yaml_seq(self, node):
+            data = yaml.comments.CommentedSeq()
+            yield data
+            data.extend(self.construct_sequence(node))
+
+    FastYamlLoader.add_constructor(u'tag:yaml.org,2002:str', FastYamlLoader.construct_yaml_str)
+    FastYamlLoader.add_constructor(u'tag:yaml.org,2002:map', FastYamlLoader.construct_yaml_map)
+    FastYamlLoader.add_constructor(u'tag:yaml.org,2002:seq', FastYamlLoader.construct_yaml_seq)
+else:
+    FastYamlLoader = None
+
+class RoundTripLoader(yaml.RoundTripLoader):
     """
-    Map for agnostic raw data read from YAML.
+    :code:`ruamel.yaml.RoundTripLoader` that can intern strings.
     """
     
-    def parse(self, yaml_loader, node, location):
-        if isinstance(node, yaml.SequenceNode):
-            self.children = []
-            for n in node.value:
-                locator = YamlLocator(location, n.start_mark.line + 1, n.start_mark.column + 1)
-                self.children.append(locator)
-                locator.parse(yaml_loader, n, location)
-        elif isinstance(node, yaml.MappingNode):
-            yaml_loader.flatten_mapping(node)
-            self.children = {}
+    intern_string = None
+    
+    def construct_yaml_str(self, node):
+        value = yaml.RoundTripLoader.construct_yaml_str(self, node)
+        return self.intern_string(value) if self.intern_string is not None else value
+
+RoundTripLoader.add_constructor(u'tag:yaml.org,2002:str', RoundTripLoader.construct_yaml_str)
+
+def get_yaml_locator(node, location):
+    """
+    Creates a :class:`Locator` for the YAML node graph (which must already have its merge keys
+    flattened). The root locator is at line 0, column 0.
+    
+    The node graph is not retained.
+    """
+    
+    table = LocatorTable()
+    location_index = table.intern_location(location)
+    add = table.add
+    queue = deque(((add(location_index, 0, 0), node),))
+    while queue:
+        index, node = queue.popleft()
+        if isinstance(node, yaml.MappingNode):
+            first_child = len(table)
             for key, n in node.value:
-                locator = YamlLocator(location, key.start_mark.line + 1, key.start_mark.column + 1)
-                self.children[key.value] = locator
-                locator.parse(yaml_loader, n, location)
+                mark = key.start_mark
+                queue.append((add(location_index, mark.line + 1, mark.column + 1, key.value), n))
+            table.set_children(index, MAPPING, first_child, len(node.value))
+        elif isinstance(node, yaml.SequenceNode):
+            first_child = len(table)
+            for n in node.value:
+                mark = n.start_mark
+                queue.append((add(location_index, mark.line + 1, mark.column + 1), n))
+            table.set_children(index, SEQUENCE, first_child, len(node.value))
+    return Locator(table, 0)
+
+def flatten_merges(node, visited=None):
+    """
+    Applies merge keys ("<<") in a YAML node graph, in place. Merged keys come first, and are
+    overridden by explicit keys.
+    
+    We do this before construction, because the round-trip constructor does not handle nested
+    merges properly.
+    """
+    
+    if visited is None:
+        visited = set()
+    if id(node) in visited:
+        return
+    visited.add(id(node))
+    
+    if isinstance(node, yaml.MappingNode):
+        merge = []
+        value = []
+        for key_node, value_node in node.value:
+            if key_node.tag == u'tag:yaml.org,2002:merge':
+                if isinstance(value_node, yaml.MappingNode):
+                    flatten_merges(value_node, visited)
+                    merge.extend(value_node.value)
+                elif isinstance(value_node, yaml.SequenceNode):
+                    submerge = []
+                    for subnode in value_node.value:
+                        if not isinstance(subnode, yaml.MappingNode):
+                            raise yaml.constructor.ConstructorError('while constructing a mapping', node.start_mark, 'expected a mapping for merging, but found %s' % subnode.id, subnode.start_mark)
+                        flatten_merges(subnode, visited)
+                        submerge.append(subnode.value)
+                    submerge.reverse()
+                    for v in submerge:
+                        merge.extend(v)
+                else:
+                    raise yaml.constructor.ConstructorError('while constructing a mapping', node.start_mark, 'expected a mapping or list of mappings for merging, but found %s' % value_node.id, value_node.start_mark)
+            else:
+                flatten_merges(value_node, visited)
+                value.append((key_node, value_node))
+        if merge:
+            node.value = merge + value
+    elif isinstance(node, yaml.SequenceNode):
+        for n in node.value:
+            flatten_merges(n, visited)
+
+class YamlPrescanError(Exception):
+    pass
+
+def prescan_yaml(data, keys, yaml_loader_class=yaml.RoundTripLoader):
+    """
+    Returns the values of the specified top-level keys of a YAML document as agnostic raw data.
+    
+    Only the event stream is parsed (no nodes are composed and nothing is constructed), and
+    parsing stops as soon as all keys have been found. Scalars are not resolved, so all values are
+    strings.
+    
+    Returns None if the values cannot be determined this way, for example if the document is not
+    a mapping or if the keys involve aliases or merges.
+    """
+    
+    keys = set(keys)
+    raw = OrderedDict()
+    try:
+        events = yaml.parse(data, yaml_loader_class)
+        for event in events:
+            if isinstance(event, yaml.MappingStartEvent):
+                break
+            if not isinstance(event, (yaml.StreamStartEvent, yaml.DocumentStartEvent)):
+                return None
+        for event in events:
+            if isinstance(event, yaml.MappingEndEvent):
+                break
+            if (not isinstance(event, yaml.ScalarEvent)) or (event.value == '<<'):
+                return None
+            key = event.value
+            if key in keys:
+                raw[key] = _prescan_value(events.next(), events)
+                keys.remove(key)
+                if not keys:
+                    break
+            else:
+                _prescan_skip(events.next(), events)
+    except (yaml.YAMLError, YamlPrescanError, StopIteration):
+        return None
+    return raw
+
+def _prescan_value(event, events):
+    if isinstance(event, yaml.ScalarEvent):
+        return event.value
+    elif isinstance(event, yaml.SequenceStartEvent):
+        value = []
+        for event in events:
+            if isinstance(event, yaml.SequenceEndEvent):
+                return value
+            value.append(_prescan_value(event, events))
+    elif isinstance(event, yaml.MappingStartEvent):
+        value = OrderedDict()
+        for event in events:
+            if isinstance(event, yaml.MappingEndEvent):
+                return value
+            if (not isinstance(event, yaml.ScalarEvent)) or (event.value == '<<'):
+                raise YamlPrescanError()
+            value[event.value] = _prescan_value(events.next(), events)
+    raise YamlPrescanError()
+
+def _prescan_skip(event, events):
+    if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+        depth = 1
+        for event in events:
+            if isinstance(event, (yaml.SequenceStartEvent, yaml.MappingStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.SequenceEndEvent, yaml.MappingEndEvent)):
+                depth -= 1
+                if depth == 0:
+                    return
 
 class YamlReader(Reader):
     """
     ARIA YAML reader.
+    
+    Supports :code:`prescan` via :func:`prescan_yaml`, and constructing in a worker process if the
+    context has a :code:`process_pool` (see :class:`ReaderProcessPool`).
+    
+    Strings are interned in the process-wide :code:`INTERN_TABLE`, unless the context's
+    :code:`intern_strings` is False.
+    
+    Uses the pure-Python :code:`ruamel.yaml.RoundTripLoader`. See :class:`FastYamlReader` for a
+    faster alternative.
     """
     
+    def get_yaml_loader_class(self):
+        return RoundTripLoader
+    
+    def prescan(self, data):
+        if self.context is None:
+            return None
+        return prescan_yaml(data if isinstance(data, unicode) else unicode(data), self.context.prescan_keys, self.get_yaml_loader_class())
+    
     def read(self):
+        cache = self.context.cache if self.context is not None else None
+        if (cache is not None) and (self.expected_content_hash is not None) and not self.loader.LOCAL:
+            # The content is known, so we might not have to fetch it at all (local documents are
+            # always loaded, because they might have been edited without changing the size)
+            if not self.claim():
+                raise AlreadyReadError('already read: %s' % self.canonical_location)
+            raw = cache.get(cache.get_key(self, content_hash=self.expected_content_hash), self.loader.location)
+            if raw is not None:
+                self.content_hash = self.expected_content_hash
+                return raw
+        
         data = self.load()
         try:
-            data = unicode(data)
-            yaml_loader = yaml.RoundTripLoader(data)
-            node = yaml_loader.get_single_node()
-            locator = YamlLocator(self.loader.location, 0, 0)
-            if node is None:
-                raw = OrderedDict()
-            else:
-                locator.parse(yaml_loader, node, self.loader.location)
-                raw = yaml_loader.construct_document(node)
-            #locator.dump()
-            setattr(raw, '_locator', locator)
+            # Note: ruamel.yaml parses text much faster than it parses bytes, so we do not accept bytes
+            if not isinstance(data, unicode):
+                data = unicode(data)
+            
+            if cache is not None:
+                key = cache.get_key(self, data, self.content_hash)
+                raw = cache.get(key, self.loader.location)
+                if raw is not None:
+                    return raw
+            
+            if self.on_prescan is not None:
+                prescanned = self.prescan(data)
+                if prescanned is not None:
+                    self.on_prescan(prescanned)
+            
+            process_pool = self.context.process_pool if self.context is not None else None
+            raw = process_pool.parse(self, data, self.loader.location) if process_pool is not None else None
+            if raw is None:
+                raw = self.parse(data, self.loader.location)
+            
+            if cache is not None:
+                cache.put(key, self.loader.location, raw)
+            
             return raw
             
             #return yaml.load(data, yaml.RoundTripLoader)
@@ -72,3 +306,34 @@ class YamlReader(Reader):
                 raise ReaderSyntaxError('YAML %s: %s %s' % (e.__class__.__name__, problem, context), location=self.loader.location, line=line, column=column, snippet=snippet, cause=e)
             else:
                 raise ReaderSyntaxError('YAML: %s' % e, cause=e)
+    
+    def parse(self, data, location):
+        """
+        Constructs the agnostic raw data (with its locator) for text. The locator will refer to
+        :code:`location`.
+        """
+        
+        yaml_loader = self.get_yaml_loader_class()(data)
+        if (self.context is None) or self.context.intern_strings:
+            yaml_loader.intern_string = INTERN_TABLE.intern
+        node = yaml_loader.get_single_node()
+        if node is None:
+            raw = OrderedDict()
+        else:
+            if u'<<' in data:
+                flatten_merges(node)
+            raw = yaml_loader.construct_document(node)
+        setattr(raw, '_locator', get_yaml_locator(node, location))
+        return raw
+
+class FastYamlReader(YamlReader):
+    """
+    ARIA YAML reader that uses the libyaml C parser (via :class:`FastYamlLoader`) if it is
+    available, and otherwise falls back to :code:`ruamel.yaml.RoundTripLoader`.
+    
+    Locators are as precise as with :class:`YamlReader`, but YAML comments are not preserved in
+    the agnostic raw data.
+    """
+    
+    def get_yaml_loader_class(self):
+        return FastYamlLoader if FastYamlLoader is not None else RoundTripLoader
@@ -39,7 +39,10 @@ def main():
         
         consumer_class_name = args.consumer
         dumper = None
-        if consumer_class_name == 'presentation':
+        if consumer_class_name == 'fingerprint':
+            context.presentation.fingerprint_only = True
+            consumer = ConsumerChain(context, (Read,))
+        elif consumer_class_name == 'presentation':
             dumper = consumer.consumers[0]
         elif consumer_class_name == 'template':
             consumer.append(Template)
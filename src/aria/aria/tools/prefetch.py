@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .utils import CommonArgumentParser, create_context_from_namespace
+from .. import install_aria_extensions
+from ..consumption import ConsumerChain, Read
+from ..loading import Loader, LoaderSource, UriLoader, UriMirror
+from ..utils import LockedList, print_exception, puts, colored
+import sys
+
+class ArgumentParser(CommonArgumentParser):
+    def __init__(self):
+        super(ArgumentParser, self).__init__(description='Prefetch Tool', prog='aria-prefetch')
+        self.add_argument('uri', help='URI or file path to blueprint')
+        self.add_argument('out', help='mirror directory to download into')
+        self.add_argument('--refresh', action='store_true', help='download documents even if they are already in the mirror')
+
+class PrefetchLoader(Loader):
+    """
+    Wraps a :class:`aria.loading.UriLoader`, storing the fetched document in a mirror.
+    """
+    
+    def __init__(self, loader, mirror, fetched):
+        self.loader = loader
+        self.location = loader.location
+        self.mirror = mirror
+        self.fetched = fetched
+    
+    def get_canonical_location(self):
+        return self.loader.get_canonical_location()
+    
+    def open(self):
+        self.loader.open()
+        path = self.mirror.put(self.location.uri, self.loader.load_bytes())
+        if path is not None:
+            self.fetched.append((self.location.uri, path))
+
+    def close(self):
+        self.loader.close()
+
+    def load(self):
+        return self.loader.load()
+
+    def load_bytes(self):
+        return self.loader.load_bytes()
+
+class PrefetchLoaderSource(LoaderSource):
+    """
+    Wraps a loader source, so that all documents fetched by :class:`aria.loading.UriLoader`
+    instances are stored in a mirror.
+    """
+    
+    def __init__(self, loader_source, mirror):
+        self.loader_source = loader_source
+        self.mirror = mirror
+        self.fetched = LockedList()
+    
+    def get_loader(self, context, location, origin_location):
+        loader = self.loader_source.get_loader(context, location, origin_location)
+        if isinstance(loader, UriLoader):
+            loader = PrefetchLoader(loader, self.mirror, self.fetched)
+        return loader
+
+def prefetch(context, mirror, refresh=False):
+    """
+    Reads the blueprint and all of its imports (in parallel), storing all remote documents in the
+    mirror.
+    
+    Unless :code:`refresh` is True, documents that are already in the mirror are not fetched
+    again.
+    
+    Returns a list of (URI, path) tuples for the fetched documents.
+    """
+    
+    if not refresh:
+        context.loading.mirrors.append(mirror)
+    loader_source = PrefetchLoaderSource(context.loading.loader_source, mirror)
+    context.loading.loader_source = loader_source
+    ConsumerChain(context, (Read,)).consume()
+    return sorted(loader_source.fetched)
+
+def main():
+    try:
+        args, _ = ArgumentParser().parse_known_args()
+        
+        install_aria_extensions()
+        
+        context = create_context_from_namespace(args, lock=False, locked=False)
+        fetched = prefetch(context, UriMirror(args.out), args.refresh)
+        
+        for uri, path in fetched:
+            puts('%s %s' % (colored.blue(uri), path))
+        
+        if context.validation.dump_issues():
+            sys.exit(1)
+        
+    except Exception as e:
+        print_exception(e)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from .utils import BaseArgumentParser
+from .. import install_aria_extensions
+from ..consumption import ConsumptionContext, ConsumerChain, Read, Validate
+from ..loading import UriLocation, LiteralLocation
+from ..reading import SNAPSHOTS, Snapshot
+from ..utils import print_exception, import_fullname, puts, colored
+import os.path, sys, json
+
+class ArgumentParser(BaseArgumentParser):
+    def __init__(self):
+        super(ArgumentParser, self).__init__(description='Snapshot Tool', prog='aria-snapshot')
+        self.add_argument('root', help='root directory of the documents')
+        self.add_argument('entry', nargs='+', help='path of entry document, relative to the root')
+        self.add_argument('--out', required=True, help='path of snapshot file to write')
+        self.add_argument('--presenter', help='force use of this presenter class for the documents')
+
+def create_snapshot(root, entries, presenter_class=None):
+    """
+    Reads and validates the entry documents, and creates a :class:`aria.reading.Snapshot` of
+    them and of all the documents they import from within the root directory.
+    
+    The entry documents are validated together, as the imports of a single literal document,
+    because they may depend on each other without importing each other.
+    
+    Returns None if there were validation issues. 
+    """
+    
+    snapshot = Snapshot(root)
+
+    context = ConsumptionContext()
+    context.loading.search_paths.append(snapshot.root)
+    context.presentation.location = LiteralLocation(json.dumps({'imports': entries}))
+    context.presentation.presenter_class = presenter_class
+    ConsumerChain(context, (Read, Validate)).consume()
+    if context.validation.dump_issues():
+        return None
+    
+    # Read again, this time without linking
+    for path in context.reading.locations:
+        if path.startswith(snapshot.root + os.sep):
+            name = path[len(snapshot.root) + 1:]
+            if name not in snapshot.entries:
+                location = UriLocation(path)
+                loader = context.loading.loader_source.get_loader(context.loading, location, None)
+                reader = context.reading.reader_source.get_reader(None, location, loader)
+                snapshot.add(name, reader.read())
+
+    return snapshot
+
+def main():
+    try:
+        args, _ = ArgumentParser().parse_known_args()
+        
+        install_aria_extensions()
+        
+        # We must not read from existing snapshots
+        del SNAPSHOTS[:]
+        
+        snapshot = create_snapshot(args.root, args.entry, import_fullname(args.presenter))
+        if snapshot is None:
+            sys.exit(1)
+        snapshot.save(args.out)
+        
+        for name in sorted(snapshot.entries):
+            puts(colored.blue(name))
+        
+    except Exception as e:
+        print_exception(e)
+
+if __name__ == '__main__':
+    main()
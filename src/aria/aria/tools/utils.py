@@ -16,8 +16,10 @@
 
 from .. import VERSION
 from ..consumption import ConsumptionContext
-from ..loading import UriLocation, FILE_LOADER_SEARCH_PATHS
-from ..utils import import_fullname, ArgumentParser
+from ..loading import UriLocation, UriMirror, FILE_LOADER_SEARCH_PATHS
+from ..reading import ReadCache, Lockfile, ReaderError
+from ..utils import import_fullname, ArgumentParser, puts, colored
+import sys
 
 class BaseArgumentParser(ArgumentParser):
     def __init__(self, description, **kwargs):
@@ -31,6 +33,12 @@ class CommonArgumentParser(BaseArgumentParser):
         self.add_argument('--presenter-source', default='aria.presentation.DefaultPresenterSource', help='presenter source class for the parser')
         self.add_argument('--presenter', help='force use of this presenter class in parser')
         self.add_argument('--path', nargs='*', help='search paths for imports')
+        self.add_argument('--mirror', action='append', help='mirror directory for remote imports (can be repeated)')
+        self.add_argument('--processes', type=int, default=0, help='number of processes for reading large documents in parallel (-1 for the number of CPUs)')
+        self.add_argument('--read-cache', help='directory for caching read documents')
+        self.add_argument('--read-cache-size', type=int, default=100, help='maximum size of the read cache in MB')
+        self.add_argument('--lock', action='store_true', help='write or refresh the import lockfile next to the blueprint')
+        self.add_argument('--locked', action='store_true', help='resolve imports with the import lockfile next to the blueprint')
         self.add_argument('--debug', action='store_true', help='print debug info')
 
     def parse_known_args(self, args=None, namespace=None):
@@ -47,12 +55,27 @@ def create_context_from_namespace(ns, **kwargs):
     args.update(kwargs)
     return create_context(**args)
 
-def create_context(uri, loader_source, reader_source, presenter_source, presenter, debug, **kwargs):
+def create_context(uri, loader_source, reader_source, presenter_source, presenter, debug, read_cache=None, read_cache_size=100, lock=False, locked=False, mirror=None, processes=0, **kwargs):
     context = ConsumptionContext()
     context.loading.loader_source = import_fullname(loader_source)()
     context.reading.reader_source = import_fullname(reader_source)()
+    if mirror:
+        for path in mirror:
+            context.loading.mirrors.append(UriMirror(path))
+    if read_cache is not None:
+        context.reading.cache = ReadCache(read_cache, max_size=read_cache_size * 1024 * 1024)
     context.presentation.location=UriLocation(uri) if isinstance(uri, basestring) else uri
+    lockfile_path = Lockfile.get_path(context.presentation.location) if (lock or locked) else None
+    if lockfile_path is not None:
+        context.reading.lockfile = Lockfile(lockfile_path, refresh=lock)
+        if not lock:
+            try:
+                context.reading.lockfile.load()
+            except ReaderError as e:
+                puts(colored.yellow('Ignoring lockfile: %s' % e), stream=sys.stderr.write)
+                context.reading.lockfile = None
     context.presentation.presenter_source = import_fullname(presenter_source)()
     context.presentation.presenter_class = import_fullname(presenter)
     context.presentation.print_exceptions = debug
+    context.presentation.processes = processes if processes >= 0 else None
     return context
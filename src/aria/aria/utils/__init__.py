@@ -15,12 +15,12 @@
 #
 
 from .openclose import OpenClose
-from .caching import  cachedmethod, HasCachedMethods
+from .caching import  cachedmethod, HasCachedMethods, LRUCache, LRUFileCache, clear_method_cache, get_method_cache_size
 from .formatting import JsonAsRawEncoder, YamlAsRawDumper, classname, make_agnostic, json_dumps, yaml_dumps
-from .collections import ReadOnlyList, EMPTY_READ_ONLY_LIST, ReadOnlyDict, EMPTY_READ_ONLY_DICT, StrictList, StrictDict, merge, prune, deepcopy_with_locators, copy_locators
+from .collections import ReadOnlyList, EMPTY_READ_ONLY_LIST, ReadOnlyDict, EMPTY_READ_ONLY_DICT, StrictList, StrictDict, merge, prune, deepcopy_with_locators, copy_with_locators, copy_locators
 from .exceptions import print_exception, print_traceback
 from .imports import import_fullname, import_modules
-from .threading import ExecutorException, FixedThreadPoolExecutor, LockedList
+from .threading import ExecutorException, DaemonThread, FixedThreadPoolExecutor, LockedList
 from .argparse import ArgumentParser
 from .console import puts, colored, indent
 
@@ -28,6 +28,10 @@ __all__ = (
     'OpenClose',
     'cachedmethod',
     'HasCachedMethods',
+    'LRUCache',
+    'LRUFileCache',
+    'clear_method_cache',
+    'get_method_cache_size',
     'JsonAsRawEncoder',
     'YamlAsRawDumper',
     'classname',
@@ -43,12 +47,14 @@ __all__ = (
     'merge',
     'prune',
     'deepcopy_with_locators',
+    'copy_with_locators',
     'copy_locators',
     'print_exception',
     'print_traceback',
     'import_fullname',
     'import_modules',
     'ExecutorException',
+    'DaemonThread',
     'FixedThreadPoolExecutor',
     'LockedList',
     'ArgumentParser',
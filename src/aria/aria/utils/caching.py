@@ -14,35 +14,96 @@
 # under the License.
 #
 
-from functools import partial
 from threading import Lock
 from collections import OrderedDict
+from functools import partial
+from types import MethodType
+import inspect, os, sys, tempfile
 
 #cachedmethod = lambda x: x
 
+# Whether cachedmethod collects statistics (see cachedmethod.enable_stats)
+_collect_stats = False
+
+_MISSING = object()
+
 class cachedmethod(object):
     """
     Decorator for caching method return values.
     
-    The implementation is thread-safe.
+    The implementation is thread-safe. Hits do not take a lock: a hit is a single dict lookup,
+    which is atomic. When two threads miss at the same time both will call the method, but only the
+    first return value to be stored is used by both.
+    
+    Where entries are held, and so how long they live:
+    
+    * Methods whose first argument is :code:`context` keep their entries in the context (in its
+      :code:`_method_cache`), so that they live only as long as the context does. Presentations
+      that are reused with many contexts thus don't keep the contexts, or the values computed with
+      them, alive. All entries held by a context can also be dropped at once with
+      :func:`clear_method_cache`. If the context can't hold entries (for example, if it's None)
+      they are kept in the instance.
+    * Other methods keep their entries in the instance (in its :code:`_method_cache`).
+    
+    An instance that is shared between contexts can have a context of its own in
+    :code:`_method_context`. Its methods with only a :code:`context` argument then always use that
+    context instead of the one they are called with, so that their values don't depend on the
+    caller (see :class:`aria.presentation.PresentationRegistry`).
+    
+    Methods with no arguments, or with only a :code:`context` argument, use a fast path that does
+    not build a key from the arguments. Other methods are keyed by all their arguments, which must
+    be hashable.
     
-    Supports :code:`cache_info` to be compatible with Python 3's :code:`functools.lru_cache`. Note that the statistics
-    are combined for all instances of the class.
+    Use :code:`@cachedmethod(max_size=100)` to keep at most that many entries (per instance or
+    context), evicting the least recently used ones. Hits then take a lock.
+    
+    Supports :code:`cache_info` to be compatible with Python 3's :code:`functools.lru_cache`. Note
+    that the statistics are combined for all instances of the class, and are only collected when
+    enabled with :meth:`enable_stats` (they are off by default, because counting requires a lock).
     
     Won't use the cache if not called when bound to an object, allowing you to override the cache.
     
     Adapted from `this solution <http://code.activestate.com/recipes/577452-a-memoize-decorator-for-instance-methods/>`__.
     """
     
-    def __init__(self, fn):
+    def __new__(cls, fn=None, max_size=None):
+        if fn is None:
+            # Used as @cachedmethod(max_size=...)
+            return partial(cls, max_size=max_size)
+        if cls is cachedmethod:
+            # Choose the fast path according to the method's arguments
+            args = _get_args(fn)
+            if max_size is not None:
+                cls = _BoundedCachedMethod
+            elif args == ['self']:
+                cls = _NoArgsCachedMethod
+            elif args == ['self', 'context']:
+                cls = _ContextCachedMethod
+            elif (args is not None) and (len(args) > 2) and (args[1] == 'context'):
+                cls = _ContextArgsCachedMethod
+        return super(cachedmethod, cls).__new__(cls)
+    
+    def __init__(self, fn, max_size=None):
         self.fn = fn
+        self.max_size = max_size
         self.hits = 0
         self.misses = 0
         self.lock = Lock()
+        args = inspect.getargspec(fn).args if inspect.isfunction(fn) else None
+        self.context_scoped = (args is not None) and (len(args) > 1) and (args[1] == 'context')
+
+    @staticmethod
+    def enable_stats(enabled=True):
+        """
+        Switches collecting statistics for all cached methods on or off.
+        """
+        
+        global _collect_stats
+        _collect_stats = enabled
 
     def cache_info(self):
         with self.lock:
-            return (self.hits, self.misses, None, self.misses)
+            return (self.hits, self.misses, self.max_size, self.misses)
     
     def reset_cache_info(self):
         with self.lock:
@@ -53,36 +114,237 @@ class cachedmethod(object):
         if instance is None:
             # Don't use cache if not bound to an object
             return self.fn
-        return partial(self, instance)
+        return MethodType(self, instance, owner)
     
-    def __call__(self, *args, **kwargs):
-        instance = args[0]
-        
-        try:
-            cache = instance._method_cache
-        except AttributeError:
-            instance._method_cache = {}
-            # Note: Another thread may override it here, so we need to read it again
-            # to make sure all threads are using the same cache
-            cache = instance._method_cache
-            
-        key = (self.fn, args[1:], frozenset(kwargs.items()))
-        
+    def __call__(self, instance, *args, **kwargs):
+        cache, key = self._get_cache_and_key(instance, args, kwargs)
         try:
-            with self.lock:
-                r = cache[key]
-                self.hits += 1
+            r = cache[key]
         except KeyError:
-            r = self.fn(*args, **kwargs)
+            return self._store(cache, key, self.fn(instance, *args, **kwargs))
+        if _collect_stats:
+            self._count_hit()
+        return r
+
+    def _get_cache_and_key(self, instance, args, kwargs):
+        if self.context_scoped:
+            cache = _get_method_cache(args[0] if args else kwargs.get('context'))
+            if cache is not None:
+                # The context is not part of the key
+                if args:
+                    args = args[1:]
+                else:
+                    kwargs = kwargs.copy()
+                    del kwargs['context']
+                return cache, _make_key((self, instance), args, kwargs)
+        return _get_method_cache(instance), _make_key((self,), args, kwargs)
+
+    def _store(self, cache, key, r):
+        # Another thread may have stored an entry in the meantime, in which case we use it, so that
+        # all threads use the same return value
+        r = cache.setdefault(key, r)
+        if _collect_stats:
             with self.lock:
-                cache[key] = r
                 self.misses += 1
-            # Another thread may override our cache entry here, so we need to read
-            # it again to make sure all threads use the same return value
-            r = cache.get(key, r)
-            
         return r
 
+    def _count_hit(self):
+        with self.lock:
+            self.hits += 1
+
+class _NoArgsCachedMethod(cachedmethod):
+    """
+    :class:`cachedmethod` for methods with no arguments. The key is the :class:`cachedmethod`
+    itself.
+    """
+    
+    def __call__(self, instance):
+        try:
+            r = instance._method_cache[self]
+        except (KeyError, AttributeError):
+            return self._store(_get_method_cache(instance), self, self.fn(instance))
+        if _collect_stats:
+            self._count_hit()
+        return r
+
+class _ContextCachedMethod(cachedmethod):
+    """
+    :class:`cachedmethod` for methods with only a :code:`context` argument. The key in the
+    context is the :class:`cachedmethod` and the instance.
+    """
+    
+    def __call__(self, instance, context):
+        try:
+            r = context._method_cache[(self, instance)]
+        except (KeyError, AttributeError):
+            method_context = getattr(instance, '_method_context', None)
+            if (method_context is None) or (method_context is context):
+                return cachedmethod.__call__(self, instance, context)
+            # The instance is shared between contexts: the value is the one for its own context,
+            # which we also keep in the caller's context, so that the next call is a hit
+            r = cachedmethod.__call__(self, instance, method_context)
+            cache = _get_method_cache(context)
+            return cache.setdefault((self, instance), r) if cache is not None else r
+        if _collect_stats:
+            self._count_hit()
+        return r
+
+class _ContextArgsCachedMethod(cachedmethod):
+    """
+    :class:`cachedmethod` for methods with a :code:`context` argument followed by other arguments,
+    when called with positional arguments only.
+    """
+    
+    def __call__(self, instance, context=_MISSING, *args, **kwargs):
+        if kwargs or (context is _MISSING):
+            if context is not _MISSING:
+                args = (context,) + args
+            return cachedmethod.__call__(self, instance, *args, **kwargs)
+        try:
+            r = context._method_cache[(self, instance, args) if args else (self, instance)]
+        except (KeyError, AttributeError):
+            return cachedmethod.__call__(self, instance, context, *args)
+        if _collect_stats:
+            self._count_hit()
+        return r
+
+class _BoundedCachedMethod(cachedmethod):
+    """
+    :class:`cachedmethod` with a :class:`LRUCache` per instance or context.
+    """
+    
+    def __call__(self, instance, *args, **kwargs):
+        cache, key = self._get_cache_and_key(instance, args, kwargs)
+        lru = cache.get(self)
+        if lru is None:
+            lru = cache.setdefault(self, LRUCache(self.max_size))
+        r = lru.get(key, _MISSING)
+        if r is _MISSING:
+            return self._store(lru, key, self.fn(instance, *args, **kwargs))
+        if _collect_stats:
+            self._count_hit()
+        return r
+
+class LRUCache(object):
+    """
+    A thread-safe in-memory cache that keeps at most :code:`max_size` entries, evicting the least
+    recently used ones.
+    """
+    
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                return default
+            self._entries[key] = value
+            return value
+    
+    def setdefault(self, key, value):
+        """
+        Stores the value unless there is already an entry for the key, and returns the entry.
+        """
+        
+        with self._lock:
+            try:
+                return self._entries[key]
+            except KeyError:
+                pass
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return value
+    
+    def items(self):
+        with self._lock:
+            return self._entries.items()
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+def clear_method_cache(holder):
+    """
+    Drops all the :class:`cachedmethod` entries held by an instance or a context.
+    """
+    
+    holder.__dict__.pop('_method_cache', None)
+
+def get_method_cache_size(root, context=None):
+    """
+    The number of :class:`cachedmethod` entries held for an object and for all the objects that are
+    reachable through their cached values (for a presenter, these are all the presentations that
+    have been created), and their approximate size in bytes.
+    
+    The size includes the caches, the keys, and the cached values themselves (but not what the
+    values refer to, unless they are themselves reachable objects with cached methods). Entries
+    held by the context are included if it is provided.
+    
+    :rtype: (int, int)
+    """
+    
+    # The entries held by the context, per instance
+    context_entries = {}
+    context_entry_size = 0
+    context_cache = getattr(context, '_method_cache', None) if context is not None else None
+    if context_cache:
+        for key, value in context_cache.items():
+            entries = value.items() if isinstance(value, LRUCache) else ((key, value),)
+            for key, value in entries:
+                context_entries.setdefault(id(key[1]), []).append((key, value))
+        context_entry_size = sys.getsizeof(context_cache) // len(context_cache)
+    
+    count = 0
+    size = 0
+    visited = set()
+    objects = [root]
+    while objects:
+        o = objects.pop()
+        if id(o) in visited:
+            continue
+        visited.add(id(o))
+        
+        entries = []
+        cache = o.__dict__.get('_method_cache') if hasattr(o, '__dict__') else None
+        if cache:
+            size += sys.getsizeof(cache)
+            for key, value in cache.items():
+                if isinstance(value, LRUCache):
+                    size += sys.getsizeof(value._entries)
+                    entries.extend(value.items())
+                else:
+                    entries.append((key, value))
+        for entry in context_entries.get(id(o), ()):
+            size += context_entry_size
+            entries.append(entry)
+        
+        for key, value in entries:
+            count += 1
+            if isinstance(key, tuple):
+                size += sys.getsizeof(key) + sum(sys.getsizeof(k) for k in key if isinstance(k, (tuple, frozenset)))
+            values = [value]
+            while values:
+                value = values.pop()
+                if (value is None) or (id(value) in visited):
+                    continue
+                if isinstance(value, (list, tuple, dict)):
+                    visited.add(id(value))
+                    size += sys.getsizeof(value)
+                    values.extend(value.itervalues() if isinstance(value, dict) else value)
+                elif isinstance(value, HasCachedMethods):
+                    size += sys.getsizeof(value) + sys.getsizeof(value.__dict__)
+                    objects.append(value)
+    
+    return count, size
+
 class HasCachedMethods(object):
     """
     Provides convenience methods for working with :class:`cachedmethod`.
@@ -105,9 +367,21 @@ class HasCachedMethods(object):
                 r[k] = p.cache_info()
         return r
 
+    def _get_method_cache_size(self, context=None):
+        """
+        The number of cached entries for us and for all the objects that are reachable through our
+        cached values, and their approximate size in bytes. See :func:`get_method_cache_size`.
+        
+        :rtype: (int, int)
+        """
+        
+        return get_method_cache_size(self, context)
+
     def _reset_method_cache(self):
         """
         Resets the caches of all cached methods.
+        
+        Entries held by contexts are not reset (see :func:`clear_method_cache`).
         """
         
         if hasattr(self, '_method_cache'):
@@ -123,3 +397,174 @@ class HasCachedMethods(object):
                 p = p.fget
             if hasattr(p, 'reset_cache_info'):
                 p.reset_cache_info()
+
+def _get_args(fn):
+    # The argument names, or None if the function has varargs or keywords (or is not a function)
+    if not inspect.isfunction(fn):
+        return None
+    argspec = inspect.getargspec(fn)
+    if (argspec.varargs is not None) or (argspec.keywords is not None):
+        return None
+    return argspec.args
+
+def _make_key(key, args, kwargs):
+    if args:
+        key += (args,)
+    if kwargs:
+        key += (frozenset(kwargs.iteritems()),)
+    return key
+
+def _get_method_cache(holder):
+    # Returns None if the holder can't hold a cache
+    try:
+        return holder._method_cache
+    except AttributeError:
+        pass
+    try:
+        # Another thread may be creating it at the same time, so we make sure all threads use the
+        # same cache
+        return holder.__dict__.setdefault('_method_cache', {})
+    except AttributeError:
+        return None
+
+class LRUFileCache(object):
+    """
+    A persistent cache of byte strings, stored as one file per entry in a directory.
+    
+    Because entries are files, the cache can be shared between threads, processes and runs.
+    Writes are atomic, so a partial entry is never visible.
+    
+    When the total size of the entries exceeds :code:`max_size`, the least recently used entries
+    are evicted. A hit updates the entry's modification time, which is what we use for LRU order.
+    
+    Supports :code:`cache_info` to be compatible with Python 3's :code:`functools.lru_cache`.
+    """
+    
+    def __init__(self, path, max_size=100 * 1024 * 1024, suffix='.cache'):
+        """
+        :param path: Cache directory (will be created if it does not exist)
+        :param max_size: Maximum total size of entries in bytes
+        :param suffix: Filename suffix for entries (keys must be valid filenames)
+        """
+        
+        self.path = path
+        self.max_size = max_size
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = Lock()
+
+        if not os.path.isdir(path):
+            try:
+                os.makedirs(path)
+            except OSError:
+                # Another process might have created it
+                if not os.path.isdir(path):
+                    raise
+    
+    def get(self, key):
+        """
+        Returns the cached value, or None if it's not in the cache.
+        """
+        
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+        except (IOError, OSError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            # Touch for LRU
+            os.utime(path, None)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+    
+    def set(self, key, value):
+        """
+        Stores the value. Failure to write to the cache is silently ignored.
+        """
+        
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.rename(temp_path, self._get_path(key))
+        except Exception:
+            if temp_path is not None:
+                self._remove(temp_path)
+            return
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(value)
+                evict = self._size > self.max_size
+            else:
+                evict = True
+        if evict:
+            self.evict()
+    
+    def delete(self, key):
+        self._remove(self._get_path(key))
+    
+    def evict(self):
+        """
+        Removes least recently used entries until the total size is within :code:`max_size`.
+        """
+
+        entries = []
+        size = 0
+        for name in os.listdir(self.path):
+            if name.endswith(self.suffix):
+                path = os.path.join(self.path, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                size += stat.st_size
+
+        if size > self.max_size:
+            entries.sort()
+            for _, entry_size, path in entries:
+                if self._remove(path):
+                    size -= entry_size
+                if size <= self.max_size:
+                    break
+
+        with self._lock:
+            self._size = size
+
+    def clear(self):
+        """
+        Removes all entries and resets the statistics.
+        """
+
+        for name in os.listdir(self.path):
+            if name.endswith(self.suffix):
+                self._remove(os.path.join(self.path, name))
+        with self._lock:
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def cache_info(self):
+        with self._lock:
+            return (self.hits, self.misses, self.max_size, self._size)
+
+    def _get_path(self, key):
+        return os.path.join(self.path, key + self.suffix)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
@@ -18,6 +18,7 @@ from __future__ import absolute_import # so we can import standard 'collections'
 
 from collections import OrderedDict
 from copy import deepcopy
+from ruamel.yaml.comments import CommentedMap, CommentedSeq # @UnresolvedImport
 
 class ReadOnlyList(list):
     """
@@ -246,10 +247,40 @@ def deepcopy_with_locators(value):
     copy_locators(r, value)
     return r
 
+def copy_with_locators(value):
+    """
+    Like :func:`deepcopy_with_locators`, but much cheaper: only dicts and lists (agnostic raw data
+    containers) are copied, recursively, while all other values are shared with the original.
+    
+    The copy is as safe to modify as a deep copy, at any depth and via any access path. Containers
+    of types that we don't know how to construct are deep copied.
+    """
+    
+    value_class = value.__class__
+    if value_class in _COPYABLE_DICTS:
+        r = value_class([(k, copy_with_locators(v)) for k, v in value.iteritems()])
+    elif value_class in _COPYABLE_LISTS:
+        r = value_class([copy_with_locators(v) for v in value])
+    elif isinstance(value, (dict, list)):
+        return deepcopy_with_locators(value)
+    else:
+        return value
+    locator = getattr(value, '_locator', None)
+    if locator is not None:
+        r._locator = locator
+    return r
+
+_COPYABLE_DICTS = frozenset((dict, OrderedDict, CommentedMap))
+_COPYABLE_LISTS = frozenset((list, CommentedSeq))
+
 def copy_locators(target, source):
     """
     Copies over :code:`_locator` for all elements, recursively.
     
+    Only containers are linked to locators, and the locators of values nested in a linked
+    container are found on demand (see :meth:`aria.reading.Locator.find`), so we do not descend
+    into containers whose locator we copied.
+    
     Assumes that target and source have exactly the same list/dict structure.
     """
 
@@ -257,6 +288,7 @@ def copy_locators(target, source):
     if locator is not None:
         try:
             setattr(target, '_locator', locator)
+            return
         except AttributeError:
             pass
 
@@ -170,9 +170,9 @@ def merge_raw_input_definition(context, the_raw_input, our_input, interface_name
     input_type2 = our_input.type
     if input_type1 != input_type2:
         if operation_name is not None:
-            context.validation.report('interface %s "%s" changes operation input "%s.%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, operation_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=input_type2._locator, level=Issue.BETWEEN_TYPES)
+            context.validation.report('interface %s "%s" changes operation input "%s.%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, operation_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=our_input._get_child_locator('type'), level=Issue.BETWEEN_TYPES)
         else:
-            context.validation.report('interface %s "%s" changes input "%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=input_type2._locator, level=Issue.BETWEEN_TYPES)
+            context.validation.report('interface %s "%s" changes input "%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=our_input._get_child_locator('type'), level=Issue.BETWEEN_TYPES)
 
     # Merge    
     merge(the_raw_input, our_input._raw)
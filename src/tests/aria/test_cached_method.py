@@ -0,0 +1,151 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.utils import cachedmethod, HasCachedMethods, clear_method_cache
+from threading import Thread
+import gc, weakref
+
+
+class Value(object):
+    pass
+
+
+class Presentation(HasCachedMethods):
+    def __init__(self):
+        self.calls = []
+    
+    @property
+    @cachedmethod
+    def name(self):
+        self.calls.append('name')
+        return None
+    
+    @cachedmethod
+    def _get_type(self, context):
+        self.calls.append(('type', context))
+        return Value()
+    
+    @cachedmethod
+    def _get_value(self, context, name, default=None):
+        self.calls.append(('value', name, default))
+        return Value()
+
+
+    @cachedmethod(max_size=2)
+    def _get_bounded(self, context, name):
+        self.calls.append(('bounded', name))
+        return Value()
+
+
+class Context(object):
+    pass
+
+
+class CachedMethodTest(TestCase):
+    def tearDown(self):
+        cachedmethod.enable_stats(False)
+        super(CachedMethodTest, self).tearDown()
+    
+    def test_cache(self):
+        presentation = Presentation()
+        self.assertIsNone(presentation.name)
+        self.assertIsNone(presentation.name)
+        self.assertIs(presentation._get_type(1), presentation._get_type(1))
+        self.assertIs(presentation._get_type(1), presentation._get_type(context=1))
+        self.assertIsNot(presentation._get_type(1), presentation._get_type(2))
+        self.assertIs(presentation._get_value(1, 'a'), presentation._get_value(1, 'a'))
+        self.assertIs(presentation._get_value(1, 'a', default=2), presentation._get_value(1, 'a', default=2))
+        self.assertIsNot(presentation._get_value(1, 'a'), presentation._get_value(1, 'a', default=2))
+        self.assertEqual(['name', ('type', 1), ('type', 2), ('value', 'a', None), ('value', 'a', 2)], presentation.calls)
+        
+        # Per instance
+        other = Presentation()
+        self.assertIsNot(presentation._get_type(1), other._get_type(1))
+        
+        # Not cached when not bound
+        self.assertIsNot(Presentation._get_type(presentation, 1), presentation._get_type(1))
+        
+        presentation._reset_method_cache()
+        presentation.name
+        self.assertEqual(['name', ('type', 1), ('type', 2), ('value', 'a', None), ('value', 'a', 2), ('type', 1), 'name'], presentation.calls)
+
+    def test_context_lifetime(self):
+        presentation = Presentation()
+        context = Context()
+        the_type = presentation._get_type(context)
+        self.assertIs(the_type, presentation._get_type(context))
+        self.assertIs(presentation._get_value(context, 'a'), presentation._get_value(context, 'a'))
+        presentation.name
+        self.assertEqual(2, len(context._method_cache))
+        self.assertEqual(3, presentation._get_method_cache_size(context)[0])
+        
+        # Held by the context, not the presentation
+        self.assertEqual(1, len(presentation._method_cache))
+        context_ref = weakref.ref(context)
+        type_ref = weakref.ref(the_type)
+        del context, the_type, presentation.calls[:]
+        gc.collect()
+        self.assertIsNone(context_ref())
+        self.assertIsNone(type_ref())
+        
+        context = Context()
+        presentation._get_type(context)
+        clear_method_cache(context)
+        presentation._get_type(context)
+        self.assertEqual(2, len(presentation.calls))
+    
+    def test_bounded(self):
+        presentation = Presentation()
+        context = Context()
+        for name in ('a', 'b', 'a', 'c', 'a', 'b'):
+            presentation._get_bounded(context, name)
+        # 'b' was evicted when 'c' was added
+        self.assertEqual([('bounded', 'a'), ('bounded', 'b'), ('bounded', 'c'), ('bounded', 'b')], presentation.calls)
+        self.assertEqual(2, presentation._get_method_cache_size(context)[0])
+    
+    def test_stats(self):
+        presentation = Presentation()
+        presentation._reset_method_cache()
+        presentation._get_type(1)
+        presentation._get_type(1)
+        self.assertEqual((0, 0, None, 0), presentation._method_cache_info['_get_type'])
+        
+        cachedmethod.enable_stats()
+        presentation.name
+        presentation.name
+        presentation._get_type(1)
+        presentation._get_value(1, 'a')
+        presentation._get_value(1, 'a')
+        presentation._get_value(1, 'b')
+        info = presentation._method_cache_info
+        self.assertEqual((1, 1, None, 1), info['name'])
+        self.assertEqual((1, 0, None, 0), info['_get_type'])
+        self.assertEqual((1, 2, None, 2), info['_get_value'])
+
+    def test_threads(self):
+        presentations = [Presentation() for _ in range(20)]
+        results = []
+        def get_types():
+            results.append([p._get_type(1) for p in presentations])
+        threads = [Thread(target=get_types) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for result in results:
+            self.assertEqual(results[0], result)
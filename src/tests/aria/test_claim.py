@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Thread, Event
+import os.path
+
+from testtools import TestCase
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read
+from aria.loading import LoadingContext, UriLocation, DocumentNotFoundError
+from aria.reading import ReadingContext, AlreadyReadError
+
+ROOT = '''tosca_definitions_version: tosca_simple_yaml_1_0
+imports: %s
+'''
+
+
+class ClaimTest(TestCase):
+    def setUp(self):
+        super(ClaimTest, self).setUp()
+        install_aria_extensions()
+        directory = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, directory, True)
+        self.directory = directory
+        self.loading_context = LoadingContext()
+        self.reading_context = ReadingContext()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def get_reader(self, uri):
+        location = UriLocation(uri)
+        loader = self.loading_context.loader_source.get_loader(self.loading_context, location, None)
+        return self.reading_context.reader_source.get_reader(self.reading_context, location, loader)
+
+    def test_claim(self):
+        path = self.write('types.yaml', 'node_types: {}\n')
+        reader = self.get_reader(path)
+        self.assertTrue(reader.claim())
+        self.assertTrue(reader.claim())
+        self.assertEqual(path, reader.canonical_location)
+
+        other_reader = self.get_reader(path)
+        self.assertFalse(other_reader.claim())
+        self.assertRaises(AlreadyReadError, other_reader.read)
+
+        reader.release()
+        self.assertTrue(other_reader.claim())
+        self.assertFalse(reader.claim())
+
+    def test_spellings(self):
+        path = self.write('types.yaml', 'node_types: {}\n')
+        self.assertTrue(self.get_reader(path).claim())
+        for uri in (os.path.join(self.directory, '.', 'types.yaml'),
+                    os.path.join(self.directory, '..', os.path.basename(self.directory), 'types.yaml'),
+                    'file://' + path):
+            self.assertFalse(self.get_reader(uri).claim(), uri)
+
+    def test_spellings_imported_once(self):
+        types = self.write('types.yaml', 'node_types: {}\n')
+        os.mkdir(os.path.join(self.directory, 'sub'))
+        blueprint = self.write('blueprint.yaml', ROOT % repr(['types.yaml', './types.yaml', 'sub/../types.yaml', types, 'file://' + types]))
+        context = ConsumptionContext()
+        context.presentation.location = UriLocation(blueprint)
+        Read(context).consume()
+        self.assertEqual([], context.validation.issues)
+        import_graph = context.presentation.import_graph
+        self.assertEqual(set([blueprint, types]), import_graph.nodes)
+        self.assertEqual(4, import_graph.duplicates)
+
+    def test_failed_read_releases(self):
+        path = self.write('types.yaml', 'node_types: {}\n')
+        reader = self.get_reader(path)
+        self.assertTrue(reader.claim())
+        os.remove(path)
+        self.assertRaises(DocumentNotFoundError, reader.read)
+        self.assertFalse(reader.claimed)
+        self.assertEqual(set(), self.reading_context.locations)
+
+        # Another reader can read it when it exists again
+        self.write('types.yaml', 'node_types: {}\n')
+        self.assertEqual({'node_types': {}}, self.get_reader(path).read())
+
+    def test_concurrent_claims(self):
+        path = self.write('types.yaml', 'node_types: {}\n')
+        readers = [self.get_reader(path) for _ in range(20)]
+        start = Event()
+        results = []
+        def claim(reader):
+            start.wait()
+            results.append(reader.claim())
+        threads = [Thread(target=claim, args=(reader,)) for reader in readers]
+        for thread in threads:
+            thread.start()
+        start.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, results.count(True))
+        self.assertEqual(len(readers) - 1, results.count(False))
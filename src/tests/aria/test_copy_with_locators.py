@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from testtools import TestCase
+
+from aria.utils import copy_with_locators, merge
+from collections import OrderedDict
+from ruamel.yaml.comments import CommentedMap, CommentedSeq
+import json
+
+
+def make_raw():
+    raw = CommentedMap([
+        ('type', 'tosca.nodes.Compute'),
+        ('properties', CommentedMap([('port', 8080), ('tags', CommentedSeq(['a', 'b']))])),
+        ('requirements', CommentedSeq([CommentedMap([('host', OrderedDict([('node', 'server')]))])]))])
+    raw._locator = 'locator'
+    return raw
+
+
+class CopyWithLocatorsTest(TestCase):
+    def test_copy(self):
+        raw = make_raw()
+        r = copy_with_locators(raw)
+        self.assertEqual(raw, r)
+        self.assertEqual(json.dumps(raw), json.dumps(r))
+        self.assertEqual('locator', r._locator)
+        self.assertIs(CommentedMap, type(r))
+        self.assertIs(CommentedSeq, type(r['requirements']))
+        self.assertIs(OrderedDict, type(r['requirements'][0]['host']))
+        self.assertIsNot(raw['properties'], r['properties'])
+        self.assertIs(raw['type'], r['type'])
+        self.assertEqual('tosca.nodes.Compute', copy_with_locators('tosca.nodes.Compute'))
+
+    def test_nested_writes(self):
+        # Nested values can be modified via any access path, including those that read the dict
+        # directly in C
+        raw = make_raw()
+        expected = json.dumps(raw)
+        r = copy_with_locators(raw)
+        r['properties']['tags'].append('c')
+        r['requirements'][0]['host']['node'] = 'other'
+        merge(r, {'properties': {'port': 80}})
+        dict(r)['properties']['a'] = 1
+        d = {}
+        d.update(r)
+        d['properties']['b'] = 1
+        (lambda **kwargs: kwargs)(**r)['properties']['c'] = 1
+        dict(r.items())['properties']['d'] = 1
+        r.values()[1]['e'] = 1
+        for k, v in r.iteritems():
+            if isinstance(v, dict):
+                v['f'] = 1
+        self.assertEqual(expected, json.dumps(raw))
+        self.assertEqual(['a', 'b', 'c'], list(r['properties']['tags']))
+        self.assertEqual(80, r['properties']['port'])
+        for key in 'abcdef':
+            self.assertEqual(1, r['properties'][key])
+        
+        # Copies of copies
+        other = copy_with_locators(r)
+        dict(other)['properties']['port'] = 443
+        self.assertEqual(80, r['properties']['port'])
+        self.assertEqual(expected, json.dumps(raw))
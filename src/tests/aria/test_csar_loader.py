@@ -0,0 +1,102 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from shutil import rmtree
+from tempfile import mkdtemp
+import os.path
+import zipfile
+
+from testtools import TestCase
+
+from aria.loading import (LoadingContext, UriLocation, CsarTextLoader, CSAR_ARCHIVES,
+                          DocumentNotFoundError, parse_csar_uri)
+from aria.utils import FixedThreadPoolExecutor
+
+META = 'TOSCA-Meta-File-Version: 1.0\nCSAR-Version: 1.1\nEntry-Definitions: Definitions/main.yaml\n'
+MAIN = 'imports:\n  - types/types.yaml\n'
+TYPES = 'node_types: {}\n'
+
+
+class CsarLoaderTest(TestCase):
+    def setUp(self):
+        super(CsarLoaderTest, self).setUp()
+        directory = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, directory, True)
+        self.addCleanup(CSAR_ARCHIVES.clear)
+        self.path = os.path.join(directory, 'blueprint.csar')
+        with zipfile.ZipFile(self.path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('TOSCA-Metadata/TOSCA.meta', META)
+            archive.writestr('Definitions/main.yaml', MAIN)
+            archive.writestr('Definitions/types/types.yaml', TYPES)
+        self.context = LoadingContext()
+
+    def load(self, location, origin_location=None):
+        loader = self.context.loader_source.get_loader(self.context, location, origin_location)
+        loader.open()
+        try:
+            return loader.load()
+        finally:
+            loader.close()
+
+    def test_parse_uri(self):
+        self.assertEqual(('a.csar', None), parse_csar_uri('a.csar'))
+        self.assertEqual(('a.zip', 'b/c.yaml'), parse_csar_uri('a.zip!/b/c.yaml'))
+        self.assertEqual(None, parse_csar_uri('a.yaml'))
+
+    def test_entry_definitions(self):
+        location = UriLocation(self.path)
+        self.assertEqual(MAIN, self.load(location))
+        self.assertEqual(self.path + '!/Definitions/main.yaml', location.uri)
+
+    def test_relative_import(self):
+        origin_location = UriLocation(self.path)
+        self.load(origin_location)
+        location = UriLocation('types/types.yaml')
+        self.assertEqual(TYPES, self.load(location, origin_location))
+        self.assertEqual(self.path + '!/Definitions/types/types.yaml', location.uri)
+
+    def test_member_not_found(self):
+        loader = CsarTextLoader(UriLocation(self.path), self.path, 'Definitions/missing.yaml')
+        self.assertRaises(DocumentNotFoundError, loader.open)
+
+    def test_shared_handle(self):
+        executor = FixedThreadPoolExecutor(size=8)
+        try:
+            for _ in range(50):
+                executor.submit(self.load, UriLocation(self.path + '!/Definitions/types/types.yaml'))
+            executor.drain()
+        finally:
+            executor.close()
+        self.assertEqual([], executor.exceptions)
+        self.assertEqual([TYPES] * 50, executor.returns)
+        self.assertEqual(1, len(CSAR_ARCHIVES._archives))
+
+    def test_reopen(self):
+        loader = CsarTextLoader(UriLocation(self.path), self.path, 'Definitions/types/types.yaml')
+        archive = loader.archive
+        mtime = os.stat(self.path).st_mtime
+        os.utime(self.path, (mtime + 10, mtime + 10))
+        
+        # The previous archive is closed when it is replaced
+        new_archive = CSAR_ARCHIVES.get(self.path)
+        self.assertIsNot(archive, new_archive)
+        self.assertTrue(archive.closed)
+        self.assertFalse(new_archive.closed)
+        
+        # Loaders that still refer to it get the new one
+        loader.open()
+        self.assertEqual(TYPES, loader.load())
+        self.assertIs(new_archive, loader.archive)
@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from shutil import rmtree
+from tempfile import mkdtemp
+import os.path, time
+
+from testtools import TestCase
+
+from aria.loading import DirectoryIndex
+
+
+class DirectoryIndexTest(TestCase):
+    def setUp(self):
+        super(DirectoryIndexTest, self).setUp()
+        directory = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, directory, True)
+        self.directory = directory
+        self.index = DirectoryIndex()
+
+    def add(self, name, mtime=None):
+        """
+        Adds a file, and optionally sets the directory's modification time afterwards.
+        """
+
+        path = os.path.join(self.directory, name)
+        open(path, 'w').close()
+        if mtime is not None:
+            os.utime(self.directory, (mtime, mtime))
+        return path
+
+    def test_find(self):
+        path = self.add('types.yaml', time.time() - 60)
+        self.assertEqual(path, self.index.find('types.yaml', [self.directory]))
+        self.assertEqual(path, self.index.find(path))
+        self.assertIsNone(self.index.find('other.yaml', [self.directory]))
+        self.assertIsNone(self.index.find('types.yaml', [os.path.join(self.directory, 'missing')]))
+
+    def test_case_sensitive(self):
+        path = self.add('Types.yaml', time.time() - 60)
+        self.assertTrue(self.index.exists(path))
+        self.assertFalse(self.index.exists(os.path.join(self.directory, 'types.yaml')))
+        self.assertFalse(self.index.exists(os.path.join(self.directory, 'TYPES.YAML')))
+
+    def test_mtime_changed(self):
+        mtime = time.time() - 60
+        os.utime(self.directory, (mtime, mtime))
+        path = os.path.join(self.directory, 'types.yaml')
+        self.assertFalse(self.index.exists(path))
+        self.add('types.yaml', mtime + 1)
+        self.assertTrue(self.index.exists(path))
+
+    def test_mtime_unchanged(self):
+        # A change that does not change the modification time is not seen...
+        mtime = time.time() - 60
+        os.utime(self.directory, (mtime, mtime))
+        path = os.path.join(self.directory, 'types.yaml')
+        self.assertFalse(self.index.exists(path))
+        self.add('types.yaml', mtime)
+        self.assertFalse(self.index.exists(path))
+
+        # ...until the index is cleared
+        self.index.clear()
+        self.assertTrue(self.index.exists(path))
+
+    def test_mtime_granularity(self):
+        # The listing is taken within the modification time's granularity, so a file added
+        # afterwards is found even though the modification time did not change
+        mtime = time.time()
+        os.utime(self.directory, (mtime, mtime))
+        path = os.path.join(self.directory, 'types.yaml')
+        self.assertFalse(self.index.exists(path))
+        self.add('types.yaml', mtime)
+        self.assertTrue(self.index.exists(path))
@@ -0,0 +1,67 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import YamlReader, FastYamlReader, ReaderSyntaxError
+import aria.reading.yaml
+
+DOCUMENT = u'''tosca_definitions_version: tosca_simple_yaml_1_0
+description: |
+  Multi-line
+  description
+node_types:
+  MyType:
+    derived_from: tosca.nodes.Root
+    properties:
+      flag: { type: boolean, default: yes }
+      ports: [ 80, 443 ]
+'''
+
+
+class FastYamlReaderTest(TestCase):
+    def read(self, reader_class, data=DOCUMENT):
+        location = LiteralLocation(data)
+        return reader_class(None, location, LiteralLoader(location)).read()
+
+    def assertLocatorsEqual(self, expected, actual):
+        self.assertEqual((expected.line, expected.column), (actual.line, actual.column))
+        if isinstance(expected.children, dict):
+            self.assertEqual(sorted(expected.children.keys()), sorted(actual.children.keys()))
+            for key, child in expected.children.iteritems():
+                self.assertLocatorsEqual(child, actual.children[key])
+        elif isinstance(expected.children, list):
+            self.assertEqual(len(expected.children), len(actual.children))
+            for child1, child2 in zip(expected.children, actual.children):
+                self.assertLocatorsEqual(child1, child2)
+        else:
+            self.assertIsNone(actual.children)
+
+    def test_same_data(self):
+        expected = self.read(YamlReader)
+        actual = self.read(FastYamlReader)
+        self.assertEqual(expected, actual)
+        self.assertEqual(expected.keys(), actual.keys())
+        self.assertLocatorsEqual(expected._locator, actual._locator)
+
+    def test_syntax_error(self):
+        e = self.assertRaises(ReaderSyntaxError, self.read, FastYamlReader, u'a: [\n')
+        self.assertEqual(1, e.issue.line)
+
+    def test_fallback(self):
+        self.patch(aria.reading.yaml, 'FastYamlLoader', None)
+        self.assertEqual(self.read(YamlReader), self.read(FastYamlReader))
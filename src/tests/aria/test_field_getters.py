@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria import InvalidValueError
+from aria.presentation import Presentation, has_fields, short_form_field, primitive_field, primitive_list_field, object_dict_field, primitive_dict_unknown_fields
+from collections import OrderedDict
+
+
+@short_form_field('name')
+@has_fields
+class Item(Presentation):
+    @primitive_field(str, required=True)
+    def name(self):
+        pass
+
+    @primitive_field(int, default=1, allowed=(1, 2, 3))
+    def count(self):
+        pass
+
+
+@has_fields
+class Catalog(Presentation):
+    @primitive_list_field(int)
+    def numbers(self):
+        pass
+
+    @object_dict_field(Item)
+    def items(self):
+        pass
+
+    @primitive_dict_unknown_fields(str)
+    def extra(self):
+        pass
+
+
+class FieldGettersTest(TestCase):
+    def get(self, presentation, name):
+        # Both getters must agree
+        field = presentation.FIELDS[name]
+        expected = field._get_generic(presentation)
+        value = field._get(presentation)
+        self.assertEqual(type(expected), type(value))
+        if isinstance(value, dict):
+            self.assertEqual(expected.keys(), value.keys())
+        elif not isinstance(value, Presentation):
+            self.assertEqual(expected, value)
+        return getattr(presentation, name)
+
+    def test_getters(self):
+        catalog = Catalog(raw=OrderedDict((('numbers', [1, '2']), ('items', {'a': 'short', 'b': {'name': 'long', 'count': 3}}), ('unknown', 5))))
+        self.assertEqual([1, 2], list(self.get(catalog, 'numbers')))
+        self.assertEqual({'unknown': u'5'}, dict(self.get(catalog, 'extra')))
+        items = self.get(catalog, 'items')
+        self.assertEqual(u'short', self.get(items['a'], 'name'))
+        self.assertIsNone(self.get(items['a'], 'count'))
+        self.assertEqual(u'long', self.get(items['b'], 'name'))
+        self.assertEqual(3, self.get(items['b'], 'count'))
+
+    def test_errors(self):
+        item = Item(raw={'count': 2})
+        e = self.assertRaises(InvalidValueError, item.FIELDS['name']._get, item)
+        self.assertIn('required field "name"', str(e))
+        item = Item(raw={'name': 'a', 'count': 4})
+        e = self.assertRaises(InvalidValueError, item.FIELDS['count']._get, item)
+        self.assertIn('is not 1 or 2 or 3', str(e))
+        catalog = Catalog(raw={'numbers': ['x']})
+        e = self.assertRaises(InvalidValueError, catalog.FIELDS['numbers']._get, catalog)
+        self.assertIn('element 0 is \'x\'', str(e))
@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from shutil import rmtree
+from tempfile import mkdtemp
+import os.path
+
+from testtools import TestCase
+
+from aria.loading import LoadingContext, UriLocation, FileTextLoader, LoaderError, DocumentNotFoundError
+
+
+class FileTextLoaderTest(TestCase):
+    def setUp(self):
+        super(FileTextLoaderTest, self).setUp()
+        directory = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, directory, True)
+        self.directory = directory
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def load(self, path, method='load'):
+        loader = FileTextLoader(LoadingContext(), UriLocation(path), None)
+        loader.open()
+        try:
+            return getattr(loader, method)()
+        finally:
+            loader.close()
+
+    def assertLoads(self, expected, path):
+        text = self.load(path)
+        self.assertIsInstance(text, unicode)
+        self.assertEqual(expected, text)
+
+        # Both agree
+        data = self.load(path, 'load_bytes')
+        self.assertIsInstance(data, str)
+        self.assertEqual(text, data.decode('utf-8'))
+
+    def test_ascii(self):
+        self.assertLoads(u'name: value\n', self.write('ascii.yaml', 'name: value\n'))
+
+    def test_empty(self):
+        # Empty files cannot be memory-mapped
+        self.assertLoads(u'', self.write('empty.yaml', ''))
+
+    def test_utf8(self):
+        text = u'name: v\xe4lue\ndescription: \u540d\u524d \U0001f600\n'
+        self.assertLoads(text, self.write('utf8.yaml', text.encode('utf-8')))
+
+    def test_invalid_utf8(self):
+        self.assertRaises(LoaderError, self.load, self.write('latin1.yaml', u'name: v\xe4lue\n'.encode('latin-1')))
+
+    def test_missing(self):
+        loader = FileTextLoader(LoadingContext(), UriLocation(os.path.join(self.directory, 'missing.yaml')), None)
+        self.assertIsNone(loader.get_canonical_location())
+        self.assertRaises(DocumentNotFoundError, loader.open)
+
+    def test_removed_after_indexing(self):
+        path = self.write('removed.yaml', 'name: value\n')
+        loader = FileTextLoader(LoadingContext(), UriLocation(path), None)
+        self.assertEqual(path, loader.get_canonical_location())
+        os.remove(path)
+        self.assertRaises(DocumentNotFoundError, loader.open)
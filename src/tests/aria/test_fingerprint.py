@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.presentation import ImportGraph
+
+
+def create_graph(hashes, imports, root='a'):
+    graph = ImportGraph()
+    for node, content_hash in hashes.iteritems():
+        graph.add_node(node, content_hash, node == root)
+    for origin, nodes in imports:
+        for node in nodes:
+            graph.add_import(origin, node, False, 0.0)
+    return graph
+
+
+class FingerprintTest(TestCase):
+    def test_content_changes(self):
+        imports = (('a', ('b', 'c')), ('b', ('c',)))
+        fingerprint = create_graph({'a': '1', 'b': '2', 'c': '3'}, imports).get_fingerprint()
+        self.assertEqual(fingerprint, create_graph({'a': '1', 'b': '2', 'c': '3'}, imports).get_fingerprint())
+        self.assertNotEqual(fingerprint, create_graph({'a': '1', 'b': '2', 'c': '4'}, imports).get_fingerprint())
+
+    def test_location_independent(self):
+        graph1 = create_graph({'/x/a': '1', '/x/b': '2'}, (('/x/a', ('/x/b',)),), '/x/a')
+        graph2 = create_graph({'/y/a': '1', '/y/b': '2'}, (('/y/a', ('/y/b',)),), '/y/a')
+        self.assertEqual(graph1.get_fingerprint(), graph2.get_fingerprint())
+
+    def test_circular(self):
+        graph = create_graph({'a': '1', 'b': '2'}, (('a', ('b',)), ('b', ('a',))))
+        self.assertIsNotNone(graph.get_fingerprint())
+        self.assertNotEqual(graph.get_fingerprint('a'), graph.get_fingerprint('b'))
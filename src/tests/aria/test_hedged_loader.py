@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+from threading import Thread, Lock
+import time
+
+from testtools import TestCase
+
+from aria.loading import UriLocation, UriSession, UriTextLoader, UriLatencyStats, UriRepositories, LoaderError
+
+DOCUMENT = 'tosca_definitions_version: tosca_simple_yaml_1_0\n'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+
+        if self.path.startswith('/slow/'):
+            time.sleep(1)
+            self.send_document()
+        elif self.path.startswith('/fast/'):
+            self.send_document()
+        elif self.path.startswith('/broken/'):
+            self.send_response(500)
+            self.end_headers()
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def send_document(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/yaml')
+        self.send_header('Content-Length', str(len(DOCUMENT)))
+        self.end_headers()
+        self.wfile.write(DOCUMENT)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StandInHandler)
+        self.lock = Lock()
+        self.requests = []
+
+
+class HedgedLoaderTest(TestCase):
+    def setUp(self):
+        super(HedgedLoaderTest, self).setUp()
+        self.server = StandInServer()
+        thread = Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+        self.session = UriSession(cache_path=None, read_timeout=5, retries=0)
+        self.addCleanup(self.session.close)
+        self.stats = UriLatencyStats()
+        self.repositories = UriRepositories(stats=self.stats, hedge_delay=0.1)
+
+    def get_url(self, path):
+        return 'http://127.0.0.1:%d%s' % (self.server.server_address[1], path)
+
+    def load(self, path):
+        loader = UriTextLoader(UriLocation(self.get_url(path)), session=self.session, repositories=self.repositories)
+        loader.open()
+        try:
+            return loader.load()
+        finally:
+            loader.close()
+
+    def test_hedge(self):
+        self.repositories.add(self.get_url('/slow'), [self.get_url('/fast')])
+        start = time.time()
+        self.assertEqual(DOCUMENT, self.load('/slow/doc.yaml'))
+        self.assertLess(time.time() - start, 0.9)
+        self.assertIn('/fast/doc.yaml', self.server.requests)
+        self.assertIsNotNone(self.stats.get_latency(self.get_url('/fast/')))
+
+    def test_failover(self):
+        self.repositories.add(self.get_url('/broken'), [self.get_url('/missing'), self.get_url('/fast')])
+        self.assertEqual(DOCUMENT, self.load('/broken/doc.yaml'))
+        self.assertEqual(['/broken/doc.yaml', '/missing/doc.yaml', '/fast/doc.yaml'], self.server.requests)
+        requests, failures, _ = self.stats.get_info()[self.get_url('/broken/')]
+        self.assertEqual((1, 1), (requests, failures))
+
+    def test_all_failed(self):
+        self.repositories.add(self.get_url('/broken'), [self.get_url('/missing')])
+        self.assertRaises(LoaderError, self.load, '/broken/doc.yaml')
+
+    def test_candidates(self):
+        self.repositories.add('http://primary/repo', ['http://mirror1/repo/', 'http://mirror2/repo'])
+        self.assertIsNone(self.repositories.get_candidates('http://other/doc.yaml'))
+        self.assertEqual(['http://primary/repo/doc.yaml', 'http://mirror1/repo/doc.yaml', 'http://mirror2/repo/doc.yaml'],
+                         [uri for uri, _ in self.repositories.get_candidates('http://primary/repo/doc.yaml')])
+        self.stats.add('http://primary/repo/', 1.0)
+        self.stats.add('http://mirror2/repo/', 0.1)
+        self.stats.add_failure('http://mirror1/repo/')
+        self.assertEqual(['http://mirror2/repo/doc.yaml', 'http://primary/repo/doc.yaml', 'http://mirror1/repo/doc.yaml'],
+                         [uri for uri, _ in self.repositories.get_candidates('http://primary/repo/doc.yaml')])
@@ -0,0 +1,93 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from shutil import rmtree
+from tempfile import mkdtemp
+import os.path
+
+from testtools import TestCase
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read
+from aria.loading import UriLocation, LiteralLocation, LiteralLoader
+
+ROOT = '''tosca_definitions_version: tosca_simple_yaml_1_0
+imports: %s
+'''
+
+DOCUMENT = '''imports: %s
+'''
+
+
+class ImportGraphTest(TestCase):
+    def setUp(self):
+        super(ImportGraphTest, self).setUp()
+        install_aria_extensions()
+        directory = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, directory, True)
+        self.directory = directory
+
+    def write(self, name, imports, root=False):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write((ROOT if root else DOCUMENT) % repr(imports))
+        return path
+
+    def read(self, location):
+        context = ConsumptionContext()
+        context.presentation.location = location
+        Read(context).consume()
+        self.assertEqual([], context.validation.issues)
+        return context
+
+    def test_diamond(self):
+        a = self.write('a.yaml', ['b.yaml', 'c.yaml'], True)
+        b = self.write('b.yaml', ['d.yaml'])
+        c = self.write('c.yaml', ['d.yaml'])
+        d = self.write('d.yaml', [])
+        context = self.read(UriLocation(a))
+        import_graph = context.presentation.import_graph
+        self.assertEqual(a, import_graph.root)
+        self.assertEqual(set([a, b, c, d]), import_graph.nodes)
+        self.assertEqual(set([(a, b), (a, c), (b, d), (c, d)]), import_graph.edges)
+        self.assertEqual(1, import_graph.duplicates)
+        self.assertEqual(set([a, b, c, d]), context.reading.locations)
+
+    def test_cyclic(self):
+        a = self.write('a.yaml', ['b.yaml'], True)
+        b = self.write('b.yaml', ['a.yaml'])
+        context = self.read(UriLocation(a))
+        import_graph = context.presentation.import_graph
+        self.assertEqual(set([a, b]), import_graph.nodes)
+        self.assertEqual(set([(a, b), (b, a)]), import_graph.edges)
+        self.assertEqual(1, import_graph.duplicates)
+
+    def test_self(self):
+        a = self.write('a.yaml', ['a.yaml'], True)
+        import_graph = self.read(UriLocation(a)).presentation.import_graph
+        self.assertEqual(set([(a, a)]), import_graph.edges)
+        self.assertEqual(1, import_graph.duplicates)
+
+    def test_reader_override(self):
+        # The reader is used for all locations, so its imports are duplicates of itself
+        context = ConsumptionContext()
+        location = LiteralLocation(ROOT % repr(['a.yaml', 'b.yaml']))
+        context.reading.reader = context.reading.reader_source.get_reader(context.reading, location, LiteralLoader(location))
+        context.presentation.location = location
+        Read(context).consume()
+        self.assertEqual([], context.validation.issues)
+        self.assertEqual(2, context.presentation.import_graph.duplicates)
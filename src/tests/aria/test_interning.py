@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import ReadingContext, YamlReader, FastYamlReader, JsonReader, InternTable
+
+YAML = u'''node_types:
+  tosca.nodes.Compute:
+    description: Caf\xe9
+'''
+
+JSON = '''{ "node_types": { "tosca.nodes.Compute": { "description": "Caf\\u00e9" } } }'''
+
+
+class InterningTest(TestCase):
+    def read(self, reader_class, data, intern_strings=True):
+        context = ReadingContext()
+        context.intern_strings = intern_strings
+        location = LiteralLocation(data)
+        raw = reader_class(context, location, LiteralLoader(location)).read()
+        key = raw.keys()[0]
+        name = raw[key].keys()[0]
+        return key, name, raw[key][name]['description']
+
+    def test_readers(self):
+        for reader_class, data in ((YamlReader, YAML), (FastYamlReader, YAML), (JsonReader, JSON)):
+            key, name, description = self.read(reader_class, data)
+            self.assertIs('node_types', key)
+            self.assertIs(intern('tosca.nodes.Compute'), name)
+            self.assertEqual(u'Caf\xe9', description)
+            self.assertIs(description, self.read(reader_class, data)[2])
+
+    def test_disabled(self):
+        for reader_class, data in ((YamlReader, YAML), (FastYamlReader, YAML), (JsonReader, JSON)):
+            key, name, description = self.read(reader_class, data, False)
+            self.assertEqual('node_types', key)
+            self.assertIsNot(description, self.read(reader_class, data, False)[2])
+
+    def test_table(self):
+        table = InternTable(max_length=3, max_size=2)
+        self.assertIs(table.intern(u'ab'), table.intern(u''.join((u'a', u'b'))))
+        self.assertIsNot(table.intern('abcd'), table.intern(''.join(('abc', 'd'))))
+        table.intern(u'c')
+        table.intern(u'd') # clears the table
+        self.assertIsNot(u'ab', table.intern(u''.join((u'a', u'b'))))
@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from testtools import TestCase
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read, Validate
+from aria.loading import LiteralLocation
+
+BLUEPRINT = '''tosca_definitions_version: tosca_simple_yaml_1_0
+imports:
+  - tosca-simple-profile-1.0/tosca-simple-profile-1.0.yaml
+node_types:
+  MyType:
+    derived_from: tosca.nodes.Root
+    properties:
+      a:
+        type: %(type)s
+      b:
+        type: %(type)s
+topology_template:
+  node_templates:
+    node:
+      type: MyType
+      properties:
+        a: %(value)s
+        b: %(value)s
+'''
+
+
+INTERFACE_BLUEPRINT = '''tosca_definitions_version: tosca_simple_yaml_1_0
+imports:
+  - tosca-simple-profile-1.0/tosca-simple-profile-1.0.yaml
+node_types:
+  BaseType:
+    derived_from: tosca.nodes.Root
+    interfaces:
+      Standard:
+        create:
+          inputs:
+            x:
+              type: string
+  MyType:
+    derived_from: BaseType
+    interfaces:
+      Standard:
+        create:
+          inputs:
+            x:
+              type: integer
+'''
+
+DATA_TYPE_BLUEPRINT = '''tosca_definitions_version: tosca_simple_yaml_1_0
+imports:
+  - tosca-simple-profile-1.0/tosca-simple-profile-1.0.yaml
+data_types:
+  MyData:
+    properties:
+      p:
+        type: string
+node_types:
+  MyType:
+    derived_from: tosca.nodes.Root
+    properties:
+      a:
+        type: MyData
+      b:
+        type: MyData
+topology_template:
+  node_templates:
+    node:
+      type: MyType
+      properties:
+        a: 5
+        b:
+          p: hello
+          q: 6
+'''
+
+
+def get_issues(blueprint):
+    context = ConsumptionContext()
+    context.presentation.location = LiteralLocation(blueprint)
+    for consumer_class in (Read, Validate):
+        consumer_class(context).consume()
+    return context.validation.issues
+
+
+def get_issue_location(blueprint, message):
+    for issue in get_issues(blueprint):
+        if issue.message.startswith(message):
+            return (issue.line, issue.column)
+    return None
+
+
+def get_issue_lines(the_type, value):
+    lines = {}
+    for issue in get_issues(BLUEPRINT % {'type': the_type, 'value': value}):
+        for name in ('a', 'b'):
+            if issue.message.startswith('field "%s" is not a valid' % name):
+                lines[name] = (issue.line, issue.column)
+    return lines
+
+
+class IssueLocationTest(TestCase):
+    def setUp(self):
+        super(IssueLocationTest, self).setUp()
+        install_aria_extensions()
+
+    def test_equal_int_siblings(self):
+        # Small ints are cached, so the values of both properties are the same object
+        self.assertEqual({'a': (17, 9), 'b': (18, 9)}, get_issue_lines('list', 5))
+
+    def test_equal_string_siblings(self):
+        # Strings are interned by the readers, so the values of both properties are the same object
+        self.assertEqual({'a': (17, 9), 'b': (18, 9)}, get_issue_lines('integer', 'notanumber'))
+
+    def test_changed_operation_input_type(self):
+        self.assertEqual((20, 15), get_issue_location(INTERFACE_BLUEPRINT, 'interface definition "Standard" changes operation input "create.x" type'))
+
+    def test_data_type_value_not_a_dict(self):
+        self.assertEqual((22, 9), get_issue_location(DATA_TYPE_BLUEPRINT, 'value of type "MyData" is not a dict'))
+
+    def test_data_type_undefined_property(self):
+        self.assertEqual((25, 11), get_issue_location(DATA_TYPE_BLUEPRINT, 'assignment to undefined property "q"'))
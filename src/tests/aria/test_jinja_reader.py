@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.loading import LiteralLocation, LiteralLoader, UriLocation
+from aria.reading import ReadingContext, JinjaReader, JinjaTemplates, ReaderSyntaxError
+from aria.reading.jinja import JINJA_TEMPLATES
+from jinja2.bccache import BytecodeCache
+
+TEMPLATE = '''name: {{ name }}
+version: {{ ARIA_VERSION }}
+'''
+
+
+class MemoryBytecodeCache(BytecodeCache):
+    def __init__(self):
+        self.values = {}
+
+    def load_bytecode(self, bucket):
+        if bucket.key in self.values:
+            bucket.bytecode_from_string(self.values[bucket.key])
+
+    def dump_bytecode(self, bucket):
+        self.values[bucket.key] = bucket.bytecode_to_string()
+
+
+class JinjaReaderTest(TestCase):
+    def read(self, data, jinja_context=None, location=None):
+        context = ReadingContext()
+        context.jinja_context = jinja_context
+        if location is None:
+            location = LiteralLocation(data)
+        return JinjaReader(context, location, LiteralLoader(LiteralLocation(data))).read()
+
+    def test_context(self):
+        raw = self.read(TEMPLATE, {'name': 'first', 'ARIA_VERSION': '1'})
+        self.assertEqual({'name': 'first', 'version': 1}, dict(raw))
+        raw = self.read(TEMPLATE, {'name': 'second'})
+        self.assertEqual({'name': 'second', 'version': None}, dict(raw))
+
+    def test_forward_by_location(self):
+        raw = self.read('[ {{ value }} ]', {'value': 1}, UriLocation('/nowhere/list.json.jinja'))
+        self.assertEqual([1], list(raw))
+
+    def test_shared_template(self):
+        self.assertIs(JINJA_TEMPLATES.get(TEMPLATE), JINJA_TEMPLATES.get(unicode(TEMPLATE)))
+
+    def test_bytecode_cache(self):
+        bytecode_cache = MemoryBytecodeCache()
+        templates = JinjaTemplates(bytecode_cache=bytecode_cache)
+        template = templates.get(TEMPLATE)
+        self.assertEqual(1, len(bytecode_cache.values))
+
+        # A new cache in memory (as if in another process) does not recompile
+        templates = JinjaTemplates(bytecode_cache=bytecode_cache)
+        templates.environment.compile = None
+        self.assertIsNot(template, templates.get(TEMPLATE))
+        self.assertEqual(template.render(name='x'), templates.get(TEMPLATE).render(name='x'))
+
+    def test_syntax_error(self):
+        e = self.assertRaises(ReaderSyntaxError, self.read, 'a: 1\nb: {{ a b }}\n')
+        self.assertEqual(2, e.issue.line)
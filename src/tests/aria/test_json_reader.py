@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import YamlReader, JsonReader, ReaderSyntaxError
+import cPickle
+
+# Valid JSON is valid YAML, so we can compare with the YAML reader
+DOCUMENT = '''{
+  "tosca_definitions_version": "tosca_simple_yaml_1_0",
+  "description": "Caf\\u00e9",
+  "node_types": {
+    "MyType": {
+      "derived_from": "tosca.nodes.Root",
+      "properties": {
+        "flag": { "type": "boolean", "default": true },
+        "ports": [ 80, 443, [ 1.5, null ], {} ]
+      }
+    }
+  }
+}
+'''
+
+
+class JsonReaderTest(TestCase):
+    def read(self, reader_class, data=DOCUMENT):
+        location = LiteralLocation(data)
+        return reader_class(None, location, LiteralLoader(location)).read()
+
+    def assertLocatorsEqual(self, expected, actual):
+        self.assertEqual((expected.line, expected.column), (actual.line, actual.column))
+        if isinstance(expected.children, dict):
+            self.assertEqual(sorted(expected.children.keys()), sorted(actual.children.keys()))
+            for key, child in expected.children.iteritems():
+                self.assertLocatorsEqual(child, actual.children[key])
+        elif isinstance(expected.children, list):
+            self.assertEqual(len(expected.children), len(actual.children))
+            for child1, child2 in zip(expected.children, actual.children):
+                self.assertLocatorsEqual(child1, child2)
+        else:
+            self.assertIsNone(actual.children)
+
+    def test_same_as_yaml(self):
+        expected = self.read(YamlReader)
+        actual = self.read(JsonReader)
+        self.assertEqual(expected, actual)
+        self.assertEqual(repr(expected), repr(actual))
+        self.assertLocatorsEqual(expected._locator, actual._locator)
+
+    def test_locators(self):
+        locator = self.read(JsonReader)._locator
+        ports = locator.get_grandchild('node_types', 'MyType').children['properties'].children['ports']
+        self.assertEqual((9, 9), (ports.line, ports.column))
+        self.assertEqual((9, 36), (ports.children[2].children[1].line, ports.children[2].children[1].column))
+
+    def test_lazy(self):
+        locator = self.read(JsonReader)._locator
+        self.assertIn('text', locator.table.__dict__)
+        self.assertEqual(3, locator.get_child('description').line)
+        self.assertNotIn('text', locator.table.__dict__)
+
+    def test_pickle(self):
+        locator = cPickle.loads(cPickle.dumps(self.read(JsonReader)._locator, cPickle.HIGHEST_PROTOCOL))
+        self.assertEqual(3, locator.get_child('description').line)
+
+    def test_syntax_error(self):
+        e = self.assertRaises(ReaderSyntaxError, self.read, JsonReader, '{\n  "a": 1\n  "b": 2\n}')
+        self.assertEqual((3, 3), (e.issue.line, e.issue.column))
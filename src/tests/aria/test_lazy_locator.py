@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+import cPickle
+
+from testtools import TestCase
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import YamlReader
+
+DOCUMENT = u'''node_types:
+  MyType:
+    properties:
+      port:
+        type: integer
+      ports:
+        - 80
+        - 443
+base: &base
+  a: 1
+  b: 2
+merged:
+  <<: *base
+  b: 3
+'''
+
+
+class LazyLocatorTest(TestCase):
+    def read(self, data=DOCUMENT):
+        location = LiteralLocation(data)
+        return YamlReader(None, location, LiteralLoader(location)).read()
+
+    def test_lazy(self):
+        raw = self.read()
+        locator = raw._locator
+        self.assertEqual({}, locator.table._children)
+        port = locator.get_child('node_types').get_child('MyType').get_grandchild('properties', 'port')
+        self.assertEqual((4, 7), (port.line, port.column))
+        self.assertNotIn(port.index, locator.table._children)
+
+    def test_find(self):
+        raw = self.read()
+        locator = raw._locator
+        ports = raw['node_types']['MyType']['properties']['ports']
+        self.assertIsNone(locator.find(raw, ports))
+        properties = raw['node_types']['MyType']['properties']
+        found = locator.find(raw, properties)
+        self.assertEqual((3, 5), (found.line, found.column))
+        self.assertIs(found, properties._locator)
+        found = found.find(properties, ports)
+        self.assertEqual((6, 7), (found.line, found.column))
+        self.assertEqual(8, found.children[1].line)
+
+    def test_find_path(self):
+        raw = self.read()
+        locator = raw._locator
+        found = locator.find_path(('node_types', 'MyType', 'properties', 'ports', 1))
+        self.assertEqual((8, 11), (found.line, found.column))
+        self.assertIsNone(locator.find_path(('node_types', 'OtherType')))
+        
+        # Equal scalars may be the same object, so they are not found by identity if ambiguous
+        raw = self.read(u'a: 5\nb: 5\n')
+        self.assertIsNone(raw._locator.find(raw, raw['b']))
+        self.assertEqual(2, raw._locator.find_path(('b',)).line)
+
+    def test_merge_keys(self):
+        raw = self.read()
+        self.assertEqual({'a': 1, 'b': 3}, dict(raw['merged'].iteritems()))
+        self.assertEqual(10, raw._locator.get_grandchild('merged', 'a').line)
+        self.assertEqual(14, raw._locator.get_grandchild('merged', 'b').line)
+
+    def test_pickle(self):
+        locator = self.read()._locator
+        locator = cPickle.loads(cPickle.dumps(locator, cPickle.HIGHEST_PROTOCOL))
+        self.assertEqual(8, locator.get_child('node_types').get_child('MyType').get_grandchild('properties', 'ports').children[1].line)
@@ -0,0 +1,112 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from shutil import rmtree
+from tempfile import mkdtemp
+import os.path
+
+from testtools import TestCase
+
+from aria.loading import LoadingContext, UriLocation
+from aria.reading import ReadingContext, ReadCache, ReaderError, ContentMismatchError, Lockfile, get_content_hash
+from aria.tools.utils import CommonArgumentParser, create_context_from_namespace
+
+DOCUMENT = 'node_types: {}\n'
+
+
+class LockfileTest(TestCase):
+    def setUp(self):
+        super(LockfileTest, self).setUp()
+        directory = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, directory, True)
+        self.directory = directory
+        self.blueprint = os.path.join(directory, 'blueprint.yaml')
+        self.document = os.path.join(directory, 'types.yaml')
+        with open(self.document, 'w') as f:
+            f.write(DOCUMENT)
+
+        lockfile = Lockfile(self.blueprint + '.lock', refresh=True)
+        lockfile.add_import(self.blueprint, 'types.yaml', self.document)
+        lockfile.add_document(self.document, get_content_hash(DOCUMENT), len(DOCUMENT))
+        lockfile.save()
+        self.lockfile = Lockfile(self.blueprint + '.lock')
+        self.lockfile.load()
+
+    def test_get(self):
+        self.assertEqual((self.document, get_content_hash(DOCUMENT)),
+                         self.lockfile.get(self.blueprint, 'types.yaml'))
+        self.assertIsNone(self.lockfile.get(self.blueprint, 'other.yaml'))
+
+    def test_stale_size(self):
+        with open(self.document, 'a') as f:
+            f.write('# edited\n')
+        self.assertIsNone(self.lockfile.get(self.blueprint, 'types.yaml'))
+        self.assertEqual(set([self.document]), self.lockfile.stale)
+
+    def test_refresh_ignores_entries(self):
+        lockfile = Lockfile(self.blueprint + '.lock', refresh=True)
+        lockfile.load()
+        self.assertIsNone(lockfile.get(self.blueprint, 'types.yaml'))
+
+    def test_stale_content_with_read_cache(self):
+        loading_context = LoadingContext()
+        cache = ReadCache(os.path.join(self.directory, 'cache'))
+        def read():
+            reading_context = ReadingContext()
+            reading_context.cache = cache
+            location = UriLocation(self.document)
+            loader = loading_context.loader_source.get_loader(loading_context, location, None)
+            reader = reading_context.reader_source.get_reader(reading_context, location, loader)
+            reader.expected_content_hash = get_content_hash(DOCUMENT)
+            return reader.read()
+        self.assertEqual({'node_types': {}}, read())
+        
+        # An edit that doesn't change the size is not trusted, even though the cache has an entry
+        # for the locked content hash
+        with open(self.document, 'w') as f:
+            f.write(DOCUMENT.replace('types', 'typeX'))
+        self.assertIsNotNone(self.lockfile.get(self.blueprint, 'types.yaml'))
+        self.assertRaises(ContentMismatchError, read)
+
+    def test_different_version(self):
+        with open(self.blueprint + '.lock', 'w') as f:
+            f.write('{"version": "other", "imports": {}, "documents": {}}\n')
+        self.assertRaises(ReaderError, Lockfile(self.blueprint + '.lock').load)
+
+    def test_invalid(self):
+        with open(self.blueprint + '.lock', 'w') as f:
+            f.write('{"version":')
+        self.assertRaises(ReaderError, Lockfile(self.blueprint + '.lock').load)
+
+    def create_context(self, *args):
+        namespace, _ = CommonArgumentParser('test').parse_known_args(list(args))
+        return create_context_from_namespace(namespace, uri=self.blueprint)
+
+    def test_opt_in(self):
+        self.assertIsNone(self.create_context().reading.lockfile)
+
+        lockfile = self.create_context('--locked').reading.lockfile
+        self.assertFalse(lockfile.refresh)
+        self.assertEqual((self.document, get_content_hash(DOCUMENT)), lockfile.get(self.blueprint, 'types.yaml'))
+
+        lockfile = self.create_context('--lock').reading.lockfile
+        self.assertTrue(lockfile.refresh)
+        self.assertIsNone(lockfile.get(self.blueprint, 'types.yaml'))
+
+    def test_different_version_ignored(self):
+        with open(self.blueprint + '.lock', 'w') as f:
+            f.write('{"version": "other", "imports": {}, "documents": {}}\n')
+        self.assertIsNone(self.create_context('--locked').reading.lockfile)
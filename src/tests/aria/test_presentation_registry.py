@@ -0,0 +1,127 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read, Validate, Template
+from aria.loading import LiteralLocation
+from aria.presentation import PresentationRegistry, PRESENTATION_REGISTRY
+from aria.utils import json_dumps
+from threading import Thread
+
+BLUEPRINT = '''
+tosca_definitions_version: tosca_simple_yaml_1_0
+imports:
+  - tosca-simple-profile-1.0/tosca-simple-profile-1.0.yaml
+node_types:
+  Server:
+    derived_from: tosca.nodes.Compute
+    properties:
+      %s:
+        type: string
+        default: value
+topology_template:
+  node_templates:
+    server:
+      type: Server
+'''
+
+
+def parse(registry, property_name='name'):
+    context = ConsumptionContext()
+    context.presentation.location = LiteralLocation(BLUEPRINT % property_name)
+    context.presentation.registry = registry
+    for consumer_class in (Read, Validate, Template):
+        consumer_class(context).consume()
+    return context
+
+
+class PresentationRegistryTest(TestCase):
+    def setUp(self):
+        super(PresentationRegistryTest, self).setUp()
+        install_aria_extensions()
+        self.registry = PresentationRegistry()
+        self.registry.profile_paths = list(PRESENTATION_REGISTRY.profile_paths)
+
+    def tearDown(self):
+        self.registry.clear()
+        super(PresentationRegistryTest, self).tearDown()
+
+    def assertParsed(self, context, property_name='name'):
+        self.assertEqual([], [str(issue) for issue in context.validation.issues])
+        node_template = context.deployment.template.node_templates['server']
+        self.assertEqual('Server', node_template.type_name)
+        self.assertIn(property_name, node_template.properties)
+        self.assertIn('tosca.nodes.Compute', context.presentation.presenter.node_types)
+
+    def test_shared(self):
+        context1 = parse(self.registry)
+        context2 = parse(self.registry, 'other')
+        self.assertParsed(context1)
+        self.assertParsed(context2, 'other')
+        node_types1 = context1.presentation.presenter.node_types
+        node_types2 = context2.presentation.presenter.node_types
+        self.assertIs(node_types1['tosca.nodes.Compute'], node_types2['tosca.nodes.Compute'])
+        self.assertIsNot(node_types1['Server'], node_types2['Server'])
+        
+        # The shared type is resolved in its own context
+        compute = node_types1['tosca.nodes.Compute']
+        self.assertIs(compute._get_properties(context1), compute._get_properties(context2))
+        self.assertIs(node_types1['tosca.nodes.Root'], compute._get_parent(context2))
+        self.assertIs(compute, node_types2['Server']._get_parent(context2))
+
+    def test_not_shared(self):
+        context1 = parse(None)
+        context2 = parse(PresentationRegistry()) # without profile paths
+        self.assertParsed(context1)
+        self.assertParsed(context2)
+        compute1 = context1.presentation.presenter.node_types['tosca.nodes.Compute']
+        compute2 = context2.presentation.presenter.node_types['tosca.nodes.Compute']
+        self.assertIsNot(compute1, compute2)
+        self.assertIsNone(getattr(compute2, '_method_context', None))
+
+    def test_read_only(self):
+        context = parse(self.registry)
+        shared_presenter, _ = self.registry.share(ConsumptionContext(), context.presentation.presenter.__class__, context.presentation.import_graph, {})
+        raw = json_dumps(shared_presenter._raw, None)
+        self.assertNotIn('Server', shared_presenter.node_types)
+        parse(self.registry, 'other')
+        self.assertEqual(raw, json_dumps(shared_presenter._raw, None))
+
+    def test_threads(self):
+        contexts = []
+        errors = []
+        def run(property_name):
+            try:
+                contexts.append((parse(self.registry, property_name), property_name))
+            except Exception as e:
+                errors.append(e)
+        threads = [Thread(target=run, args=('name%d' % i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(3, len(contexts))
+        
+        compute = set()
+        for context, property_name in contexts:
+            self.assertParsed(context, property_name)
+            compute.add(context.presentation.presenter.node_types['tosca.nodes.Compute'])
+        # All the threads use the registered presenter, even if they built one at the same time
+        self.assertEqual(1, len(compute))
+        self.assertIs(compute.pop(), parse(self.registry).presentation.presenter.node_types['tosca.nodes.Compute'])
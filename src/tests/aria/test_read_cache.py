@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from shutil import rmtree
+from tempfile import mkdtemp
+from threading import Lock
+
+from testtools import TestCase
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import ReadingContext, ReadCache
+from ruamel.yaml.comments import CommentedMap
+
+DOCUMENT = '''a: 1
+b:
+  - 2
+  - 3
+'''
+
+
+class ReadCacheTest(TestCase):
+    def setUp(self):
+        super(ReadCacheTest, self).setUp()
+        self.path = mkdtemp()
+        self.addCleanup(rmtree, self.path, True)
+
+    def test_put_get(self):
+        cache = ReadCache(self.path)
+        location = LiteralLocation('')
+        cache.put('key', location, CommentedMap([('a', [1, 2])]))
+        self.assertEqual({'a': [1, 2]}, cache.get('key', location))
+        self.assertIsNone(cache.get('other', location))
+
+    def test_unpicklable(self):
+        # Failure to write is ignored, including failure to pickle
+        cache = ReadCache(self.path)
+        location = LiteralLocation('')
+        cache.put('key', location, CommentedMap([('lock', Lock())]))
+        self.assertIsNone(cache.get('key', location))
+
+    def test_reader(self):
+        cache = ReadCache(self.path)
+        def read(location):
+            context = ReadingContext()
+            context.cache = cache
+            return context.reader_source.get_reader(context, location, LiteralLoader(location)).read()
+
+        raw = read(LiteralLocation(DOCUMENT))
+        self.assertEqual(0, cache.cache_info()[0])
+
+        # Same content in another location: the locators refer to the new location
+        location = LiteralLocation(DOCUMENT)
+        cached_raw = read(location)
+        self.assertEqual(1, cache.cache_info()[0])
+        self.assertEqual(raw, cached_raw)
+        self.assertIs(location, cached_raw._locator.location)
+        self.assertEqual(2, cached_raw._locator.children['b'].line)
+        self.assertEqual(4, cached_raw._locator.children['b'].children[1].line)
@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import ReadingContext, ReaderProcessPool, YamlReader
+from aria.reading.process import encode_raw, decode_raw
+from datetime import datetime, date
+import marshal
+
+DOCUMENT = '''tosca_definitions_version: tosca_simple_yaml_1_0
+node_types:
+  MyType:
+    properties:
+      literal: |
+        text
+      ports: [ 80, 443, { secure: true } ]
+      created: 2016-09-01 12:00:00
+      day: 2016-09-01
+'''
+
+
+class ReaderProcessPoolTest(TestCase):
+    def setUp(self):
+        super(ReaderProcessPoolTest, self).setUp()
+        self.pool = ReaderProcessPool(1, min_size=0)
+        self.addCleanup(self.pool.close)
+
+    def read(self, data, process_pool=None):
+        context = ReadingContext()
+        context.process_pool = process_pool
+        location = LiteralLocation(data)
+        return YamlReader(context, location, LiteralLoader(location)).read(), location
+
+    def test_encode(self):
+        raw, _ = self.read(DOCUMENT)
+        decoded = decode_raw(marshal.loads(marshal.dumps(encode_raw(raw))))
+        self.assertEqual(repr(raw), repr(decoded))
+        properties = decoded['node_types']['MyType']['properties']
+        self.assertEqual(datetime(2016, 9, 1, 12), properties['created'])
+        self.assertEqual(date(2016, 9, 1), properties['day'])
+        self.assertRaises(TypeError, encode_raw, set())
+
+    def test_parse(self):
+        expected, _ = self.read(DOCUMENT)
+        raw, location = self.read(DOCUMENT, self.pool)
+        self.assertEqual(repr(expected), repr(raw))
+        self.assertEqual((1, 0, None, None), self.pool.cache_info())
+        locator = raw._locator.children['node_types'].children['MyType'].children['properties'].children['ports'].children[2]
+        self.assertEqual((7, 25), (locator.line, locator.column))
+        self.assertIs(location, locator.location)
+
+    def test_fallback(self):
+        # Sets can't be encoded, so the document is constructed on our thread
+        raw, _ = self.read('values: !!set { a, b }\n', self.pool)
+        self.assertEqual(set(['a', 'b']), set(raw['values']))
+        self.assertEqual((0, 1, None, None), self.pool.cache_info())
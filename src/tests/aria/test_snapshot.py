@@ -0,0 +1,150 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+from shutil import rmtree
+from tempfile import mkdtemp
+import cPickle, os.path
+
+from testtools import TestCase
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read, Validate
+from aria.loading import LoadingContext, UriLocation, LiteralLocation
+from aria.reading import ReadingContext, ReaderError, Snapshot
+from aria.tools.snapshot import create_snapshot
+from aria_extension_tosca.v1_0 import ToscaSimplePresenter1_0
+
+TYPES = '''node_types:
+  MyType:
+    properties:
+      a:
+        type: integer
+      b:
+        type: integer
+        default: notanumber
+'''
+
+BLUEPRINT = '''tosca_definitions_version: tosca_simple_yaml_1_0
+imports:
+  - %s
+topology_template:
+  node_templates:
+    node:
+      type: MyType
+      properties:
+        a: notanumber
+'''
+
+
+class SnapshotTest(TestCase):
+    def setUp(self):
+        super(SnapshotTest, self).setUp()
+        install_aria_extensions()
+        directory = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, directory, True)
+        self.directory = directory
+        self.document = os.path.join(directory, 'types.yaml')
+        self.write(TYPES)
+
+    def write(self, content):
+        with open(self.document, 'w') as f:
+            f.write(content)
+
+    def create_snapshot(self):
+        # Like aria.tools.snapshot.create_snapshot, but without validating the document first
+        snapshot = Snapshot(self.directory)
+        loading_context = LoadingContext()
+        location = UriLocation(self.document)
+        loader = loading_context.loader_source.get_loader(loading_context, location, None)
+        reader = ReadingContext().reader_source.get_reader(None, location, loader)
+        snapshot.add('types.yaml', reader.read())
+        return snapshot
+
+    def read(self, snapshot=None):
+        """
+        Returns the context and the readers provided by the snapshot.
+        """
+
+        readers = []
+        context = ConsumptionContext()
+        if snapshot is not None:
+            get_reader = snapshot.get_reader
+            def get_snapshot_reader(*args):
+                reader = get_reader(*args)
+                if reader is not None:
+                    readers.append(reader)
+                return reader
+            snapshot.get_reader = get_snapshot_reader
+            context.reading.snapshots.append(snapshot)
+        context.presentation.location = LiteralLocation(BLUEPRINT % self.document)
+        for consumer_class in (Read, Validate):
+            consumer_class(context).consume()
+        return context, readers
+
+    def assertSameResult(self, context, expected_context):
+        self.assertEqual(expected_context.presentation.presenter._raw, context.presentation.presenter._raw)
+        self.assertEqual(get_locations(expected_context), get_locations(context))
+        self.assertEqual(get_issues(expected_context), get_issues(context))
+
+    def test_read(self):
+        snapshot = self.create_snapshot()
+        context, readers = self.read(snapshot)
+        self.assertEqual(1, len(readers))
+        self.assertSameResult(context, self.read()[0])
+
+        # Issues are located in the snapshot's document, too
+        self.assertIn(('field "b" is not a valid', self.document), [(message[:len('field "b" is not a valid')], location) for message, location, _, _ in get_issues(context)])
+
+    def test_save_load(self):
+        path = os.path.join(self.directory, 'types.snapshot')
+        self.create_snapshot().save(path)
+        context, readers = self.read(Snapshot.load(path, self.directory))
+        self.assertEqual(1, len(readers))
+        self.assertSameResult(context, self.read()[0])
+
+    def test_create_snapshot(self):
+        self.write(TYPES.replace('notanumber', '1'))
+        snapshot = create_snapshot(self.directory, ['types.yaml'], ToscaSimplePresenter1_0)
+        self.assertEqual(['types.yaml'], snapshot.entries.keys())
+        context, readers = self.read(snapshot)
+        self.assertEqual(1, len(readers))
+        self.assertSameResult(context, self.read()[0])
+
+    def test_stale(self):
+        snapshot = self.create_snapshot()
+
+        # Locations shift, so the snapshot's locators would be wrong
+        self.write('\n\n' + TYPES.replace('integer', 'string', 1))
+        context, readers = self.read(snapshot)
+        self.assertEqual([], readers)
+        self.assertSameResult(context, self.read()[0])
+
+    def test_different_version(self):
+        path = os.path.join(self.directory, 'types.snapshot')
+        with open(path, 'wb') as f:
+            cPickle.dump({'version': 'other', 'entries': {}}, f, cPickle.HIGHEST_PROTOCOL)
+        self.assertRaises(ReaderError, Snapshot.load, path, self.directory)
+
+
+def get_issues(context):
+    return [(issue.message, str(issue.location), issue.line, issue.column) for issue in context.validation.issues]
+
+
+def get_locations(context):
+    node_type = context.presentation.presenter.service_template.node_types['MyType']
+    locators = [node_type._locator, node_type._get_grandchild_locator('properties', 'a'), node_type.properties['b']._get_child_locator('default')]
+    return [(str(locator.location), locator.line, locator.column) for locator in locators]
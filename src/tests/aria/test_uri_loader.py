@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+from threading import Thread, Lock
+from shutil import rmtree
+from tempfile import mkdtemp
+import time
+
+from testtools import TestCase
+
+from aria.loading import UriLocation, UriSession, UriTextLoader, LoaderError, DocumentNotFoundError
+from aria.utils import FixedThreadPoolExecutor
+
+DOCUMENT = 'tosca_definitions_version: tosca_simple_yaml_1_0\n'
+ETAG = '"aria"'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            count = server.requests.count(self.path)
+
+        if self.path == '/revalidate.yaml':
+            if self.headers.get('If-None-Match') == ETAG:
+                self.send_response(304)
+                self.send_header('ETag', ETAG)
+                self.end_headers()
+                return
+            self.send_document({'ETag': ETAG, 'Cache-Control': 'no-cache'})
+        elif self.path == '/fresh.yaml':
+            self.send_document({'Cache-Control': 'max-age=3600'})
+        elif self.path == '/flaky.yaml':
+            if count <= 2:
+                self.send_response(503)
+                self.end_headers()
+                return
+            self.send_document({})
+        elif self.path == '/slow.yaml':
+            time.sleep(1)
+            self.send_document({})
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def send_document(self, headers):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/yaml')
+        self.send_header('Content-Length', str(len(DOCUMENT)))
+        for name, value in headers.iteritems():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(DOCUMENT)
+
+    def log_message(self, *args):
+        pass
+
+
+class StandInServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), StandInHandler)
+        self.lock = Lock()
+        self.requests = []
+
+
+class UriLoaderTest(TestCase):
+    def setUp(self):
+        super(UriLoaderTest, self).setUp()
+        self.server = StandInServer()
+        thread = Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.shutdown)
+        self.cache_path = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, self.cache_path, True)
+        self.session = UriSession(cache_path=self.cache_path, read_timeout=0.5, backoff=0)
+        self.addCleanup(self.session.close)
+
+    def load(self, path, session=None):
+        uri = 'http://127.0.0.1:%d%s' % (self.server.server_address[1], path)
+        loader = UriTextLoader(UriLocation(uri), session=session or self.session)
+        loader.open()
+        try:
+            return loader.load()
+        finally:
+            loader.close()
+
+    def test_cache_hit(self):
+        self.assertEqual(DOCUMENT, self.load('/fresh.yaml'))
+        self.assertEqual(DOCUMENT, self.load('/fresh.yaml'))
+        self.assertEqual(1, self.server.requests.count('/fresh.yaml'))
+        self.assertEqual(1, self.session.stats.hits)
+        self.assertEqual(1, self.session.stats.misses)
+        self.assertEqual(len(DOCUMENT), self.session.stats.bytes_fetched)
+
+    def test_revalidation(self):
+        self.assertEqual(DOCUMENT, self.load('/revalidate.yaml'))
+        self.assertEqual(DOCUMENT, self.load('/revalidate.yaml'))
+        self.assertEqual(2, self.server.requests.count('/revalidate.yaml'))
+        self.assertEqual(1, self.session.stats.revalidations)
+        self.assertEqual(len(DOCUMENT), self.session.stats.bytes_fetched)
+
+    def test_retry(self):
+        self.assertEqual(DOCUMENT, self.load('/flaky.yaml'))
+        self.assertEqual(3, self.server.requests.count('/flaky.yaml'))
+
+    def test_timeout(self):
+        session = UriSession(cache_path=None, read_timeout=0.2, retries=0)
+        self.addCleanup(session.close)
+        self.assertRaises(LoaderError, self.load, '/slow.yaml', session)
+
+    def test_not_found(self):
+        self.assertRaises(DocumentNotFoundError, self.load, '/missing.yaml')
+
+    def test_concurrent(self):
+        executor = FixedThreadPoolExecutor(size=8, timeout=10)
+        try:
+            for _ in range(32):
+                executor.submit(self.load, '/fresh.yaml')
+            executor.drain()
+        finally:
+            executor.close()
+        executor.raise_first()
+        self.assertEqual([DOCUMENT] * 32, executor.returns)
+        self.assertEqual(32, self.session.stats.hits + self.session.stats.misses)
@@ -0,0 +1,66 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from shutil import rmtree
+from tempfile import mkdtemp
+import os.path
+
+from testtools import TestCase
+
+from aria.loading import LoadingContext, UriLocation, UriMirror, MirrorTextLoader
+
+DOCUMENT = 'node_types: {}\n'
+
+
+class UriMirrorTest(TestCase):
+    def setUp(self):
+        super(UriMirrorTest, self).setUp()
+        self.root = mkdtemp(prefix=self.__class__.__name__)
+        self.addCleanup(rmtree, self.root, True)
+
+    def test_default_layout(self):
+        mirror = UriMirror(self.root)
+        self.assertEqual(os.path.join(self.root, 'https', 'example.org_8443', 'a', 'b.yaml'),
+                         mirror.get_path('HTTPS://Example.org:8443/a/./b.yaml'))
+        self.assertIsNone(mirror.get_path('http://example.org/b.yaml?version=1'))
+        self.assertEqual(os.path.join(self.root, 'http', 'example.org', 'b.yaml'),
+                         mirror.get_path('http://example.org/../../b.yaml'))
+
+    def test_mappings(self):
+        mirror = UriMirror(self.root, {'http://example.org/types/': 'types', 'http://example.org/': 'all'})
+        self.assertEqual(os.path.join(self.root, 'types', 'b.yaml'), mirror.get_path('http://example.org/types/b.yaml'))
+        self.assertEqual(os.path.join(self.root, 'all', 'b.yaml'), mirror.get_path('http://example.org/b.yaml'))
+        self.assertIsNone(UriMirror(self.root, {'http://example.org/': '..'}).get_path('http://example.org/b.yaml'))
+
+    def test_put_and_load(self):
+        mirror = UriMirror(self.root)
+        uri = 'http://example.org/types/b.yaml'
+        self.assertIsNone(mirror.find(uri))
+        path = mirror.put(uri, DOCUMENT)
+        self.assertEqual(path, mirror.find(uri))
+
+        context = LoadingContext()
+        context.mirrors.append(mirror)
+        location = UriLocation(uri)
+        loader = context.loader_source.get_loader(context, location, None)
+        self.assertIsInstance(loader, MirrorTextLoader)
+        loader.open()
+        try:
+            self.assertEqual(DOCUMENT, loader.load())
+        finally:
+            loader.close()
+        self.assertEqual(uri, location.uri)
+        self.assertEqual(uri, loader.get_canonical_location())
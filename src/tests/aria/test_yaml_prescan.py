@@ -0,0 +1,38 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+from testtools import TestCase
+
+from aria.reading.yaml import prescan_yaml
+
+KEYS = ('tosca_definitions_version', 'imports')
+
+
+class YamlPrescanTest(TestCase):
+    def test_keys(self):
+        raw = prescan_yaml(u'tosca_definitions_version: tosca_simple_yaml_1_0\n'
+                           u'description: {a: [1, 2]}\n'
+                           u'imports:\n  - a.yaml\n  - {file: b.yaml, repository: r}\n', KEYS)
+        self.assertEqual(u'tosca_simple_yaml_1_0', raw['tosca_definitions_version'])
+        self.assertEqual([u'a.yaml', {u'file': u'b.yaml', u'repository': u'r'}], raw['imports'])
+
+    def test_missing_keys(self):
+        self.assertEqual({}, prescan_yaml(u'description: x\n', KEYS))
+
+    def test_unsupported(self):
+        self.assertIsNone(prescan_yaml(u'- a.yaml\n', KEYS))
+        self.assertIsNone(prescan_yaml(u'a: &a [x.yaml]\nimports: *a\n', KEYS))
+        self.assertIsNone(prescan_yaml(u'imports: [\n', KEYS))
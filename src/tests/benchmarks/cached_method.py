@@ -0,0 +1,187 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+"""
+Compares :class:`aria.utils.cachedmethod` with the previous implementation (a single lock for all
+instances, taken on every hit), with cache hits from one and from several threads, and by
+validating a blueprint with all the TOSCA presentation classes using one or the other. Also reports
+the cache entries that the presentations hold after they are validated with several contexts.
+
+Run from the "src" directory:
+
+    PYTHONPATH=aria:tosca:cloudify python -m tests.benchmarks.cached_method
+"""
+
+from __future__ import print_function
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read, Validate
+from aria.loading import UriLocation
+from aria.utils import cachedmethod, get_method_cache_size
+from .field_getters import BLUEPRINT, validate
+from functools import partial
+from threading import Lock, Thread
+import aria.presentation
+import aria_extension_tosca.v1_0 as tosca
+import argparse
+import inspect
+import time
+
+class PreviousCachedMethod(object):
+    """
+    The previous :class:`aria.utils.cachedmethod`.
+    """
+    
+    def __init__(self, fn):
+        self.fn = fn
+        self.hits = 0
+        self.misses = 0
+        self.lock = Lock()
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.fn
+        return partial(self, instance)
+    
+    def __call__(self, *args, **kwargs):
+        instance = args[0]
+        try:
+            cache = instance._method_cache
+        except AttributeError:
+            instance._method_cache = {}
+            cache = instance._method_cache
+        key = (self.fn, args[1:], frozenset(kwargs.items()))
+        try:
+            with self.lock:
+                r = cache[key]
+                self.hits += 1
+        except KeyError:
+            r = self.fn(*args, **kwargs)
+            with self.lock:
+                cache[key] = r
+                self.misses += 1
+            r = cache.get(key, r)
+        return r
+
+def use_previous(modules, previous):
+    # Replaces the cached methods (and cached property getters) of all presentation classes
+    for module in modules:
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            for name, value in cls.__dict__.items():
+                fget = value.fget if isinstance(value, property) else value
+                if isinstance(fget, (cachedmethod, PreviousCachedMethod)):
+                    fget = PreviousCachedMethod(fget.fn) if previous else cachedmethod(fget.fn)
+                    if isinstance(value, property):
+                        fget = property(fget, value.fset)
+                    setattr(cls, name, fget)
+
+def make_class(decorator):
+    class Presentation(object):
+        @property
+        @decorator
+        def name(self):
+            return 'name'
+        
+        @decorator
+        def _get_type(self, context):
+            return 'type'
+        
+        @decorator
+        def _get_value(self, context, name):
+            return name
+    return Presentation
+
+def hits(presentations, context, count):
+    for _ in xrange(count):
+        for presentation in presentations:
+            presentation.name
+            presentation._get_type(context)
+            presentation._get_value(context, 'value')
+
+def time_hits(decorator, threads, count):
+    presentations = [make_class(decorator)() for _ in range(10)]
+    context = ConsumptionContext()
+    hits(presentations, context, 1)
+    start = time.time()
+    if threads == 1:
+        hits(presentations, context, count)
+    else:
+        threads = [Thread(target=hits, args=(presentations, context, count // threads)) for _ in range(threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return time.time() - start
+
+def time_validate(presenter):
+    start = time.time()
+    validate(presenter)
+    return time.time() - start
+
+def validate_with_contexts(presenter, count):
+    # The same presentations with new contexts, like a long-lived process would use them
+    for _ in range(count):
+        context = ConsumptionContext()
+        context.presentation.presenter = presenter
+        Validate(context).consume()
+    return get_method_cache_size(presenter), get_method_cache_size(presenter, context)
+
+def main():
+    parser = argparse.ArgumentParser(description='Cached method benchmark')
+    parser.add_argument('--repeat', type=int, default=10, help='number of runs (the best is reported)')
+    parser.add_argument('--count', type=int, default=10000, help='number of times to get the cached values')
+    parser.add_argument('--contexts', type=int, default=10, help='number of contexts to validate the same presentations with')
+    parser.add_argument('--threads', type=int, default=4, help='number of threads for the multi-threaded hits')
+    parser.add_argument('uri', nargs='?', default=BLUEPRINT, help='blueprint to validate')
+    args = parser.parse_args()
+    
+    install_aria_extensions()
+    context = ConsumptionContext()
+    context.presentation.location = UriLocation(args.uri)
+    Read(context).consume()
+    presenter = context.presentation.presenter
+    modules = (aria.presentation, tosca)
+    
+    # Both must report the same issues
+    use_previous(modules, True)
+    previous_issues = validate(presenter)
+    use_previous(modules, False)
+    if validate(presenter) != previous_issues:
+        print('different results')
+    
+    # Interleave runs, so that both see the same conditions
+    results = {}
+    for _ in range(args.repeat):
+        for previous in (True, False):
+            decorator = PreviousCachedMethod if previous else cachedmethod
+            use_previous(modules, previous)
+            for name, elapsed in (('hits', time_hits(decorator, 1, args.count)),
+                                  ('threaded hits', time_hits(decorator, args.threads, args.count)),
+                                  ('validate', time_validate(presenter))):
+                key = (name, previous)
+                results[key] = min(results.get(key, elapsed), elapsed)
+    
+    for name, description in (('hits', 'cache hits'), ('threaded hits', 'cache hits (%d threads)' % args.threads), ('validate', 'validating')):
+        previous = results[(name, True)]
+        current = results[(name, False)]
+        print('%s: previous %.3f s, cachedmethod %.3f s (%.2fx)' % (description, previous, current, previous / current))
+    
+    (entries, size), (all_entries, all_size) = validate_with_contexts(presenter, args.contexts)
+    print('after validating with %d contexts: %d entries (%d bytes) held by the presentations, %d more (%d bytes) by the last context' % (args.contexts, entries, size, all_entries - entries, all_size - size))
+
+if __name__ == '__main__':
+    main()
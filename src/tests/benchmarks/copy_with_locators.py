@@ -0,0 +1,122 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+"""
+Compares copying only the containers of raw data (:func:`aria.utils.copy_with_locators`) with
+the previous deep copies (:func:`aria.utils.deepcopy_with_locators`), both for a chain of clones
+of a presentation (as in a type hierarchy) and for parsing a blueprint.
+
+Run from the "src" directory:
+
+    PYTHONPATH=aria:tosca:cloudify python -m tests.benchmarks.copy_with_locators
+"""
+
+from __future__ import print_function
+
+from aria import install_aria_extensions
+from aria.presentation import Presentation
+from aria.utils import deepcopy_with_locators, copy_with_locators
+from ruamel.yaml.comments import CommentedMap, CommentedSeq
+from .presentation_registry import parse, PHASES
+from .field_getters import BLUEPRINT
+import aria.presentation.presentation, aria.presentation.fields
+import argparse
+import gc
+import time
+
+MODULES = (aria.presentation.presentation, aria.presentation.fields)
+
+def use_copy(copy_function):
+    for module in MODULES:
+        module.copy_with_locators = copy_function
+
+def make_raw(width):
+    # Like a node type with properties, attributes and interfaces
+    raw = CommentedMap([('derived_from', 'tosca.nodes.Root'), ('description', 'A node type')])
+    for section in ('properties', 'attributes', 'interfaces'):
+        raw[section] = CommentedMap()
+        for i in range(width):
+            raw[section]['%s%d' % (section, i)] = CommentedMap([
+                ('type', 'string'),
+                ('required', False),
+                ('constraints', CommentedSeq([CommentedMap([('min_length', i)])]))])
+    return raw
+
+def clone_chain(raw, depth):
+    # Each level clones the previous one and overrides a single property
+    presentation = Presentation(name='type', raw=raw)
+    for i in range(depth):
+        presentation = presentation._clone()
+        presentation._raw['properties']['properties0']['default'] = i
+    return presentation
+
+def count_objects(function):
+    gc.collect()
+    before = len(gc.get_objects())
+    result = function()
+    gc.collect()
+    return len(gc.get_objects()) - before, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Raw data copying benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (the best is reported)')
+    parser.add_argument('--depth', type=int, default=10, help='length of the chain of clones')
+    parser.add_argument('--width', type=int, default=20, help='number of properties, attributes and interfaces')
+    parser.add_argument('uri', nargs='?', default=BLUEPRINT, help='blueprint to parse')
+    args = parser.parse_args()
+    
+    install_aria_extensions()
+    copy_functions = (('deepcopy', deepcopy_with_locators), ('containers', copy_with_locators))
+    
+    # Both must produce the same raw data and report the same issues
+    raw = make_raw(args.width)
+    results = []
+    for _, copy_function in copy_functions:
+        use_copy(copy_function)
+        results.append((clone_chain(raw, args.depth)._raw, len(parse(args.uri, None)[0].validation.issues)))
+    if results[0] != results[1]:
+        print('different results')
+    
+    # Interleave runs, so that both see the same conditions
+    chain = {}
+    phases = {}
+    for _ in range(args.repeat):
+        for name, copy_function in copy_functions:
+            use_copy(copy_function)
+            start = time.time()
+            for _ in range(10):
+                clone_chain(raw, args.depth)
+            elapsed = time.time() - start
+            chain[name] = min(chain.get(name, elapsed), elapsed)
+            _, times = parse(args.uri, None)
+            best = phases.get(name)
+            phases[name] = [min(a, b) for a, b in zip(best, times)] if best is not None else times
+    
+    objects = {}
+    for name, copy_function in copy_functions:
+        use_copy(copy_function)
+        objects[name] = count_objects(lambda: clone_chain(raw, args.depth))[0]
+    use_copy(copy_with_locators)
+    
+    print('Chain of %d clones: deepcopy %.3f s (%d objects), containers only %.3f s (%d objects) (%.1fx)' % (args.depth, chain['deepcopy'], objects['deepcopy'], chain['containers'], objects['containers'], chain['deepcopy'] / chain['containers']))
+    for i, consumer_class in enumerate(PHASES):
+        deep = phases['deepcopy'][i]
+        containers = phases['containers'][i]
+        print('%s: deepcopy %.3f s, containers only %.3f s (%.2fx)' % (consumer_class.__name__, deep, containers, deep / containers))
+
+if __name__ == '__main__':
+    main()
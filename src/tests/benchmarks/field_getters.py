@@ -0,0 +1,137 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+"""
+Compares the specialized field getters generated by :func:`aria.presentation.has_fields` with the
+generic getter (:code:`Field._get_generic`) on the TOSCA presentation classes, by getting all the
+field values of a blueprint, and by validating it (with fresh presentations every time).
+
+Run from the "src" directory:
+
+    PYTHONPATH=aria:tosca:cloudify python -m tests.benchmarks.field_getters
+"""
+
+from __future__ import print_function
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read, Validate
+from aria.loading import UriLocation
+from aria.presentation import Field
+import aria_extension_tosca.v1_0 as tosca
+import argparse
+import inspect
+import os
+import time
+
+HERE = os.path.dirname(__file__)
+BLUEPRINT = os.path.join(HERE, '..', '..', '..', 'blueprints', 'tosca', 'node-cellar.yaml')
+
+def find_fields(module):
+    fields = set()
+    for _, cls in inspect.getmembers(module, inspect.isclass):
+        for field in getattr(cls, 'FIELDS', {}).itervalues():
+            if isinstance(field, Field):
+                fields.add(field)
+    return fields
+
+def use_generic(fields, generic):
+    for field in fields:
+        if generic:
+            field._get = field._get_generic
+        else:
+            field.specialize()
+
+def validate(presenter):
+    # Fresh presentations, so that nothing is cached
+    context = ConsumptionContext()
+    context.presentation.presenter = presenter.__class__(raw=presenter._raw)
+    Validate(context).consume()
+    return len(context.validation.issues)
+
+def find_field_gets(presentation, gets, visited):
+    # All the (field, presentation) pairs reachable from the presentation
+    if (id(presentation) in visited) or not hasattr(presentation, 'FIELDS'):
+        return
+    visited.add(id(presentation))
+    for name, field in presentation.FIELDS.iteritems():
+        gets.append((field, presentation))
+        try:
+            value = getattr(presentation, name)
+        except Exception:
+            continue
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, list):
+            value = (value,)
+        for v in value:
+            find_field_gets(v[1] if isinstance(v, tuple) else v, gets, visited)
+
+def time_gets(gets):
+    start = time.time()
+    for field, presentation in gets:
+        try:
+            field._get(presentation)
+        except Exception:
+            pass
+    return time.time() - start
+
+def time_validate(presenter):
+    start = time.time()
+    validate(presenter)
+    return time.time() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='Field getters benchmark')
+    parser.add_argument('--repeat', type=int, default=10, help='number of runs (the best is reported)')
+    parser.add_argument('uri', nargs='?', default=BLUEPRINT, help='blueprint to validate')
+    args = parser.parse_args()
+    
+    install_aria_extensions()
+    fields = find_fields(tosca)
+    print('%d fields' % len(fields))
+    
+    context = ConsumptionContext()
+    context.presentation.location = UriLocation(args.uri)
+    Read(context).consume()
+    presenter = context.presentation.presenter
+    
+    # Both must report the same issues
+    use_generic(fields, True)
+    generic_issues = validate(presenter)
+    use_generic(fields, False)
+    if validate(presenter) != generic_issues:
+        print('different results')
+    
+    gets = []
+    find_field_gets(presenter.service_template, gets, set())
+    print('%d field values' % len(gets))
+    
+    # Interleave runs, so that both see the same conditions
+    results = {}
+    for _ in range(args.repeat):
+        for generic in (True, False):
+            use_generic(fields, generic)
+            for name, elapsed in (('gets', time_gets(gets)), ('validate', time_validate(presenter))):
+                key = (name, generic)
+                results[key] = min(results.get(key, elapsed), elapsed)
+    
+    for name, description in (('gets', 'getting all field values'), ('validate', 'validating')):
+        generic = results[(name, True)]
+        specialized = results[(name, False)]
+        print('%s: generic getters %.3f s, specialized getters %.3f s (%.2fx)' % (description, generic, specialized, generic / specialized))
+
+if __name__ == '__main__':
+    main()
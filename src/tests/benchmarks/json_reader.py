@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+"""
+Compares :class:`aria.reading.JsonReader` with the previous :code:`json.loads` path (which
+provides no locators) on the bundled blueprints and profiles converted to JSON. Locators are built
+on demand, so we also measure reading with all locators built.
+
+Run from the "src" directory:
+
+    PYTHONPATH=aria:tosca:cloudify python -m tests.benchmarks.json_reader
+"""
+
+from __future__ import print_function
+
+from aria.reading import Reader, JsonReader, FastYamlReader
+from .yaml_reader import PATHS, find_documents, as_plain, read
+from collections import OrderedDict
+import argparse
+import json
+import time
+
+def to_json(documents, indent):
+    converted = []
+    for filename, data in documents:
+        raw = read(FastYamlReader, data)
+        # Timestamps and other YAML types that JSON doesn't have are converted to strings (the
+        # result is bytes, like the file and URI loaders provide)
+        converted.append((filename, json.dumps(raw, indent=indent, default=str)))
+    return converted
+
+class JsonLoadsReader(Reader):
+    """
+    The previous :class:`aria.reading.JsonReader`.
+    """
+    
+    ACCEPTS_BYTES = True
+    
+    def read(self):
+        data = self.load()
+        if not isinstance(data, basestring):
+            data = unicode(data)
+        return json.loads(data, object_pairs_hook=OrderedDict)
+
+def json_loads(data):
+    return read(JsonLoadsReader, data)
+
+def json_reader(data):
+    return read(JsonReader, data)
+
+def json_reader_with_locators(data):
+    raw = read(JsonReader, data)
+    len(raw._locator.table)
+    return raw
+
+def benchmark(read_function, documents, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        for _, data in documents:
+            read_function(data)
+        elapsed = time.time() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON reader benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (the best is reported)')
+    parser.add_argument('--indent', type=int, default=2, help='indentation of the generated JSON (-1 for compact)')
+    parser.add_argument('--scale', type=int, default=1, help='concatenate the documents into a single large array this many times')
+    args = parser.parse_args()
+
+    documents = to_json(find_documents(PATHS), args.indent if args.indent >= 0 else None)
+    if args.scale > 1:
+        documents = [('all.json', '[%s]' % ','.join([data for _, data in documents] * args.scale))]
+    size = sum(len(data) for _, data in documents)
+    print('%d documents, %d characters' % (len(documents), size))
+
+    # Both must produce the same data
+    for filename, data in documents:
+        if as_plain(json_loads(data)) != as_plain(json_reader(data)):
+            print('different results for %s' % filename)
+
+    loads = benchmark(json_loads, documents, args.repeat)
+    reader = benchmark(json_reader, documents, args.repeat)
+    reader_with_locators = benchmark(json_reader_with_locators, documents, args.repeat)
+    print('json.loads:                 %.3f s' % loads)
+    print('JsonReader:                 %.3f s (%.1fx)' % (reader, loads / reader))
+    print('JsonReader (with locators): %.3f s (%.1fx)' % (reader_with_locators, loads / reader_with_locators))
+
+if __name__ == '__main__':
+    main()
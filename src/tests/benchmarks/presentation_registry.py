@@ -0,0 +1,77 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+
+"""
+Compares parsing a blueprint with the profiles shared through
+:class:`aria.presentation.PresentationRegistry` and without sharing them, timing each phase.
+
+Run from the "src" directory:
+
+    PYTHONPATH=aria:tosca:cloudify python -m tests.benchmarks.presentation_registry
+"""
+
+from __future__ import print_function
+
+from aria import install_aria_extensions
+from aria.consumption import ConsumptionContext, Read, Validate, Template
+from aria.loading import UriLocation
+from aria.presentation import PRESENTATION_REGISTRY
+from .field_getters import BLUEPRINT
+import argparse
+import time
+
+PHASES = (Read, Validate, Template)
+
+def parse(uri, registry):
+    context = ConsumptionContext()
+    context.presentation.location = UriLocation(uri)
+    context.presentation.registry = registry
+    times = []
+    for consumer_class in PHASES:
+        start = time.time()
+        consumer_class(context).consume()
+        times.append(time.time() - start)
+    return context, times
+
+def main():
+    parser = argparse.ArgumentParser(description='Presentation registry benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (the best is reported)')
+    parser.add_argument('uri', nargs='?', default=BLUEPRINT, help='blueprint to parse')
+    args = parser.parse_args()
+    
+    install_aria_extensions()
+    
+    # Both must report the same issues (this also registers the profiles)
+    issues = [len(parse(args.uri, registry)[0].validation.issues) for registry in (None, PRESENTATION_REGISTRY)]
+    if issues[0] != issues[1]:
+        print('different results')
+    
+    # Interleave runs, so that both see the same conditions
+    results = {}
+    for _ in range(args.repeat):
+        for registry in (None, PRESENTATION_REGISTRY):
+            _, times = parse(args.uri, registry)
+            best = results.get(registry is not None)
+            results[registry is not None] = [min(a, b) for a, b in zip(best, times)] if best is not None else times
+    
+    for i, consumer_class in enumerate(PHASES):
+        unshared = results[False][i]
+        shared = results[True][i]
+        print('%s: not shared %.3f s, shared %.3f s (%.2fx)' % (consumer_class.__name__, unshared, shared, unshared / shared))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+"""
+Compares reading the bundled blueprints and profiles on threads (like the
+:class:`aria.consumption.Read` consumer), with and without a
+:class:`aria.reading.ReaderProcessPool`. The speedup depends on the number of CPUs.
+
+Run from the "src" directory:
+
+    PYTHONPATH=aria:tosca:cloudify python -m tests.benchmarks.process_reader
+"""
+
+from __future__ import print_function
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import ReadingContext, ReaderProcessPool, YamlReader, FastYamlReader
+from aria.utils import FixedThreadPoolExecutor
+from .yaml_reader import PATHS, find_documents, as_plain
+import argparse
+import multiprocessing
+import time
+
+def read(context, reader_class, data):
+    location = LiteralLocation(data)
+    return reader_class(context, location, LiteralLoader(location)).read()
+
+def read_all(context, reader_class, documents, threads):
+    executor = FixedThreadPoolExecutor(size=threads)
+    try:
+        for _, data in documents:
+            executor.submit(read, context, reader_class, data)
+        executor.drain()
+        executor.raise_first()
+        return executor.returns
+    finally:
+        executor.close()
+
+def benchmark(context, reader_class, documents, threads, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        read_all(context, reader_class, documents, threads)
+        elapsed = time.time() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Process pool reader benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (the best is reported)')
+    parser.add_argument('--threads', type=int, default=8, help='number of reading threads')
+    parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count(), help='number of worker processes')
+    parser.add_argument('--min-size', type=int, default=16 * 1024, help='minimum size of documents sent to the workers')
+    parser.add_argument('--fast', action='store_true', help='use FastYamlReader')
+    args = parser.parse_args()
+    
+    reader_class = FastYamlReader if args.fast else YamlReader
+    documents = find_documents(PATHS)
+    size = sum(len(data) for _, data in documents)
+    print('%d documents, %d characters, %d CPUs' % (len(documents), size, multiprocessing.cpu_count()))
+
+    threads_context = ReadingContext()
+    pool_context = ReadingContext()
+    pool_context.process_pool = ReaderProcessPool(args.processes, min_size=args.min_size)
+    try:
+        # Both must produce the same data
+        for filename, data in documents:
+            if as_plain(read(threads_context, reader_class, data)) != as_plain(read(pool_context, reader_class, data)):
+                print('different results for %s' % filename)
+        
+        threads = benchmark(threads_context, reader_class, documents, args.threads, args.repeat)
+        processes = benchmark(pool_context, reader_class, documents, args.threads, args.repeat)
+        hits, misses, _, _ = pool_context.process_pool.cache_info()
+    finally:
+        pool_context.process_pool.close()
+    
+    print('%-12s %d threads:                %.3f s' % (reader_class.__name__, args.threads, threads))
+    print('%-12s %d threads, %d processes:   %.3f s (%.1fx)' % (reader_class.__name__, args.threads, args.processes, processes, threads / processes))
+    print('documents constructed by workers: %d of %d' % (hits, hits + misses))
+
+if __name__ == '__main__':
+    main()
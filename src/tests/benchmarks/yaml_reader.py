@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2016 GigaSpaces Technologies Ltd. All rights reserved.
+# 
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+# 
+#      http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+
+"""
+Compares :class:`aria.reading.YamlReader` with :class:`aria.reading.FastYamlReader` on the bundled
+blueprints and profiles.
+
+Run from the "src" directory:
+
+    PYTHONPATH=aria:tosca:cloudify python -m tests.benchmarks.yaml_reader
+"""
+
+from __future__ import print_function
+
+from aria.loading import LiteralLocation, LiteralLoader
+from aria.reading import YamlReader, FastYamlReader, FastYamlLoader
+import argparse
+import codecs
+import os
+import time
+
+HERE = os.path.dirname(__file__)
+PATHS = (
+    os.path.join(HERE, '..', '..', '..', 'blueprints'),
+    os.path.join(HERE, '..', '..', 'tosca', 'aria_extension_tosca', 'profiles'))
+
+def find_documents(paths):
+    documents = []
+    for path in paths:
+        for dirpath, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if filename.endswith('.yaml'):
+                    with codecs.open(os.path.join(dirpath, filename), encoding='utf-8') as f:
+                        documents.append((filename, f.read()))
+    return documents
+
+def as_plain(value):
+    # Note: we can't compare CommentedMaps directly, because their equality ignores merged keys
+    if isinstance(value, dict):
+        return dict((k, as_plain(v)) for k, v in value.iteritems())
+    elif isinstance(value, list):
+        return [as_plain(v) for v in value]
+    return value
+
+def read(reader_class, data):
+    location = LiteralLocation(data)
+    return reader_class(None, location, LiteralLoader(location)).read()
+
+def benchmark(reader_class, documents, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.time()
+        for _, data in documents:
+            read(reader_class, data)
+        elapsed = time.time() - start
+        if (best is None) or (elapsed < best):
+            best = elapsed
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='YAML reader benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (the best is reported)')
+    args = parser.parse_args()
+
+    documents = find_documents(PATHS)
+    size = sum(len(data) for _, data in documents)
+    print('%d documents, %d characters' % (len(documents), size))
+    if FastYamlLoader is None:
+        print('libyaml is not available: FastYamlReader will fall back to the round-trip loader')
+
+    # Both modes must produce the same data
+    for filename, data in documents:
+        if as_plain(read(YamlReader, data)) != as_plain(read(FastYamlReader, data)):
+            print('different results for %s' % filename)
+
+    round_trip = benchmark(YamlReader, documents, args.repeat)
+    fast = benchmark(FastYamlReader, documents, args.repeat)
+    print('YamlReader:     %.3f s' % round_trip)
+    print('FastYamlReader: %.3f s (%.1fx)' % (fast, round_trip / fast))
+
+if __name__ == '__main__':
+    main()
@@ -15,8 +15,9 @@
 #
 
 from aria import DSL_SPECIFICATION_PACKAGES
-from aria.presentation import PRESENTER_CLASSES
+from aria.presentation import PRESENTER_CLASSES, PRESENTATION_REGISTRY
 from aria.loading import FILE_LOADER_SEARCH_PATHS
+from aria.reading import SNAPSHOTS, Snapshot
 from .v1_0 import ToscaSimplePresenter1_0
 import os.path
 
@@ -29,7 +30,16 @@ def install_aria_extension():
     
     # Imports
     the_dir = os.path.dirname(__file__)
-    FILE_LOADER_SEARCH_PATHS.append(os.path.join(the_dir, 'profiles'))
+    profiles_dir = os.path.join(the_dir, 'profiles')
+    FILE_LOADER_SEARCH_PATHS.append(profiles_dir)
+    
+    # Shared profile presentations
+    PRESENTATION_REGISTRY.profile_paths.append(profiles_dir)
+    
+    # Precompiled profiles (see "make snapshots")
+    snapshot_path = os.path.join(profiles_dir, 'profiles.snapshot')
+    if os.path.isfile(snapshot_path):
+        SNAPSHOTS.append(Snapshot.load(snapshot_path, profiles_dir))
 
 MODULES = (
     'v1_0',)
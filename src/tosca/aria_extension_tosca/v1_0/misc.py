@@ -94,6 +94,16 @@ class Repository(ToscaPresentation):
         
         :rtype: tosca.datatypes.Credential
         """
+
+    @primitive_list_field(str)
+    def mirrors(self):
+        """
+        ARIA NOTE: This field is not mentioned in the spec. It is an optional list of alternative URLs
+        that serve the same content as :code:`url`. Imports from the repository will be requested from
+        the fastest of them, failing over to the others.
+        
+        :rtype: list of str
+        """
     
     @cachedmethod
     def _get_credential(self, context):
@@ -20,6 +20,7 @@ from .utils.deployment import get_deployment_template
 from aria.validation import Issue
 from aria.presentation import Presenter
 from aria.utils import ReadOnlyList, cachedmethod
+from urlparse import urljoin
 
 class ToscaSimplePresenter1_0(Presenter):
     """
@@ -61,7 +62,28 @@ class ToscaSimplePresenter1_0(Presenter):
 
     @cachedmethod
     def _get_import_locations(self):
-        return ReadOnlyList([i.file for i in self.service_template.imports] if (self.service_template and self.service_template.imports) else [])
+        return ReadOnlyList([self._get_import_location(i) for i in self.service_template.imports] if (self.service_template and self.service_template.imports) else [])
+
+    @cachedmethod
+    def _get_uri_mirrors(self):
+        mirrors = {}
+        repositories = self.repositories
+        if repositories:
+            for repository in repositories.itervalues():
+                if repository.url and repository.mirrors:
+                    mirrors[repository.url] = repository.mirrors
+        return mirrors
+
+    def _get_import_location(self, i):
+        if i.repository:
+            repositories = self.repositories
+            repository = repositories.get(i.repository) if repositories else None
+            if (repository is not None) and repository.url:
+                url = repository.url
+                if not url.endswith('/'):
+                    url += '/'
+                return urljoin(url, i.file)
+        return i.file
 
     def _validate_import(self, context, presentation):
         r = True
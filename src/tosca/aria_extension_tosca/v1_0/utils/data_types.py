@@ -76,7 +76,7 @@ def coerce_data_type_value(context, presentation, data_type, entry_schema, const
                     definition_constraints = definition._get_constraints(context)
                     r[name] = coerce_value(context, presentation, definition_type, definition_entry_schema, definition_constraints, v)
                 else:
-                    context.validation.report('assignment to undefined property "%s" in type "%s" in "%s"' % (name, data_type._fullname, presentation._fullname), locator=v._locator, level=Issue.BETWEEN_TYPES)
+                    context.validation.report('assignment to undefined property "%s" in type "%s" in "%s"' % (name, data_type._fullname, presentation._fullname), locator=presentation._get_value_locator(value).get_child(name), level=Issue.BETWEEN_TYPES)
 
             # Fill in defaults from the definitions, and check if required definitions have not been assigned
             for name, definition in definitions.iteritems():
@@ -91,7 +91,7 @@ def coerce_data_type_value(context, presentation, data_type, entry_schema, const
             
             value = r
         else:
-            context.validation.report('value of type "%s" is not a dict in "%s"' % (data_type._fullname, presentation._fullname), locator=value._locator, level=Issue.BETWEEN_TYPES)
+            context.validation.report('value of type "%s" is not a dict in "%s"' % (data_type._fullname, presentation._fullname), locator=presentation._get_value_locator(value), level=Issue.BETWEEN_TYPES)
             value = None
     
     return value
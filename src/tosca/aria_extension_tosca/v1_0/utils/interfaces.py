@@ -248,9 +248,9 @@ def merge_raw_input_definition(context, the_raw_input, our_input, interface_name
     input_type2 = our_input.type
     if input_type1 != input_type2:
         if operation_name is not None:
-            context.validation.report('interface %s "%s" changes operation input "%s.%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, operation_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=input_type2._locator, level=Issue.BETWEEN_TYPES)
+            context.validation.report('interface %s "%s" changes operation input "%s.%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, operation_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=our_input._get_child_locator('type'), level=Issue.BETWEEN_TYPES)
         else:
-            context.validation.report('interface %s "%s" changes input "%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=input_type2._locator, level=Issue.BETWEEN_TYPES)
+            context.validation.report('interface %s "%s" changes input "%s" type from "%s" to "%s" in "%s"' % (type_name, interface_name, our_input._name, input_type1, input_type2, presentation._fullname), locator=our_input._get_child_locator('type'), level=Issue.BETWEEN_TYPES)
 
     # Merge    
     merge(the_raw_input, our_input._raw)
@@ -322,7 +322,7 @@ def merge_interface_definition(context, interface, our_source, presentation, typ
         input_type1 = interface.type
         input_type2 = our_source.type
         if (input_type1 is not None) and (input_type2 is not None) and (input_type1 != input_type2):
-            context.validation.report('interface definition "%s" changes type from "%s" to "%s" in "%s"' % (interface._name, input_type1, input_type2, presentation._fullname), locator=input_type2._locator, level=Issue.BETWEEN_TYPES)
+            context.validation.report('interface definition "%s" changes type from "%s" to "%s" in "%s"' % (interface._name, input_type1, input_type2, presentation._fullname), locator=our_source._get_child_locator('type'), level=Issue.BETWEEN_TYPES)
     
     # Add/merge inputs
     our_interface_inputs = our_source._get_inputs(context) if hasattr(our_source, '_get_inputs') else our_source.inputs 